@@ -4,11 +4,15 @@ from langchain_core.messages import SystemMessage, AIMessage, ToolCall
 from dotenv import load_dotenv
 from langgraph.graph import MessagesState
 import sys
+import ast
 import json
 import re
 import sqlite3
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database.database_operations import check_availability, reserve_room
+from database.database_operations import (
+    check_availability, reserve_room, find_next_available, check_availability_with_alternatives,
+    cancel_reservation, modify_reservation, reserve_group, reserve_recurring
+)
 from langchain_core.messages import AIMessage, ToolCall
 
 # Load environment variables
@@ -33,6 +37,7 @@ You have access to the following tools:
    - end_time: format HH:MM
    - capacity: minimum number of people (optional)
    - features: list of required amenities like WiFi, TV, etc. (optional)
+   For stays over several days, use check_in and check_out (format YYYY-MM-DD HH:MM) instead of date/start_time/end_time.
 
 2. reserve_room tool: Make a reservation for a specific room
    Parameters:
@@ -41,24 +46,85 @@ You have access to the following tools:
    - date: format YYYY-MM-DD
    - start_time: format HH:MM
    - end_time: format HH:MM
+   For stays over several days, use check_in and check_out (format YYYY-MM-DD HH:MM) instead of date/start_time/end_time.
+   - flexible: true if the guest does not mind which of the equivalent rooms they get (optional). The room that
+     fits the schedule best is booked and may later be swapped for an identical one; without room_id,
+     pass capacity and features instead.
+
+3. find_next_available tool: Find the earliest free time windows when the requested time is taken
+   Parameters:
+   - duration_minutes: length of the booking in minutes
+   - search_from: earliest start, format YYYY-MM-DD HH:MM (optional, default now)
+   - search_until: latest end, format YYYY-MM-DD HH:MM (optional, default 14 days later)
+   - capacity: minimum number of people (optional)
+   - features: list of required amenities (optional)
+   Each returned window has check_in and check_out values that can be passed straight to reserve_room.
+
+4. check_availability_with_alternatives tool: Same parameters as check_availability, plus flex_minutes (optional).
+   Returns the matching rooms, or when none match, ranked alternatives: rooms missing one feature,
+   one size smaller, or free at a time shifted by up to flex_minutes (with check_in and check_out).
+
+5. cancel_reservation tool: Cancel an existing reservation
+   Parameters:
+   - reservation_id: the ID returned by reserve_room
+   - guest_name: name the reservation is booked under (pass it so the wrong booking is never cancelled)
+
+6. modify_reservation tool: Change an existing reservation if the new room or time is free
+   Parameters:
+   - reservation_id: the ID returned by reserve_room
+   - any of room_id, guest_name, date, start_time, end_time, check_in, check_out to change (optional)
+   A new date on its own moves the whole booking and keeps its length. If the new slot is taken,
+   the reservation is left unchanged.
+
+7. reserve_group tool: Reserve enough rooms for a whole group (wedding, conference) in one step
+   Parameters:
+   - guest_name: name of the group or its organiser
+   - headcount: number of guests to seat
+   - features: list of amenities every room must offer (optional)
+   - date, start_time, end_time (or check_in and check_out) as for reserve_room
+   - max_rooms: use at most this many rooms (optional)
+   The rooms are chosen to waste as few beds as possible, and either all of them are booked or none.
+
+8. reserve_recurring tool: Reserve the same room on a regular schedule (e.g. every weekday for three months) in one step
+   Parameters:
+   - room_id, guest_name, and the first date and times (or check_in and check_out) as for reserve_room
+   - frequency: 'daily' or 'weekly'
+   - interval: repeat every N days or weeks (optional, default 1)
+   - weekdays: list of days such as ['monday', 'wednesday'] (optional)
+   - until: last date, format YYYY-MM-DD, and/or count: number of occurrences
+   - skip_conflicts: true to book the free dates even if some are taken (optional)
+   If any date is taken and skip_conflicts is not set, nothing is booked and the taken dates are listed; ask the user
+   whether to book the remaining dates.
 
 Workflow:
 1. When a user asks about availability, confirm their requirements and use check_availability
-2. Show the user the available rooms that match their criteria
-3. If the user wants to book a room, collect their name and room preference, then use reserve_room
+2. Show the user the available rooms that match their criteria. Prefer check_availability_with_alternatives so that, if nothing matches, you can offer its alternatives right away; use find_next_available when the user wants the next free time for a longer span
+3. If the user wants to book a room, collect their name and room preference, then use reserve_room. For a group needing several rooms, use reserve_group once instead of reserving room by room. For a repeating booking, use reserve_recurring once instead of reserving date by date
 4. Confirm the reservation details with the user after booking
+5. To cancel or change a booking, ask for the reservation ID and the guest name, confirm the change with the user, then use cancel_reservation or modify_reservation. If a modification fails because the slot is taken, offer alternatives with check_availability_with_alternatives
 
 Always confirm the details with the user before making a reservation. If you're unsure about any details, ask for clarification.
 
 When calling the tools, use the exact format:
 check_availability(date='YYYY-MM-DD', start_time='HH:MM', end_time='HH:MM', capacity=N, features=['feature1', 'feature2'])
 reserve_room(room_id=N, guest_name='Guest Name', date='YYYY-MM-DD', start_time='HH:MM', end_time='HH:MM')
+check_availability(check_in='YYYY-MM-DD HH:MM', check_out='YYYY-MM-DD HH:MM', capacity=N)
+reserve_room(room_id=N, guest_name='Guest Name', check_in='YYYY-MM-DD HH:MM', check_out='YYYY-MM-DD HH:MM')
+find_next_available(duration_minutes=N, search_from='YYYY-MM-DD HH:MM', capacity=N, features=['feature1'])
+check_availability_with_alternatives(date='YYYY-MM-DD', start_time='HH:MM', end_time='HH:MM', capacity=N, features=['feature1'])
+reserve_group(guest_name='Group Name', headcount=N, date='YYYY-MM-DD', start_time='HH:MM', end_time='HH:MM', features=['feature1'])
+reserve_recurring(room_id=N, guest_name='Guest Name', date='YYYY-MM-DD', start_time='HH:MM', end_time='HH:MM', frequency='weekly', weekdays=['monday', 'friday'], until='YYYY-MM-DD')
+cancel_reservation(reservation_id=N, guest_name='Guest Name')
+modify_reservation(reservation_id=N, date='YYYY-MM-DD', start_time='HH:MM', end_time='HH:MM')
 """
 
 # Initialize chat history
 reservation_agent_system_message = SystemMessage(content=reservation_agent_system_prompt)
 
-tools = [check_availability, reserve_room]
+tools = [
+    check_availability, reserve_room, find_next_available, check_availability_with_alternatives,
+    cancel_reservation, modify_reservation, reserve_group, reserve_recurring
+]
 
 llm = ChatGoogleGenerativeAI(
     model= "gemini-2.0-flash",
@@ -69,6 +135,23 @@ llm.bind_tools(tools)
 
 def parse_tool_call(tool_code):
     """Parse a tool call string into a name and arguments."""
+    # A call written as Python keeps its lists and booleans intact
+    try:
+        call = ast.parse(tool_code.strip(), mode="eval").body
+    except SyntaxError:
+        call = None
+    if isinstance(call, ast.Call) and isinstance(call.func, ast.Name):
+        args_dict = {}
+        for keyword in call.keywords:
+            if keyword.arg is None:
+                continue
+            try:
+                args_dict[keyword.arg] = ast.literal_eval(keyword.value)
+            except ValueError:
+                # Bare words such as true are passed on as text
+                args_dict[keyword.arg] = ast.get_source_segment(tool_code.strip(), keyword.value)
+        return call.func.id, args_dict
+
     # Extract the function name
     match = re.search(r'(\w+)\(', tool_code)
     if not match:
@@ -141,8 +224,15 @@ def handle_reserve_room_print_case(tool_code):
         if start_time: args_dict['start_time'] = start_time.group(1)
         if end_time: args_dict['end_time'] = end_time.group(1)
         
+        check_in = re.search(r'"check_in":\s*"([^"]+)"', dict_str)
+        check_out = re.search(r'"check_out":\s*"([^"]+)"', dict_str)
+        if check_in: args_dict['check_in'] = check_in.group(1)
+        if check_out: args_dict['check_out'] = check_out.group(1)
+        
         # Check if we have all required parameters
-        if len(args_dict) < 5:
+        has_window = all(k in args_dict for k in ('date', 'start_time', 'end_time')) or \
+            all(k in args_dict for k in ('check_in', 'check_out'))
+        if 'room_id' not in args_dict or 'guest_name' not in args_dict or not has_window:
             return None
     
     return create_reserve_room_message(args_dict)
@@ -160,6 +250,84 @@ def create_check_availability_message(args_dict):
         tool_calls=[tool_call]
     )
 
+def create_find_next_available_message(args_dict):
+    """Create an AIMessage with a proper tool call for find_next_available."""
+    tool_call = ToolCall(
+        name="find_next_available",
+        args={"query_parameters": args_dict},
+        id=f"tool_call_{hash(str(args_dict))}"
+    )
+    
+    return AIMessage(
+        content="I'll look for the next available times.",
+        tool_calls=[tool_call]
+    )
+
+def create_check_availability_with_alternatives_message(args_dict):
+    """Create an AIMessage with a proper tool call for check_availability_with_alternatives."""
+    tool_call = ToolCall(
+        name="check_availability_with_alternatives",
+        args={"query_parameters": args_dict},
+        id=f"tool_call_{hash(str(args_dict))}"
+    )
+    
+    return AIMessage(
+        content="I'll check the availability and look for alternatives for you.",
+        tool_calls=[tool_call]
+    )
+
+def create_reserve_group_message(args_dict):
+    """Create an AIMessage with a proper tool call for reserve_group."""
+    tool_call = ToolCall(
+        name="reserve_group",
+        args={"group_data": args_dict},
+        id=f"tool_call_{hash(str(args_dict))}"
+    )
+    
+    return AIMessage(
+        content=f"I'll reserve rooms for {args_dict.get('headcount')} guests of {args_dict.get('guest_name')}.",
+        tool_calls=[tool_call]
+    )
+
+def create_reserve_recurring_message(args_dict):
+    """Create an AIMessage with a proper tool call for reserve_recurring."""
+    tool_call = ToolCall(
+        name="reserve_recurring",
+        args={"reservation_data": args_dict},
+        id=f"tool_call_{hash(str(args_dict))}"
+    )
+    
+    return AIMessage(
+        content=f"I'll reserve room {args_dict.get('room_id')} for {args_dict.get('guest_name')} on a {args_dict.get('frequency')} schedule.",
+        tool_calls=[tool_call]
+    )
+
+def create_cancel_reservation_message(args_dict):
+    """Create an AIMessage with a proper tool call for cancel_reservation."""
+    tool_call = ToolCall(
+        name="cancel_reservation",
+        args={"cancellation": args_dict},
+        id=f"tool_call_{hash(str(args_dict))}"
+    )
+    
+    return AIMessage(
+        content=f"I'll cancel reservation {args_dict.get('reservation_id')}.",
+        tool_calls=[tool_call]
+    )
+
+def create_modify_reservation_message(args_dict):
+    """Create an AIMessage with a proper tool call for modify_reservation."""
+    tool_call = ToolCall(
+        name="modify_reservation",
+        args={"modification": args_dict},
+        id=f"tool_call_{hash(str(args_dict))}"
+    )
+    
+    return AIMessage(
+        content=f"I'll update reservation {args_dict.get('reservation_id')}.",
+        tool_calls=[tool_call]
+    )
+
 def create_reserve_room_message(args_dict):
     """Create an AIMessage with a proper tool call for reserve_room."""
     tool_call = ToolCall(
@@ -192,6 +360,18 @@ def process_tool_call(content):
         return create_check_availability_message(args_dict)
     elif tool_name == "reserve_room":
         return create_reserve_room_message(args_dict)
+    elif tool_name == "find_next_available":
+        return create_find_next_available_message(args_dict)
+    elif tool_name == "check_availability_with_alternatives":
+        return create_check_availability_with_alternatives_message(args_dict)
+    elif tool_name == "reserve_group":
+        return create_reserve_group_message(args_dict)
+    elif tool_name == "reserve_recurring":
+        return create_reserve_recurring_message(args_dict)
+    elif tool_name == "cancel_reservation":
+        return create_cancel_reservation_message(args_dict)
+    elif tool_name == "modify_reservation":
+        return create_modify_reservation_message(args_dict)
     
     return None
 
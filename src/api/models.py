@@ -21,20 +21,98 @@ class ChatResponse(BaseModel):
     messages: Optional[List[MessageContent]] = None
 
 class AvailabilityQueryParams(BaseModel):
-    """Parameters for room availability search."""
-    date: str = Field(..., example="2023-05-15")
-    start_time: str = Field(..., example="14:00")
-    end_time: str = Field(..., example="16:00")
+    """Parameters for room availability search (a same-day window or a check-in/check-out range)."""
+    date: Optional[str] = Field(None, example="2023-05-15")
+    start_time: Optional[str] = Field(None, example="14:00")
+    end_time: Optional[str] = Field(None, example="16:00")
+    check_in: Optional[str] = Field(None, example="2023-05-15 15:00")
+    check_out: Optional[str] = Field(None, example="2023-05-18 11:00")
     capacity: Optional[int] = Field(1, example=2)
     features: Optional[List[str]] = Field(None, example=["WiFi", "Projector"])
+    sort: Optional[str] = Field(None, example="capacity", description="'id' (default), 'capacity' or '-capacity'")
+    limit: Optional[int] = Field(None, ge=1, example=50)
+    after_room_id: Optional[int] = Field(None, example=120, description="Last room id of the previous page")
+
+class AlternativesQueryParams(AvailabilityQueryParams):
+    """Availability search that suggests near misses when nothing matches."""
+    flex_minutes: Optional[int] = Field(None, ge=0, example=120)
+    max_alternatives: Optional[int] = Field(None, ge=1, le=50, example=5)
+
+class AvailabilityBatchRequest(BaseModel):
+    """Several availability searches answered in one request."""
+    queries: List[AvailabilityQueryParams] = Field(..., min_length=1)
+
+class AvailabilityBatchResult(BaseModel):
+    """Outcome of one query in a batch."""
+    status: str
+    rooms: Optional[List[Dict[str, Any]]] = None
+    message: Optional[str] = None
+
+class AvailabilityBatchResponse(BaseModel):
+    """Batch results keyed by the index of the query in the request."""
+    results: Dict[int, AvailabilityBatchResult]
+
+class NextAvailableQuery(BaseModel):
+    """Search for the earliest free windows of a given length."""
+    duration_minutes: int = Field(..., gt=0, example=120)
+    search_from: Optional[str] = Field(None, example="2023-05-15 09:00")
+    search_until: Optional[str] = Field(None, example="2023-05-20 18:00")
+    horizon_days: Optional[int] = Field(None, gt=0, example=7)
+    capacity: Optional[int] = Field(1, example=2)
+    features: Optional[List[str]] = Field(None, example=["WiFi"])
+    windows_per_room: Optional[int] = Field(3, ge=1, le=20)
+    max_rooms: Optional[int] = Field(5, ge=1, le=100)
 
 class RoomReservationRequest(BaseModel):
-    """Parameters for room reservation."""
-    room_id: int = Field(..., example=1)
+    """Parameters for room reservation (a same-day window or a check-in/check-out range)."""
+    room_id: Optional[int] = Field(None, example=1)
     guest_name: str = Field(..., example="John Doe")
-    date: str = Field(..., example="2023-05-15")
-    start_time: str = Field(..., example="14:00")
-    end_time: str = Field(..., example="16:00")
+    date: Optional[str] = Field(None, example="2023-05-15")
+    start_time: Optional[str] = Field(None, example="14:00")
+    end_time: Optional[str] = Field(None, example="16:00")
+    check_in: Optional[str] = Field(None, example="2023-05-15 15:00")
+    check_out: Optional[str] = Field(None, example="2023-05-18 11:00")
+    flexible: Optional[bool] = Field(None, example=False)
+    capacity: Optional[int] = Field(None, ge=1, example=2)
+    features: Optional[List[str]] = Field(None, example=["WiFi"])
+
+class RecurringReservationRequest(BaseModel):
+    """Parameters for booking a room on every occurrence of a daily or weekly series."""
+    room_id: int = Field(..., example=9)
+    guest_name: str = Field(..., example="Acme Corp")
+    date: Optional[str] = Field(None, example="2023-05-15")
+    start_time: Optional[str] = Field(None, example="09:00")
+    end_time: Optional[str] = Field(None, example="10:00")
+    check_in: Optional[str] = Field(None, example="2023-05-15 09:00")
+    check_out: Optional[str] = Field(None, example="2023-05-15 10:00")
+    frequency: str = Field(..., example="weekly")
+    interval: Optional[int] = Field(None, ge=1, example=1)
+    weekdays: Optional[List[str]] = Field(None, example=["monday", "tuesday", "wednesday", "thursday", "friday"])
+    until: Optional[str] = Field(None, example="2023-08-31")
+    count: Optional[int] = Field(None, ge=1, example=12)
+    skip_conflicts: bool = Field(False, example=False)
+
+class GroupReservationRequest(BaseModel):
+    """Parameters for booking enough rooms for a group (a same-day window or a check-in/check-out range)."""
+    guest_name: str = Field(..., example="Smith Wedding")
+    headcount: int = Field(..., ge=1, example=14)
+    features: Optional[List[str]] = Field(None, example=["WiFi"])
+    date: Optional[str] = Field(None, example="2023-05-15")
+    start_time: Optional[str] = Field(None, example="14:00")
+    end_time: Optional[str] = Field(None, example="16:00")
+    check_in: Optional[str] = Field(None, example="2023-05-15 15:00")
+    check_out: Optional[str] = Field(None, example="2023-05-18 11:00")
+    max_rooms: Optional[int] = Field(None, ge=1, example=6)
+
+class ReservationModificationRequest(BaseModel):
+    """Fields to change on an existing reservation; anything left out keeps its current value."""
+    room_id: Optional[int] = Field(None, example=2)
+    guest_name: Optional[str] = Field(None, example="John Doe")
+    date: Optional[str] = Field(None, example="2023-05-16")
+    start_time: Optional[str] = Field(None, example="15:00")
+    end_time: Optional[str] = Field(None, example="17:00")
+    check_in: Optional[str] = Field(None, example="2023-05-16 15:00")
+    check_out: Optional[str] = Field(None, example="2023-05-19 11:00")
 
 class Thread(BaseModel):
     """Model for conversation thread information."""
@@ -1,15 +1,29 @@
 # src/api/routes.py
-from fastapi import APIRouter, HTTPException, Body
-from typing import List, Dict
+import io
+import json
+from fastapi import APIRouter, HTTPException, Body, Query, UploadFile, File, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Optional
 from api.models import (
     ChatRequest, ChatResponse, MessageContent, 
-    AvailabilityQueryParams, RoomReservationRequest, Thread
+    AvailabilityQueryParams, RoomReservationRequest, Thread,
+    AvailabilityBatchRequest, AvailabilityBatchResponse, NextAvailableQuery, AlternativesQueryParams,
+    ReservationModificationRequest, GroupReservationRequest, RecurringReservationRequest
 )
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.database_operations import check_availability, reserve_room
+from database.async_operations import (
+    check_availability, check_availability_batch, reserve_room, list_rooms, list_reservations,
+    import_reservations, availability_cache_stats, iter_available_rooms, find_next_available,
+    check_availability_with_alternatives, archive_reservations, cancel_reservation, modify_reservation,
+    write_queue_stats, reserve_group, optimize_room_assignment, reserve_recurring, occupancy_report,
+    check_occupancy
+)
+from database.bulk_import import detect_format, check_encoding, read_reservation_rows, IMPORT_FORMATS
+from core.config import settings
 
 from service.reservation_service import reservation_service
 router = APIRouter()
@@ -136,16 +150,184 @@ async def delete_thread(thread_id: str):
     raise HTTPException(status_code=404, detail="Thread not found")
 
 # Direct API endpoints for room operations
+@router.get("/rooms", response_model=List[Dict])
+async def list_rooms_api():
+    """List every room with its capacity and features."""
+    return await list_rooms()
+
+@router.get("/reservations", response_model=List[Dict])
+async def list_reservations_api(room_id: Optional[int] = None, date: Optional[str] = None,
+                                include_archived: bool = False):
+    """List reservations, optionally filtered by room and date; include_archived also reads past ones."""
+    try:
+        return await list_reservations({"room_id": room_id, "date": date, "include_archived": include_archived})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reservations/write-queue", response_model=Dict)
+async def write_queue_stats_api():
+    """Batching, throughput and latency counters of the group-commit write queue."""
+    return await write_queue_stats()
+
+@router.patch("/reservations/{reservation_id}", response_model=Dict)
+async def modify_reservation_api(reservation_id: int, modification: ReservationModificationRequest):
+    """Move a reservation to another room or window, or rename the guest, if the new slot is free."""
+    result = await modify_reservation({**modification.dict(exclude_none=True), "reservation_id": reservation_id})
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+
+@router.delete("/reservations/{reservation_id}", response_model=Dict)
+async def cancel_reservation_api(reservation_id: int, guest_name: Optional[str] = None):
+    """Cancel a reservation; with guest_name, only if it is booked under that name."""
+    result = await cancel_reservation({"reservation_id": reservation_id, "guest_name": guest_name})
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+
+@router.post("/reservations/archive", response_model=Dict)
+async def archive_reservations_api(before: Optional[str] = None, batch_size: Optional[int] = None):
+    """Move reservations that ended by the cutoff to the archive table."""
+    result = await archive_reservations(before, batch_size)
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@router.post("/reservations/bulk", response_model=Dict)
+async def import_reservations_api(file: UploadFile = File(...), format: Optional[str] = None,
+                                  chunk_size: Optional[int] = None):
+    """Import a CSV or JSONL file of reservations; rows that cannot be booked are reported, not fatal."""
+    try:
+        file_format = format or detect_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown import format '{file_format}'")
+
+    # The upload is spooled to disk by the server: check it decodes, then read it back in chunks
+    try:
+        await run_in_threadpool(check_encoding, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return await import_reservations(read_reservation_rows(stream, file_format), chunk_size)
+    finally:
+        stream.detach()
+
 @router.post("/rooms/availability", response_model=List[Dict])
-async def check_room_availability(query: AvailabilityQueryParams):
-    """Check for available rooms based on criteria."""
-    available_rooms = check_availability(query.dict(exclude_none=True))
+async def check_room_availability(query: AvailabilityQueryParams, response: Response):
+    """Check for available rooms based on criteria; with a limit, X-Next-After-Room-Id points to the next page."""
+    try:
+        available_rooms = await check_availability(query.dict(exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if query.limit is not None and len(available_rooms) == query.limit:
+        response.headers["X-Next-After-Room-Id"] = str(available_rooms[-1]["id"])
     return available_rooms
 
+@router.post("/rooms/availability/alternatives", response_model=Dict)
+async def check_room_availability_with_alternatives(query: AlternativesQueryParams):
+    """Check availability; when no room matches, return ranked near-miss alternatives."""
+    try:
+        return await check_availability_with_alternatives(query.dict(exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/rooms/availability/stream")
+async def stream_room_availability(query: AvailabilityQueryParams):
+    """Stream the available rooms as NDJSON, fetched page by page instead of as one list."""
+    rooms = iter_available_rooms(query.dict(exclude_none=True))
+    try:
+        # Fetch the first page up front so invalid queries still get a 400
+        first = await rooms.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def lines():
+        if first is None:
+            return
+        yield json.dumps(first) + "\n"
+        async for room in rooms:
+            yield json.dumps(room) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/rooms/availability/batch", response_model=AvailabilityBatchResponse)
+async def check_room_availability_batch(batch: AvailabilityBatchRequest):
+    """Check availability for many queries at once; per-query errors are returned inline."""
+    if len(batch.queries) > settings.AVAILABILITY_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {settings.AVAILABILITY_BATCH_MAX_QUERIES} queries"
+        )
+    results = await check_availability_batch([query.dict(exclude_none=True) for query in batch.queries])
+    return AvailabilityBatchResponse(results=results)
+
+@router.post("/rooms/next-available", response_model=List[Dict])
+async def find_next_available_api(query: NextAvailableQuery):
+    """Earliest free windows of the requested length for each matching room."""
+    try:
+        return await find_next_available(query.dict(exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/rooms/availability/cache", response_model=Dict)
+async def availability_cache_stats_api():
+    """Hit, miss and eviction counters of the availability cache."""
+    return await availability_cache_stats()
+
 @router.post("/rooms/reserve", response_model=Dict)
 async def reserve_room_api(reservation: RoomReservationRequest):
     """Reserve a room directly through the API."""
-    reservation_result = reserve_room(reservation.dict())
+    reservation_result = await reserve_room(reservation.dict(exclude_none=True))
     if reservation_result.get("status") == "error":
         raise HTTPException(status_code=400, detail=reservation_result.get("message"))
-    return reservation_result
\ No newline at end of file
+    return reservation_result
+
+@router.post("/rooms/optimize", response_model=Dict)
+async def optimize_room_assignment_api(start: Optional[str] = Query(None, alias="from"), until: Optional[str] = None,
+                                       dry_run: bool = False):
+    """Move flexible reservations between equivalent rooms so free time gathers into bookable blocks."""
+    result = await optimize_room_assignment({"from": start, "until": until, "dry_run": dry_run})
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@router.post("/rooms/reserve-recurring", response_model=Dict)
+async def reserve_recurring_api(reservation: RecurringReservationRequest):
+    """Reserve a room on every occurrence of a daily or weekly series in one transaction."""
+    result = await reserve_recurring(reservation.dict(exclude_none=True))
+    if result.get("status") == "error":
+        # Conflicts come back in full so the client can see which dates are taken
+        if result.get("conflicts"):
+            raise HTTPException(status_code=409, detail=result)
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+
+@router.post("/rooms/reserve-group", response_model=Dict)
+async def reserve_group_api(group: GroupReservationRequest):
+    """Reserve the set of rooms that seats a group with the fewest empty beds, all or none."""
+    result = await reserve_group(group.dict(exclude_none=True))
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+
+@router.get("/analytics/occupancy", response_model=Dict)
+async def occupancy_api(start: Optional[str] = Query(None, alias="from"), to: Optional[str] = None,
+                        group_by: str = "day"):
+    """Booked minutes against available minutes per day, room or feature, read from the daily summary."""
+    result = await occupancy_report({"from": start, "to": to, "group_by": group_by})
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@router.get("/analytics/occupancy/check", response_model=Dict)
+async def check_occupancy_api(start: Optional[str] = Query(None, alias="from"), to: Optional[str] = None):
+    """Compare the daily occupancy summary with the reservations it is derived from."""
+    result = await check_occupancy(start, to)
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
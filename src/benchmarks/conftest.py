@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.backends import FileSQLiteBackend
+from database.generate_dataset import populate
+
+# Generated fixture databases: name -> populate() arguments
+DATASETS = {
+    "small": {"rooms": 200, "days": 180},
+    "medium": {"rooms": 1000, "days": 365},
+    "large": {"rooms": 5000, "days": 730},
+}
+DATASET_START_DATE = "2024-01-01"
+DATASET_SEED = 1
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("database benchmarks")
+    group.addoption("--bench-sizes", default=os.getenv("BENCH_SIZES", "small,medium"),
+                    help=f"comma separated fixture databases to run against, from {list(DATASETS)}")
+    group.addoption("--bench-data-dir", default=os.getenv("BENCH_DATA_DIR",
+                                                          os.path.join(tempfile.gettempdir(), "hotel-bench")),
+                    help="where generated fixture databases are kept between runs")
+    group.addoption("--bench-baseline", default=DEFAULT_BASELINE,
+                    help="baseline JSON file with the p50/p95 of each benchmark")
+    group.addoption("--bench-compare", action="store_true", default=bool(os.getenv("BENCH_COMPARE")),
+                    help="compare both p50 and p95 with the baseline at --bench-threshold; use it with a "
+                         "baseline recorded on this machine")
+    group.addoption("--bench-threshold", type=float, default=float(os.getenv("BENCH_REGRESSION_THRESHOLD", "0.5")),
+                    help="allowed slowdown of p50/p95 against the baseline with --bench-compare, as a fraction")
+    group.addoption("--bench-p95-tolerance", type=float, default=float(os.getenv("BENCH_P95_TOLERANCE", "2.0")),
+                    help="allowed slowdown of p95 against the baseline in a default run, as a fraction; "
+                         "wide enough for another machine, narrow enough for a lost index or lock")
+    group.addoption("--bench-update-baseline", action="store_true",
+                    help="write this run's results to the baseline instead of comparing")
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset" in metafunc.fixturenames:
+        sizes = [size.strip() for size in metafunc.config.getoption("bench_sizes").split(",") if size.strip()]
+        unknown = set(sizes) - set(DATASETS)
+        if unknown:
+            raise pytest.UsageError(f"Unknown benchmark sizes {sorted(unknown)}, expected {list(DATASETS)}")
+        metafunc.parametrize("dataset", sizes, indirect=True, scope="session")
+
+
+@pytest.fixture(scope="session")
+def dataset(request):
+    """Path of a generated fixture database, built once and reused across runs."""
+    name = request.param
+    options = DATASETS[name]
+    directory = request.config.getoption("bench_data_dir")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(
+        directory, f"{name}-{options['rooms']}r-{options['days']}d-seed{DATASET_SEED}.db"
+    )
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        backend = FileSQLiteBackend(partial)
+        with backend.connection() as conn:
+            populate(conn, start_date=DATASET_START_DATE, seed=DATASET_SEED, **options)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        backend.close()
+        os.replace(partial, path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def read_backend(dataset):
+    """A backend over the fixture database, for benchmarks that only read."""
+    # The availability cache would turn repeated benchmark queries into dict lookups
+    backend = FileSQLiteBackend(dataset, pool_size=32, cache=False)
+    backend.warm_up()
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def write_backend(dataset, tmp_path):
+    """A backend over a private copy of the fixture database, for benchmarks that write."""
+    path = str(tmp_path / os.path.basename(dataset))
+    shutil.copyfile(dataset, path)
+    backend = FileSQLiteBackend(path, pool_size=32, cache=False)
+    backend.warm_up()
+    yield backend
+    backend.close()
+
+
+@pytest.fixture(params=["direct", "queued"])
+def burst_backend(dataset, tmp_path, request):
+    """A write backend booking directly, or through the group-commit write queue."""
+    path = str(tmp_path / os.path.basename(dataset))
+    shutil.copyfile(dataset, path)
+    backend = FileSQLiteBackend(path, pool_size=32, cache=False, write_queue=request.param == "queued")
+    backend.warm_up()
+    yield backend
+    backend.close()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    position = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[position]
+
+
+class BaselineRecorder:
+    """
+    Records the p50/p95 of each benchmark and compares them with the stored baseline.
+
+    By default only p95 is checked, against the wide p95_tolerance, since the
+    committed baseline comes from another machine; compare=True checks p50
+    and p95 against threshold.
+    """
+
+    def __init__(self, path, threshold, update, compare=False, p95_tolerance=2.0):
+        self.path = path
+        self.threshold = threshold
+        self.update = update
+        self.compare = compare
+        self.p95_tolerance = p95_tolerance
+        self.results = {}
+        self.baseline = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.baseline = json.load(f)
+
+    def check(self, name, timings):
+        """Record a benchmark's timings; returns the regressions against the baseline."""
+        result = {"p50": _percentile(timings, 0.50), "p95": _percentile(timings, 0.95), "rounds": len(timings)}
+        self.results[name] = result
+        if self.update or name not in self.baseline:
+            return []
+        statistics, threshold = (("p50", "p95"), self.threshold) if self.compare else (("p95",), self.p95_tolerance)
+        regressions = []
+        for statistic in statistics:
+            allowed = self.baseline[name][statistic] * (1 + threshold)
+            if result[statistic] > allowed:
+                regressions.append(
+                    f"{statistic} {result[statistic] * 1000:.3f} ms > baseline "
+                    f"{self.baseline[name][statistic] * 1000:.3f} ms + {threshold:.0%}"
+                )
+        return regressions
+
+    def save(self):
+        merged = {**self.baseline, **self.results}
+        with open(self.path, "w") as f:
+            json.dump(dict(sorted(merged.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    config = request.config
+    recorder = BaselineRecorder(
+        config.getoption("bench_baseline"),
+        config.getoption("bench_threshold"),
+        config.getoption("bench_update_baseline"),
+        config.getoption("bench_compare"),
+        config.getoption("bench_p95_tolerance"),
+    )
+    yield recorder
+    if recorder.update:
+        recorder.save()
+
+
+@pytest.fixture
+def check_regression(request, baseline):
+    """Call with a finished benchmark fixture to fail the test on a p50/p95 regression."""
+    def check(benchmark, timings=None):
+        # --benchmark-disable runs each benchmark once, without statistics
+        if benchmark.disabled or benchmark.stats is None:
+            return
+        timings = timings if timings is not None else benchmark.stats.stats.data
+        regressions = baseline.check(request.node.name, timings)
+        benchmark.extra_info.update(baseline.results[request.node.name])
+        if regressions:
+            pytest.fail(f"{request.node.name} regressed: " + "; ".join(regressions))
+    return check
@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+from itertools import cycle
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import DATASETS, DATASET_START_DATE
+from database.time_utils import from_minutes, to_minutes, MINUTES_PER_DAY
+
+# check_availability parameter mixes: capacity and feature selectivity
+AVAILABILITY_SCENARIOS = {
+    "any_room": {"capacity": 1},
+    "large_capacity": {"capacity": 8},
+    "common_features": {"capacity": 2, "features": ["WiFi", "TV"]},
+    "rare_feature": {"capacity": 1, "features": ["Conference Room"]},
+}
+
+# Every run measures the same seeded calls, one per round, so runs stay comparable
+ROUNDS = 200
+WARMUP_ROUNDS = 20
+CONTENDED_THREADS = 8
+CONTENDED_ROUNDS = 30
+BURST_THREADS = 32
+BURST_ROUNDS = 20
+
+
+def _windows(dataset_name, count, inside_span=True, seed=0):
+    """Seeded same-day windows, inside the generated span or in the empty days after it."""
+    rng = random.Random(seed)
+    days = DATASETS[dataset_name]["days"]
+    first_day = to_minutes(DATASET_START_DATE, 0) // MINUTES_PER_DAY
+    if not inside_span:
+        first_day += days + 1
+    windows = []
+    for _ in range(count):
+        start_ts = (first_day + rng.randrange(days)) * MINUTES_PER_DAY + rng.randrange(8, 20) * 60
+        date, start_time = from_minutes(start_ts)
+        end_time = from_minutes(start_ts + rng.randint(1, 4) * 60)[1]
+        windows.append({"date": date, "start_time": start_time, "end_time": end_time})
+    return windows
+
+
+@pytest.mark.parametrize("scenario", list(AVAILABILITY_SCENARIOS))
+@pytest.mark.parametrize("density", ["booked_days", "empty_days"])
+def test_check_availability(benchmark, check_regression, read_backend, request, scenario, density):
+    dataset_name = request.node.callspec.params["dataset"]
+    queries = cycle([
+        {**window, **AVAILABILITY_SCENARIOS[scenario]}
+        for window in _windows(dataset_name, ROUNDS, inside_span=density == "booked_days")
+    ])
+
+    benchmark.pedantic(read_backend.check_availability, setup=lambda: ((next(queries),), {}),
+                       rounds=ROUNDS, warmup_rounds=WARMUP_ROUNDS)
+    check_regression(benchmark)
+
+
+def test_reserve_room_serial(benchmark, check_regression, write_backend, request):
+    """Bookings that succeed: fresh windows after the generated span."""
+    dataset_name = request.node.callspec.params["dataset"]
+    rng = random.Random(1)
+    rooms = DATASETS[dataset_name]["rooms"]
+    requests = iter([
+        {"room_id": rng.randint(1, rooms), "guest_name": "Bench", **window}
+        for window in _windows(dataset_name, ROUNDS + WARMUP_ROUNDS, inside_span=False, seed=1)
+    ])
+
+    benchmark.pedantic(write_backend.reserve_room, setup=lambda: ((next(requests),), {}),
+                       rounds=ROUNDS, warmup_rounds=WARMUP_ROUNDS)
+    check_regression(benchmark)
+
+
+def test_reserve_room_conflicting(benchmark, check_regression, write_backend, request):
+    """Random bookings inside the generated span, most of which hit an existing reservation."""
+    dataset_name = request.node.callspec.params["dataset"]
+    rng = random.Random(2)
+    rooms = DATASETS[dataset_name]["rooms"]
+    requests = iter([
+        {"room_id": rng.randint(1, rooms), "guest_name": "Bench", **window}
+        for window in _windows(dataset_name, ROUNDS + WARMUP_ROUNDS, seed=2)
+    ])
+
+    benchmark.pedantic(write_backend.reserve_room, setup=lambda: ((next(requests),), {}),
+                       rounds=ROUNDS, warmup_rounds=WARMUP_ROUNDS)
+    check_regression(benchmark)
+
+
+def test_reserve_room_contended(benchmark, check_regression, write_backend, request):
+    """CONTENDED_THREADS threads booking the same room and window at once; latency per call."""
+    dataset_name = request.node.callspec.params["dataset"]
+    windows = iter(_windows(dataset_name, CONTENDED_ROUNDS, inside_span=False, seed=3))
+    latencies = []
+
+    def contend():
+        window = next(windows)
+        barrier = threading.Barrier(CONTENDED_THREADS)
+        outcomes = []
+
+        def book(worker):
+            barrier.wait()
+            started = time.perf_counter()
+            outcomes.append(write_backend.reserve_room({"room_id": 1, "guest_name": f"Bench {worker}", **window}))
+            latencies.append(time.perf_counter() - started)
+
+        threads = [threading.Thread(target=book, args=(worker,)) for worker in range(CONTENDED_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(outcome["status"] == "success" for outcome in outcomes) == 1
+
+    benchmark.pedantic(contend, rounds=CONTENDED_ROUNDS)
+    check_regression(benchmark, latencies)
+
+
+def test_reserve_room_burst(benchmark, check_regression, burst_backend, request):
+    """BURST_THREADS threads each booking a different room at once; time until the whole burst is booked."""
+    dataset_name = request.node.callspec.params["dataset"]
+    windows = iter(_windows(dataset_name, BURST_ROUNDS + 1, inside_span=False, seed=4))
+    latencies = []
+
+    def burst():
+        window = next(windows)
+        barrier = threading.Barrier(BURST_THREADS)
+        outcomes = []
+
+        def book(worker):
+            barrier.wait()
+            started = time.perf_counter()
+            outcomes.append(burst_backend.reserve_room({"room_id": worker + 1, "guest_name": f"Bench {worker}", **window}))
+            latencies.append(time.perf_counter() - started)
+
+        threads = [threading.Thread(target=book, args=(worker,)) for worker in range(BURST_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(outcome["status"] == "success" for outcome in outcomes)
+
+    benchmark.pedantic(burst, rounds=BURST_ROUNDS, warmup_rounds=1)
+    benchmark.extra_info["write_queue"] = burst_backend.write_queue_stats()
+    check_regression(benchmark, latencies)
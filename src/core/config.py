@@ -14,6 +14,59 @@ class Settings:
     
     # Database settings
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///hotel.db")
+    DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "5"))
+    DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+    # Threads running database calls for the async API routes (0: one per pooled connection)
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "0"))
+    # "sql" queries the reservations table, "index" answers from the in-memory interval
+    # index, "bitmap" from the NumPy slot occupancy arrays (requires numpy)
+    AVAILABILITY_ENGINE = os.getenv("AVAILABILITY_ENGINE", "sql")
+    SLOT_MINUTES = int(os.getenv("SLOT_MINUTES", "5"))
+    SLOT_BITMAP_HISTORY_DAYS = int(os.getenv("SLOT_BITMAP_HISTORY_DAYS", "30"))
+    # Times used when a check-in / check-out is given as a bare date
+    DEFAULT_CHECK_IN_TIME = os.getenv("DEFAULT_CHECK_IN_TIME", "15:00")
+    DEFAULT_CHECK_OUT_TIME = os.getenv("DEFAULT_CHECK_OUT_TIME", "11:00")
+    # Read-through cache of check_availability results, invalidated per date by writes. Off by default:
+    # only this process's writes invalidate it, so with several workers or a CLI writer a read can be
+    # up to AVAILABILITY_CACHE_TTL seconds stale
+    AVAILABILITY_CACHE_ENABLED = os.getenv("AVAILABILITY_CACHE_ENABLED", "false").lower() == "true"
+    AVAILABILITY_CACHE_SIZE = int(os.getenv("AVAILABILITY_CACHE_SIZE", "1024"))
+    AVAILABILITY_CACHE_TTL = float(os.getenv("AVAILABILITY_CACHE_TTL", "30"))
+    # Rooms fetched per keyset page by the streaming availability endpoint
+    AVAILABILITY_STREAM_PAGE_SIZE = int(os.getenv("AVAILABILITY_STREAM_PAGE_SIZE", "500"))
+    # find_next_available: default search horizon and start-time granularity
+    NEXT_AVAILABLE_HORIZON_DAYS = int(os.getenv("NEXT_AVAILABLE_HORIZON_DAYS", "14"))
+    NEXT_AVAILABLE_STEP_MINUTES = int(os.getenv("NEXT_AVAILABLE_STEP_MINUTES", "15"))
+    # How far check_availability_with_alternatives may move a window, in minutes
+    ALTERNATIVE_FLEX_MINUTES = int(os.getenv("ALTERNATIVE_FLEX_MINUTES", "120"))
+    # Group commit: reserve_room calls are queued to one writer thread that books up to
+    # WRITE_QUEUE_MAX_BATCH of them per transaction, waiting at most WRITE_QUEUE_MAX_WAIT_MS for a batch to fill
+    WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE_ENABLED", "false").lower() == "true"
+    WRITE_QUEUE_MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "64"))
+    WRITE_QUEUE_MAX_WAIT_MS = float(os.getenv("WRITE_QUEUE_MAX_WAIT_MS", "2"))
+    # Flexible bookings and the room re-optimization job: gaps shorter than MIN_GAP are
+    # stranded, PROBE is the booking length counted as recovered capacity
+    ROOM_OPTIMIZER_MIN_GAP_MINUTES = int(os.getenv("ROOM_OPTIMIZER_MIN_GAP_MINUTES", "60"))
+    ROOM_OPTIMIZER_PROBE_MINUTES = int(os.getenv("ROOM_OPTIMIZER_PROBE_MINUTES", "120"))
+    ROOM_OPTIMIZER_HORIZON_DAYS = int(os.getenv("ROOM_OPTIMIZER_HORIZON_DAYS", "14"))
+    ROOM_OPTIMIZER_CANDIDATES = int(os.getenv("ROOM_OPTIMIZER_CANDIDATES", "32"))
+    # Longest series reserve_recurring expands, so a rule without a near end is refused
+    RECURRENCE_MAX_OCCURRENCES = int(os.getenv("RECURRENCE_MAX_OCCURRENCES", "366"))
+    # The occupancy analytics endpoint reads OCCUPANCY_DEFAULT_DAYS days unless asked otherwise
+    OCCUPANCY_DEFAULT_DAYS = int(os.getenv("OCCUPANCY_DEFAULT_DAYS", "30"))
+    OCCUPANCY_MAX_DAYS = int(os.getenv("OCCUPANCY_MAX_DAYS", "1096"))
+    AVAILABILITY_BATCH_MAX_QUERIES = int(os.getenv("AVAILABILITY_BATCH_MAX_QUERIES", "100"))
+    # Rows committed per transaction by the bulk reservation importer
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+    # Archival moves reservations that ended this many days before today to the cold table,
+    # ARCHIVE_BATCH_SIZE rows per short transaction
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "1"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
     
     # LLM settings
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -2,14 +2,20 @@
 from langgraph.graph import START, END, StateGraph
 from langgraph.prebuilt import tools_condition, ToolNode
 from langgraph.graph import MessagesState
-from database.database_operations import check_availability, reserve_room
+from database.database_operations import (
+    check_availability, reserve_room, find_next_available, check_availability_with_alternatives,
+    cancel_reservation, modify_reservation, reserve_group, reserve_recurring
+)
 from agents.ReservationAgent import reservation_assistant_agent
 from langgraph.checkpoint.memory import MemorySaver
 
 def create_reservation_graph():
     """Create and return the LangGraph for reservation handling."""
     # Define your tools
-    tools = [check_availability, reserve_room]
+    tools = [
+        check_availability, reserve_room, find_next_available, check_availability_with_alternatives,
+        cancel_reservation, modify_reservation, reserve_group, reserve_recurring
+    ]
     
     # Create the state graph
     builder = StateGraph(MessagesState)
@@ -0,0 +1,108 @@
+# src/database/alternatives.py
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.room_catalog import RoomCatalog
+from database.reservations import window_from_parameters
+from database.slot_finder import free_windows
+from database.time_utils import format_minutes
+
+# Scores of near-miss alternatives (lower is closer): a missing feature, each person of
+# capacity short, each hour the window moves
+ALTERNATIVE_PENALTIES = {"feature": 1.5, "capacity": 1.0, "hour": 1.0}
+
+
+def check_availability_with_alternatives(backend, query_parameters):
+    """
+    Check availability and, when nothing matches, rank near-miss alternatives.
+
+    Alternatives are rooms free for the window but missing one required
+    feature, rooms of the next smaller capacity, and matching rooms free
+    within flex_minutes of the window. The bookings of every room around
+    the widened window are read in one query, and the exact answer and all
+    alternatives are derived from that same snapshot.
+
+    Each alternative carries a reason and a score (lower is closer):
+    ALTERNATIVE_PENALTIES weighs a missing feature, each person of
+    capacity short, and each hour of shift.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to search
+    query_parameters (dict): The check_availability query, plus flex_minutes
+        and max_alternatives
+
+    Returns:
+    dict: rooms (the exact matches) and alternatives (best first, one per room)
+    """
+    min_capacity = query_parameters.get('capacity', 1)
+    required_features = query_parameters.get('features', [])
+    window = window_from_parameters(query_parameters)
+    flex = int(query_parameters.get('flex_minutes', settings.ALTERNATIVE_FLEX_MINUTES))
+    max_alternatives = int(query_parameters.get('max_alternatives', 5))
+    required = frozenset(required_features or ())
+    catalog = backend.room_catalog()
+
+    if window is None:
+        busy = {}
+    else:
+        busy = backend.busy_intervals([room.id for room in catalog.rooms], window[0] - flex, window[1] + flex)
+
+    def is_free(room_id):
+        return window is None or not any(
+            end_ts > window[0] and start_ts < window[1] for start_ts, end_ts in busy.get(room_id, ())
+        )
+
+    rooms = [
+        RoomCatalog.as_dict(room) for room in catalog.rooms
+        if room.capacity >= min_capacity and required <= room.feature_set and is_free(room.id)
+    ]
+    if rooms:
+        return {"rooms": rooms, "alternatives": []}
+
+    penalties = ALTERNATIVE_PENALTIES
+    smaller_capacity = max((room.capacity for room in catalog.rooms if room.capacity < min_capacity), default=None)
+    candidates = {}
+
+    def offer(room, score, alternative):
+        if room.id not in candidates or score < candidates[room.id][0]:
+            candidates[room.id] = (score, {**RoomCatalog.as_dict(room), **alternative, "score": round(score, 3)})
+
+    for room in catalog.rooms:
+        fits = room.capacity >= min_capacity
+        missing = sorted(required - room.feature_set)
+        if is_free(room.id):
+            if fits and len(missing) == 1:
+                offer(room, penalties["feature"], {"reason": "missing_feature", "missing_feature": missing[0]})
+            if not missing and room.capacity == smaller_capacity:
+                offer(room, penalties["capacity"] * (min_capacity - room.capacity), {"reason": "smaller_room"})
+        elif fits and not missing and flex > 0:
+            shifted = _nearest_shift(busy.get(room.id, ()), window, flex)
+            if shifted is not None:
+                offer(room, penalties["hour"] * abs(shifted[0] - window[0]) / 60, {
+                    "reason": "shifted_time",
+                    "shift_minutes": shifted[0] - window[0],
+                    "check_in": format_minutes(shifted[0]),
+                    "check_out": format_minutes(shifted[1])
+                })
+
+    ranked = sorted(candidates.items(), key=lambda item: (item[1][0], item[0]))
+    return {"rooms": [], "alternatives": [alternative for _, (_, alternative) in ranked[:max_alternatives]]}
+
+
+def _nearest_shift(busy, window, flex):
+    """The free (start_ts, end_ts) of the window's length closest to it within ±flex minutes, or None."""
+    start_ts, end_ts = window
+    duration = end_ts - start_ts
+    step = settings.NEXT_AVAILABLE_STEP_MINUTES
+    best = None
+    for gap_start, _, gap_end in free_windows(busy, start_ts - flex, end_ts + flex, duration, len(busy) + 1, step):
+        # Latest aligned start that still fits the gap, or the requested start if the gap allows it
+        latest = (gap_end - duration) // step * step
+        candidate = min(max(start_ts, gap_start), latest)
+        if candidate < gap_start:
+            continue
+        if best is None or abs(candidate - start_ts) < abs(best - start_ts):
+            best = candidate
+    return None if best is None else (best, best + duration)
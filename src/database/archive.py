@@ -0,0 +1,94 @@
+# src/database/archive.py
+import os
+import sys
+import json
+import argparse
+from datetime import date as date_type, datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.connection import transaction
+from database.time_utils import parse_datetime, format_minutes
+
+# One archival batch: the oldest finished reservations, copied then deleted by id
+ARCHIVE_BATCH_SQL = "SELECT id FROM reservations WHERE end_ts <= ? ORDER BY end_ts LIMIT ?"
+
+ARCHIVE_COPY_SQL = """
+INSERT INTO reservations_archive
+    (id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts, archived_at)
+SELECT id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts, ?
+FROM reservations WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+
+def archive_reservations(backend, before=None, batch_size=None):
+    """
+    Move every reservation that ended at or before a cutoff to reservations_archive.
+
+    Rows move in batches of batch_size, each its own short write
+    transaction, so live bookings only ever wait for one batch. Ids are
+    kept, and the in-memory engines and the cache drop the archived
+    windows once the job is done.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to archive
+    before (str): Cutoff 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM'; defaults to
+        midnight ARCHIVE_AFTER_DAYS days before today
+    batch_size (int): Rows per transaction, ARCHIVE_BATCH_SIZE by default
+
+    Returns:
+    dict: status, archived count, batches and the cutoff used
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    try:
+        if before is None:
+            before = date_type.today() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+        before_ts = parse_datetime(before, "00:00")
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+    archived_at = datetime.now().isoformat(timespec="seconds")
+    archived = batches = 0
+    while True:
+        with backend.connection() as conn, transaction(conn):
+            ids = [row[0] for row in conn.execute(ARCHIVE_BATCH_SQL, (before_ts, batch_size))]
+            if ids:
+                id_list = json.dumps(ids)
+                conn.execute(ARCHIVE_COPY_SQL, (archived_at, id_list))
+                conn.execute("DELETE FROM reservations WHERE id IN (SELECT value FROM json_each(?))", (id_list,))
+        if not ids:
+            break
+        archived += len(ids)
+        batches += 1
+
+    if archived:
+        backend.notify_archived(before_ts)
+    return {
+        "status": "success",
+        "archived": archived,
+        "batches": batches,
+        "before": format_minutes(before_ts),
+        "message": f"Archived {archived} reservation(s) that ended by {format_minutes(before_ts)}"
+    }
+
+
+def main():
+    from database.backends import get_backend
+
+    parser = argparse.ArgumentParser(description="Move reservations that have ended to the archive table")
+    parser.add_argument("--before", help="cutoff 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM' "
+                                         "(default: ARCHIVE_AFTER_DAYS days before today)")
+    parser.add_argument("--batch-size", type=int, help="rows moved per transaction")
+    args = parser.parse_args()
+
+    result = get_backend().archive_reservations(args.before, args.batch_size)
+    print(result["message"])
+    if result["status"] == "error":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
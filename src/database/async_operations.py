@@ -0,0 +1,164 @@
+# src/database/async_operations.py
+import os
+import sys
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database import database_operations
+from database.backends import get_backend
+
+
+class DatabaseExecutor:
+    """
+    Dedicated worker threads for blocking database calls made from async code.
+
+    The FastAPI routes await these instead of calling sqlite3 on the event
+    loop, so a slow query only occupies a database thread while other
+    requests keep being served. The pool is created on first use and can be
+    shut down and recreated, e.g. across application restarts in tests.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # More threads than pooled connections would only queue on the pool
+                    workers = self.max_workers or settings.DB_EXECUTOR_WORKERS or settings.DB_POOL_SIZE
+                    self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+        return self._executor
+
+    async def run(self, function, *args, **kwargs):
+        """Run function(*args, **kwargs) on a database thread and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(function, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads once queued calls have finished."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+db_executor = DatabaseExecutor()
+
+
+# Async variants of the database_operations tool functions, same arguments and results
+
+async def check_availability(query_parameters):
+    """Async variant of database_operations.check_availability."""
+    return await db_executor.run(database_operations.check_availability, query_parameters)
+
+
+async def iter_available_rooms(query_parameters, page_size=None):
+    """Async variant of database_operations.iter_available_rooms; each page is fetched on a database thread."""
+    pages = get_backend().iter_available_room_pages(query_parameters, page_size)
+    while True:
+        rooms = await db_executor.run(next, pages, None)
+        if rooms is None:
+            return
+        for room in rooms:
+            yield room
+
+
+async def reserve_room(reservation_data):
+    """Async variant of database_operations.reserve_room."""
+    write_queue = getattr(get_backend(), "write_queue", None)
+    if write_queue is not None:
+        # Await the writer's future directly, so queued bookings do not each hold a database thread
+        return await asyncio.wrap_future(write_queue.submit(reservation_data))
+    return await db_executor.run(database_operations.reserve_room, reservation_data)
+
+
+async def reserve_group(group_data):
+    """Async variant of database_operations.reserve_group."""
+    return await db_executor.run(database_operations.reserve_group, group_data)
+
+
+async def reserve_recurring(reservation_data):
+    """Async variant of database_operations.reserve_recurring."""
+    return await db_executor.run(database_operations.reserve_recurring, reservation_data)
+
+
+async def cancel_reservation(cancellation):
+    """Async variant of database_operations.cancel_reservation."""
+    return await db_executor.run(database_operations.cancel_reservation, cancellation)
+
+
+async def modify_reservation(modification):
+    """Async variant of database_operations.modify_reservation."""
+    return await db_executor.run(database_operations.modify_reservation, modification)
+
+
+async def check_availability_batch(queries):
+    """Async variant of database_operations.check_availability_batch."""
+    return await db_executor.run(database_operations.check_availability_batch, queries)
+
+
+async def check_availability_matrix(query_parameters):
+    """Async variant of database_operations.check_availability_matrix."""
+    return await db_executor.run(database_operations.check_availability_matrix, query_parameters)
+
+
+async def check_availability_with_alternatives(query_parameters):
+    """Async variant of database_operations.check_availability_with_alternatives."""
+    return await db_executor.run(database_operations.check_availability_with_alternatives, query_parameters)
+
+
+async def find_next_available(query_parameters):
+    """Async variant of database_operations.find_next_available."""
+    return await db_executor.run(database_operations.find_next_available, query_parameters)
+
+
+async def import_reservations(rows, chunk_size=None):
+    """Async variant of database_operations.import_reservations; rows are read on the database thread."""
+    return await db_executor.run(database_operations.import_reservations, rows, chunk_size)
+
+
+async def optimize_room_assignment(options=None):
+    """Async variant of database_operations.optimize_room_assignment."""
+    return await db_executor.run(database_operations.optimize_room_assignment, options)
+
+
+async def write_queue_stats():
+    """Async variant of database_operations.write_queue_stats."""
+    return await db_executor.run(database_operations.write_queue_stats)
+
+
+async def availability_cache_stats():
+    """Async variant of database_operations.availability_cache_stats."""
+    return await db_executor.run(database_operations.availability_cache_stats)
+
+
+async def list_rooms():
+    """Async variant of database_operations.list_rooms."""
+    return await db_executor.run(database_operations.list_rooms)
+
+
+async def list_reservations(filters=None):
+    """Async variant of database_operations.list_reservations."""
+    return await db_executor.run(database_operations.list_reservations, filters)
+
+
+async def archive_reservations(before=None, batch_size=None):
+    """Async variant of database_operations.archive_reservations."""
+    return await db_executor.run(database_operations.archive_reservations, before, batch_size)
+
+
+async def occupancy_report(query_parameters):
+    """Async variant of database_operations.occupancy_report."""
+    return await db_executor.run(database_operations.occupancy_report, query_parameters)
+
+
+async def check_occupancy(first_date=None, last_date=None):
+    """Async variant of database_operations.check_occupancy."""
+    return await db_executor.run(database_operations.check_occupancy, first_date, last_date)
@@ -0,0 +1,137 @@
+# src/database/availability_cache.py
+import time
+import threading
+from collections import OrderedDict
+
+from database.time_utils import days_between
+
+
+class AvailabilityCache:
+    """
+    Bounded LRU cache of check_availability results with a time-to-live.
+
+    Keys are the normalized query (start_ts, end_ts, capacity, sorted
+    features), so different spellings of the same window share an entry.
+    Entries are indexed by every date their window touches; the backend
+    registers the cache as a ReservationListener and a committed write only
+    drops the entries of the dates the reservation touches. Queries without a
+    window do not depend on reservations and are only dropped by clear().
+
+    The TTL bounds how stale an entry can get from writes this process does
+    not see, e.g. other API workers sharing the database file.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=30.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (rooms, expires_at)
+        self._by_date = {}              # date -> set of keys
+        # Bumped by every invalidation; results computed across one are not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(min_capacity, required_features, window):
+        """Normalized cache key of an availability query."""
+        return (window, min_capacity, tuple(sorted(set(required_features or ()))))
+
+    @staticmethod
+    def _dates(key):
+        window = key[0]
+        return days_between(*window) if window else []
+
+    def get(self, key):
+        """Cached rooms for the key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self._clock():
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, rooms, generation):
+        """
+        Store a result computed while self.generation was `generation`.
+
+        The result is dropped if a write invalidated anything in between,
+        since it may predate that write.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (rooms, self._clock() + self.ttl_seconds)
+            for date in self._dates(key):
+                self._by_date.setdefault(date, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        self._entries.pop(key, None)
+        for date in self._dates(key):
+            keys = self._by_date.get(date)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_date[date]
+
+    def invalidate_dates(self, dates):
+        """Drop every entry whose window touches one of the dates."""
+        with self._lock:
+            self.generation += 1
+            for date in dates:
+                for key in list(self._by_date.get(date, ())):
+                    self._discard(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        """Drop everything, e.g. after the rooms changed."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_date.clear()
+
+    def stats(self):
+        """Counters and current size."""
+        with self._lock:
+            return {
+                "enabled": True,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    # Write-through listener interface
+
+    def reservation_added(self, reservation):
+        self.invalidate_dates(days_between(reservation["start_ts"], reservation["end_ts"]))
+
+    def reservation_removed(self, reservation):
+        self.invalidate_dates(days_between(reservation["start_ts"], reservation["end_ts"]))
+
+    def reservations_archived(self, before_ts):
+        # Archived bookings no longer block past windows, up to the cutoff's own date
+        last_date = days_between(before_ts - 1, before_ts)[0]
+        with self._lock:
+            dates = [date for date in self._by_date if date <= last_date]
+        self.invalidate_dates(dates)
@@ -0,0 +1,186 @@
+# src/database/availability_index.py
+import threading
+from bisect import bisect_left, bisect_right
+
+
+class RoomIntervals:
+    """
+    Reservations of a single room as parallel arrays sorted by start.
+
+    max_end[i] is the latest end among the first i + 1 intervals, so an
+    overlap test is one bisect plus one lookup and stays correct even if
+    legacy data contains overlapping bookings for the same room.
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_end")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_end = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _refresh_max_end(self, position):
+        running = self.max_end[position - 1] if position > 0 else None
+        for i in range(position, len(self.ends)):
+            running = self.ends[i] if running is None else max(running, self.ends[i])
+            self.max_end[i] = running
+
+    def add(self, reservation_id, start_ts, end_ts):
+        position = bisect_right(self.starts, start_ts)
+        self.starts.insert(position, start_ts)
+        self.ends.insert(position, end_ts)
+        self.ids.insert(position, reservation_id)
+        self.max_end.insert(position, end_ts)
+        self._refresh_max_end(position)
+
+    def append(self, reservation_id, start_ts, end_ts):
+        """Add an interval known to start no earlier than every existing one."""
+        self.starts.append(start_ts)
+        self.ends.append(end_ts)
+        self.ids.append(reservation_id)
+        self.max_end.append(max(self.max_end[-1], end_ts) if self.max_end else end_ts)
+
+    def remove(self, reservation_id):
+        """Drop an interval; returns False if it was not indexed."""
+        try:
+            position = self.ids.index(reservation_id)
+        except ValueError:
+            return False
+        del self.starts[position], self.ends[position], self.ids[position], self.max_end[position]
+        self._refresh_max_end(position)
+        return True
+
+    def overlaps(self, start_ts, end_ts):
+        """True if any interval intersects [start_ts, end_ts)."""
+        # Only intervals starting before end_ts can overlap
+        count = bisect_left(self.starts, end_ts)
+        return count > 0 and self.max_end[count - 1] > start_ts
+
+    def intervals(self):
+        """(reservation_id, start_ts, end_ts) tuples in start order."""
+        return list(zip(self.ids, self.starts, self.ends))
+
+
+class AvailabilityIndex:
+    """
+    In-process index of every reservation window.
+
+    Windows are kept twice: per room (RoomIntervals, for single-room checks
+    and gap scans) and in one global array sorted by start. Since no booking
+    is longer than the longest one seen, the rooms busy in a window are found
+    by bisecting the global array to the starts that could reach it, so a
+    query over thousands of rooms only touches the bookings near the window.
+
+    Built once from the reservations table and kept current write-through:
+    the backend calls reservation_added / reservation_removed after each
+    committed write. The index only sees writes made through this process,
+    so it is meant for a single writer process (one API worker, or the
+    writes funnelled through one process).
+    """
+
+    def __init__(self):
+        self._rooms = {}
+        self._starts = []
+        self._entries = []     # (end_ts, room_id, reservation_id), parallel to _starts
+        self._max_duration = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, conn):
+        """Build the index from the reservations table."""
+        index = cls()
+        rows = conn.execute(
+            "SELECT id, room_id, start_ts, end_ts FROM reservations "
+            "WHERE start_ts IS NOT NULL ORDER BY room_id, start_ts, id"
+        )
+        spans = []
+        for reservation_id, room_id, start_ts, end_ts in rows:
+            intervals = index._rooms.get(room_id)
+            if intervals is None:
+                intervals = index._rooms[room_id] = RoomIntervals()
+            intervals.append(reservation_id, start_ts, end_ts)
+            spans.append((start_ts, end_ts, room_id, reservation_id))
+
+        spans.sort()
+        index._starts = [span[0] for span in spans]
+        index._entries = [span[1:] for span in spans]
+        index._max_duration = max((end_ts - start_ts for start_ts, end_ts, _, _ in spans), default=0)
+        return index
+
+    def __len__(self):
+        return len(self._starts)
+
+    def is_free(self, room_id, start_ts, end_ts):
+        """True if the room has no reservation overlapping [start_ts, end_ts)."""
+        with self._lock:
+            intervals = self._rooms.get(room_id)
+            return intervals is None or not intervals.overlaps(start_ts, end_ts)
+
+    def busy_rooms(self, start_ts, end_ts):
+        """The set of room ids with a reservation overlapping [start_ts, end_ts)."""
+        with self._lock:
+            low = bisect_right(self._starts, start_ts - self._max_duration)
+            high = bisect_left(self._starts, end_ts)
+            return {room_id for end, room_id, _ in self._entries[low:high] if end > start_ts}
+
+    def free_rooms(self, room_ids, start_ts, end_ts):
+        """Filter room_ids down to those free for the whole window, keeping order."""
+        busy = self.busy_rooms(start_ts, end_ts)
+        return [room_id for room_id in room_ids if room_id not in busy]
+
+    def room_intervals(self, room_id):
+        """The (reservation_id, start_ts, end_ts) tuples booked for one room."""
+        with self._lock:
+            intervals = self._rooms.get(room_id)
+            return intervals.intervals() if intervals else []
+
+    # Write-through listener interface
+
+    def reservation_added(self, reservation):
+        room_id, start_ts, end_ts = reservation["room_id"], reservation["start_ts"], reservation["end_ts"]
+        with self._lock:
+            intervals = self._rooms.get(room_id)
+            if intervals is None:
+                intervals = self._rooms[room_id] = RoomIntervals()
+            intervals.add(reservation["id"], start_ts, end_ts)
+
+            position = bisect_right(self._starts, start_ts)
+            self._starts.insert(position, start_ts)
+            self._entries.insert(position, (end_ts, room_id, reservation["id"]))
+            self._max_duration = max(self._max_duration, end_ts - start_ts)
+
+    def reservation_removed(self, reservation):
+        with self._lock:
+            intervals = self._rooms.get(reservation["room_id"])
+            if intervals is None or not intervals.remove(reservation["id"]):
+                return
+
+            # _max_duration is left as is: an upper bound only widens the scan
+            start_ts = reservation["start_ts"]
+            low = bisect_left(self._starts, start_ts)
+            high = bisect_right(self._starts, start_ts)
+            for position in range(low, high):
+                if self._entries[position][2] == reservation["id"]:
+                    del self._starts[position], self._entries[position]
+                    break
+
+    def reservations_archived(self, before_ts):
+        """Drop every window ending at or before before_ts."""
+        with self._lock:
+            for room_id, intervals in list(self._rooms.items()):
+                kept = RoomIntervals()
+                for reservation_id, start_ts, end_ts in intervals.intervals():
+                    if end_ts > before_ts:
+                        kept.append(reservation_id, start_ts, end_ts)
+                if kept:
+                    self._rooms[room_id] = kept
+                else:
+                    del self._rooms[room_id]
+
+            kept = [(start_ts, entry) for start_ts, entry in zip(self._starts, self._entries) if entry[0] > before_ts]
+            self._starts = [start_ts for start_ts, _ in kept]
+            self._entries = [entry for _, entry in kept]
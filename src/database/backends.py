@@ -0,0 +1,836 @@
+# src/database/backends.py
+import os
+import sys
+import json
+import threading
+from datetime import date as date_type
+from urllib.parse import urlparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.connection import ConnectionPool, transaction
+from database.migrations import migrate, explain_query_plan, FEATURE_MASK_BITS
+from database.time_utils import normalize_window, format_minutes, day_bounds, EPOCH_ORDINAL
+from database.room_catalog import RoomCatalog
+from database.availability_index import AvailabilityIndex
+from database.availability_cache import AvailabilityCache
+from database.slot_bitmap import SlotBitmapEngine, np
+from database.write_queue import WriteQueue
+from database.reservations import (
+    parse_flag, window_from_parameters, reservation_from_parameters, insert_reservation, reservation_result
+)
+from database.pagination import page_from_parameters, page_sql, paginate, DEFAULT_PAGE
+from database import (
+    alternatives, archive, bulk_import, modifications, occupancy, recurrence, room_assignment, room_optimizer,
+    slot_finder
+)
+
+# Ways check_availability can answer the time-window part of a query
+AVAILABILITY_ENGINES = ("sql", "index", "bitmap")
+
+
+# Rooms meeting the capacity requirement
+ROOMS_SQL = """
+SELECT {columns}
+FROM rooms r
+WHERE r.capacity >= ?
+"""
+
+# Excludes rooms with a reservation overlapping the window
+AVAILABILITY_FILTER = """AND r.id NOT IN (
+    SELECT room_id
+    FROM reservations
+    WHERE end_ts > ? AND start_ts < ?
+)
+"""
+
+ROOM_COLUMNS = "r.id, r.capacity, r.features"
+
+# Rooms meeting the capacity requirement that have no overlapping reservation
+AVAILABILITY_SQL = ROOMS_SQL.format(columns=ROOM_COLUMNS) + AVAILABILITY_FILTER
+
+# Any reservation overlapping the requested window for one room
+CONFLICT_SQL = """
+SELECT id FROM reservations
+WHERE room_id = ? AND end_ts > ? AND start_ts < ?
+"""
+
+
+class StorageBackend:
+    """
+    Interface implemented by every storage engine behind the reservation tools.
+
+    All methods take and return the plain dicts used by the tool functions in
+    database_operations.py, so the agent and the API see the same shapes
+    whichever backend is configured.
+    """
+
+    def check_availability(self, query_parameters):
+        """Return the rooms matching the query that are free in the window."""
+        raise NotImplementedError
+
+    def iter_available_rooms(self, query_parameters, page_size=None):
+        """Yield the rooms check_availability would return, without building the full list."""
+        raise NotImplementedError
+
+    def check_availability_batch(self, queries):
+        """Answer several availability queries from one snapshot, keyed by query index."""
+        raise NotImplementedError
+
+    def availability_matrix(self, query_parameters):
+        """Return the rooms free for each of several windows."""
+        raise NotImplementedError
+
+    def find_next_available(self, query_parameters):
+        """Return the earliest free windows of a given length for the matching rooms."""
+        raise NotImplementedError
+
+    def check_availability_with_alternatives(self, query_parameters):
+        """Return the matching free rooms, or ranked near-misses when there are none."""
+        raise NotImplementedError
+
+    def reserve_room(self, reservation_data):
+        """Book a room and return a status dict."""
+        raise NotImplementedError
+
+    def reserve_group(self, group_data):
+        """Book a set of rooms seating a whole group, all or none, and return a status dict."""
+        raise NotImplementedError
+
+    def reserve_recurring(self, reservation_data):
+        """Book one room on every occurrence of a recurrence rule in one transaction and return a status dict."""
+        raise NotImplementedError
+
+    def optimize_room_assignment(self, options=None):
+        """Move flexible reservations between equivalent rooms to reduce idle gaps; returns a report."""
+        raise NotImplementedError
+
+    def write_queue_stats(self):
+        """Counters of the group-commit write queue, if the backend has one."""
+        return {"enabled": False}
+
+    def import_reservations(self, rows, chunk_size=None):
+        """Load many reservations, skipping and reporting the rows that cannot be booked."""
+        raise NotImplementedError
+
+    def cancel_reservation(self, cancellation):
+        """Delete a reservation and return a status dict."""
+        raise NotImplementedError
+
+    def modify_reservation(self, modification):
+        """Change a reservation's room, guest or window atomically and return a status dict."""
+        raise NotImplementedError
+
+    def list_rooms(self):
+        """Return the full room catalog."""
+        raise NotImplementedError
+
+    def list_reservations(self, filters=None):
+        """Return reservations, optionally filtered by room_id and/or date."""
+        raise NotImplementedError
+
+    def archive_reservations(self, before=None, batch_size=None):
+        """Move reservations that ended before a cutoff out of the hot table."""
+        raise NotImplementedError
+
+    def occupancy_report(self, query_parameters):
+        """Return booked and available minutes per day, room or feature from the occupancy summary."""
+        raise NotImplementedError
+
+    def rebuild_occupancy(self, first_date=None, last_date=None):
+        """Recompute the occupancy summary from the reservations."""
+        raise NotImplementedError
+
+    def check_occupancy(self, first_date=None, last_date=None):
+        """Compare the occupancy summary with the reservations."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class ReservationListener:
+    """
+    Receives every committed reservation write from a backend.
+
+    Derived structures (in-memory indexes, caches, aggregates) implement this
+    and register with backend.add_listener() to stay current incrementally.
+    Each reservation is a dict with at least id, room_id, date, start_ts and end_ts.
+    """
+
+    def reservation_added(self, reservation):
+        pass
+
+    def reservation_removed(self, reservation):
+        pass
+
+    def reservations_archived(self, before_ts):
+        """Every reservation ending at or before before_ts left the hot table (optional)."""
+        pass
+
+
+class SQLiteBackend(StorageBackend):
+    """StorageBackend running on SQLite through a pooled set of connections."""
+
+    def __init__(self, database, uri=False, pool_size=None, engine=None, cache=None, write_queue=None):
+        self.database = database
+        self.pool = ConnectionPool(database, max_size=pool_size, uri=uri)
+        self.engine = engine or settings.AVAILABILITY_ENGINE
+        if self.engine not in AVAILABILITY_ENGINES:
+            raise ValueError(f"Unknown availability engine '{self.engine}', expected one of {AVAILABILITY_ENGINES}")
+        self.listeners = []
+        self._feature_ids = {}
+        self._catalog = None
+        self._availability_index = None
+        self._slot_bitmap = None
+        self._lock = threading.Lock()
+
+        if cache is None:
+            cache = settings.AVAILABILITY_CACHE_ENABLED
+        self.availability_cache = None
+        if cache:
+            self.availability_cache = AvailabilityCache(settings.AVAILABILITY_CACHE_SIZE, settings.AVAILABILITY_CACHE_TTL)
+
+        if write_queue is None:
+            write_queue = settings.WRITE_QUEUE_ENABLED
+        self.write_queue = None
+        if write_queue:
+            self.write_queue = WriteQueue(
+                self._reserve_batch, settings.WRITE_QUEUE_MAX_BATCH, settings.WRITE_QUEUE_MAX_WAIT_MS
+            )
+
+    def connection(self):
+        """Check out a pooled connection for the current thread or task."""
+        return self.pool.connection()
+
+    def add_listener(self, listener):
+        """Register a ReservationListener for committed writes."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop sending writes to a listener."""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify_added(self, reservation):
+        """Pass a committed booking to the listeners, then the cache."""
+        for listener in self.listeners:
+            listener.reservation_added(reservation)
+        # The cache goes last, so no result can be cached from a structure not yet updated
+        if self.availability_cache is not None:
+            self.availability_cache.reservation_added(reservation)
+
+    def notify_removed(self, reservation):
+        """Pass a committed cancellation to the listeners, then the cache."""
+        for listener in self.listeners:
+            listener.reservation_removed(reservation)
+        if self.availability_cache is not None:
+            self.availability_cache.reservation_removed(reservation)
+
+    def notify_archived(self, before_ts):
+        """Tell the listeners and the cache that bookings ending by before_ts were archived."""
+        # Archiving is not a cancellation, so listeners that keep history (aggregates) may ignore it
+        for listener in self.listeners:
+            archived = getattr(listener, "reservations_archived", None)
+            if archived is not None:
+                archived(before_ts)
+        if self.availability_cache is not None:
+            self.availability_cache.reservations_archived(before_ts)
+
+    def room_catalog(self):
+        """The decoded room catalog, loaded on first use."""
+        if self._catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    with self.connection() as conn:
+                        self._catalog = RoomCatalog.load(conn)
+        return self._catalog
+
+    def invalidate_room_catalog(self):
+        """Drop the cached catalog, and structures shaped by it, after rooms change."""
+        with self._lock:
+            self._catalog = None
+            if self.availability_cache is not None:
+                self.availability_cache.clear()
+            if self._slot_bitmap is not None:
+                self.remove_listener(self._slot_bitmap)
+                self._slot_bitmap = None
+
+    def availability_index(self):
+        """The in-memory availability index, built from the reservations table on first use."""
+        if self._availability_index is None:
+            with self._lock:
+                if self._availability_index is None:
+                    with self.connection() as conn:
+                        index = AvailabilityIndex.load(conn)
+                    self.add_listener(index)
+                    self._availability_index = index
+        return self._availability_index
+
+    def slot_bitmap(self):
+        """
+        The NumPy slot occupancy engine, built on first use.
+
+        Only days from SLOT_BITMAP_HISTORY_DAYS before today are loaded
+        (a negative value loads the full history).
+        """
+        if self._slot_bitmap is None:
+            catalog = self.room_catalog()
+            with self._lock:
+                if self._slot_bitmap is None:
+                    horizon_day = None
+                    if settings.SLOT_BITMAP_HISTORY_DAYS >= 0:
+                        today = date_type.today().toordinal() - EPOCH_ORDINAL
+                        horizon_day = today - settings.SLOT_BITMAP_HISTORY_DAYS
+                    with self.connection() as conn:
+                        engine = SlotBitmapEngine.load(conn, catalog, settings.SLOT_MINUTES, horizon_day)
+                    self.add_listener(engine)
+                    self._slot_bitmap = engine
+        return self._slot_bitmap
+
+    def warm_up(self):
+        """Load the in-memory structures used by the configured engine."""
+        if self.engine == "index":
+            self.room_catalog()
+            self.availability_index()
+        elif self.engine == "bitmap":
+            self.slot_bitmap()
+
+    def migrate(self):
+        """Bring the schema up to the latest migration."""
+        with self.connection() as conn:
+            return migrate(conn)
+
+    def explain_hot_queries(self):
+        """
+        Report whether the availability and conflict queries are served by indexes.
+
+        Returns:
+        dict: Query name -> {"plan": EXPLAIN QUERY PLAN lines, "uses_index": bool}
+        """
+        sample_window = normalize_window("2025-05-12", "12:00", "14:00")
+        hot_queries = {
+            "check_availability": (AVAILABILITY_SQL, (1,) + sample_window),
+            "reserve_room_conflict": (CONFLICT_SQL, (1,) + sample_window),
+        }
+
+        report = {}
+        with self.connection() as conn:
+            for name, (query, params) in hot_queries.items():
+                plan = explain_query_plan(conn, query, params)
+                report[name] = {
+                    "plan": plan,
+                    "uses_index": (
+                        any("idx_reservations" in line for line in plan)
+                        and not any(line.startswith("SCAN reservations") for line in plan)
+                    )
+                }
+        return report
+
+    def _lookup_feature_ids(self, conn, names):
+        """Map feature names to ids, reloading the cached table on a miss."""
+        if any(name not in self._feature_ids for name in names):
+            self._feature_ids = dict(
+                (name, feature_id) for feature_id, name in conn.execute("SELECT id, name FROM features")
+            )
+        return {name: self._feature_ids.get(name) for name in names}
+
+    def _feature_filter(self, conn, required_features):
+        """
+        Build the SQL condition requiring every listed feature.
+
+        Features with an id inside the bitmask are tested with a single AND on
+        rooms.feature_mask; any beyond it fall back to the room_features table.
+
+        Returns:
+        tuple: (sql, params), or None if a feature does not exist in the hotel
+        """
+        feature_ids = self._lookup_feature_ids(conn, set(required_features))
+        if None in feature_ids.values():
+            return None
+
+        mask = 0
+        conditions = []
+        params = []
+        for feature_id in sorted(feature_ids.values()):
+            if feature_id <= FEATURE_MASK_BITS:
+                mask |= 1 << (feature_id - 1)
+            else:
+                conditions.append(
+                    "EXISTS (SELECT 1 FROM room_features rf WHERE rf.room_id = r.id AND rf.feature_id = ?)"
+                )
+                params.append(feature_id)
+        if mask:
+            conditions.insert(0, "(r.feature_mask & ?) = ?")
+            params[:0] = [mask, mask]
+        return "".join(f"\n        AND {condition}" for condition in conditions), params
+
+    def _availability_sql(self, conn, min_capacity, required_features, window, columns=ROOM_COLUMNS,
+                          page=DEFAULT_PAGE):
+        """
+        Build the SQL availability query, ordered and limited by page (sort, after_room_id, limit).
+
+        Returns:
+        tuple: (query, params), or None if no room can match
+        """
+        query = ROOMS_SQL.format(columns=columns)
+        params = [min_capacity]
+
+        # If time constraints specified, filter out rooms with reservations that conflict
+        if window:
+            query += AVAILABILITY_FILTER
+            params += list(window)
+
+        # Required features are matched in SQL against the bitmask
+        if required_features:
+            feature_filter = self._feature_filter(conn, required_features)
+            if feature_filter is None:
+                return None
+            query += feature_filter[0]
+            params += feature_filter[1]
+
+        page_query, page_params = page_sql(page)
+        return query + page_query, params + page_params
+
+    def _parse_availability_query(self, query_parameters):
+        """Extract (min_capacity, required_features, window) from query parameters."""
+        min_capacity = query_parameters.get('capacity', 1)
+        required_features = query_parameters.get('features', [])
+        return min_capacity, required_features, window_from_parameters(query_parameters)
+
+    def _available_room_ids_in_memory(self, min_capacity, required_features, window):
+        """Room ids from the in-memory engine, or None when the SQL path must answer."""
+        if window is None or self.engine == "sql":
+            return None
+        if self.engine == "index":
+            candidates = self.room_catalog().matching(min_capacity, required_features)
+            return self.availability_index().free_rooms([room.id for room in candidates], *window)
+        if self.engine == "bitmap" and self.slot_bitmap().covers(window[0]):
+            return self.slot_bitmap().free_room_ids(*window, min_capacity, required_features)
+        return None
+
+    def check_availability(self, query_parameters):
+        min_capacity, required_features, window = self._parse_availability_query(query_parameters)
+        page = page_from_parameters(query_parameters)
+
+        # Pages are cut in SQL, so only whole results go through the cache
+        cache = self.availability_cache
+        if cache is None or page != DEFAULT_PAGE:
+            return self.available_rooms(min_capacity, required_features, window, page)
+
+        key = cache.key(min_capacity, required_features, window)
+        rooms = cache.get(key)
+        if rooms is None:
+            generation = cache.generation
+            rooms = self.available_rooms(min_capacity, required_features, window)
+            cache.put(key, rooms, generation)
+        # Callers get their own copies so cached entries cannot be mutated
+        return [{**room, "features": list(room["features"])} for room in rooms]
+
+    def iter_available_rooms(self, query_parameters, page_size=None):
+        """Yield the available rooms one at a time, fetched in keyset pages."""
+        for rooms in self.iter_available_room_pages(query_parameters, page_size):
+            yield from rooms
+
+    def iter_available_room_pages(self, query_parameters, page_size=None):
+        """
+        Yield the available rooms as lists of up to page_size rooms.
+
+        Each page is a short query resuming after the last room of the
+        previous one, so no connection is held between pages and memory stays
+        bounded by page_size. The query's own limit caps the total.
+        """
+        page_size = page_size or settings.AVAILABILITY_STREAM_PAGE_SIZE
+        sort, after_room_id, limit = page_from_parameters(query_parameters)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            rooms = self.check_availability({
+                **query_parameters, 'sort': sort, 'after_room_id': after_room_id, 'limit': size
+            })
+            if rooms:
+                yield rooms
+            if len(rooms) < size:
+                return
+            after_room_id = rooms[-1]["id"]
+            if remaining is not None:
+                remaining -= len(rooms)
+
+    def availability_cache_stats(self):
+        """Hit/miss/eviction counters of the availability cache."""
+        if self.availability_cache is None:
+            return {"enabled": False}
+        return self.availability_cache.stats()
+
+    def available_rooms(self, min_capacity, required_features, window, page=DEFAULT_PAGE):
+        """Rooms free in the window as dicts, skipping the cache; page is (sort, after_room_id, limit)."""
+        room_ids = self._available_room_ids_in_memory(min_capacity, required_features, window)
+        if room_ids is not None:
+            catalog = self.room_catalog()
+            rooms = [RoomCatalog.as_dict(catalog.get(room_id)) for room_id in room_ids]
+            return rooms if page == DEFAULT_PAGE else paginate(rooms, page, catalog)
+
+        with self.connection() as conn:
+            availability_sql = self._availability_sql(conn, min_capacity, required_features, window, page=page)
+            if availability_sql is None:
+                return []
+            rows = conn.execute(*availability_sql).fetchall()
+
+        return [
+            {"id": room_id, "capacity": capacity, "features": json.loads(features_json)}
+            for room_id, capacity, features_json in rows
+        ]
+
+    def check_availability_batch(self, queries):
+        """
+        Answer several availability queries against one consistent snapshot.
+
+        All queries share one connection and one read transaction, and the
+        room catalog is decoded once for the whole batch. A query that fails
+        validation gets an inline error instead of failing the batch.
+
+        Returns:
+        dict: Query index -> {"status": "success", "rooms": [...]} or
+              {"status": "error", "message": ...}
+        """
+        results = {}
+        with self.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                catalog = RoomCatalog.load(conn) if self.engine == "sql" else self.room_catalog()
+                for position, query_parameters in enumerate(queries):
+                    try:
+                        min_capacity, required_features, window = self._parse_availability_query(query_parameters)
+                        page = page_from_parameters(query_parameters)
+                        room_ids = self._available_room_ids_in_memory(min_capacity, required_features, window)
+                        paged = room_ids is None
+                        if room_ids is None:
+                            availability_sql = self._availability_sql(
+                                conn, min_capacity, required_features, window, columns="r.id", page=page
+                            )
+                            room_ids = [] if availability_sql is None else [
+                                row[0] for row in conn.execute(*availability_sql)
+                            ]
+                    except ValueError as e:
+                        results[position] = {"status": "error", "message": str(e)}
+                        continue
+                    rooms = [RoomCatalog.as_dict(catalog.get(room_id)) for room_id in room_ids]
+                    results[position] = {
+                        "status": "success",
+                        "rooms": rooms if paged or page == DEFAULT_PAGE else paginate(rooms, page, catalog)
+                    }
+            finally:
+                conn.rollback()
+        return results
+
+    def availability_matrix(self, query_parameters):
+        """
+        Rooms free for each of several windows, for calendar views and bulk searches.
+
+        Computed with the slot bitmap engine in one vectorized pass when numpy
+        is installed and the windows are inside its horizon, otherwise with
+        one check_availability per window.
+        """
+        min_capacity = query_parameters.get('capacity', 1)
+        required_features = query_parameters.get('features', [])
+        windows = query_parameters.get('windows', [])
+        spans = [window_from_parameters(window) for window in windows]
+        if None in spans:
+            raise ValueError("Every window needs date/start_time/end_time or check_in/check_out")
+
+        if np is not None and spans and all(self.slot_bitmap().covers(start_ts) for start_ts, _ in spans):
+            engine = self.slot_bitmap()
+            free = engine.free_matrix(spans, min_capacity, required_features)
+            room_ids_per_window = [engine.room_ids[free[:, column]].tolist() for column in range(len(spans))]
+        else:
+            room_ids_per_window = [
+                [room['id'] for room in self.check_availability({
+                    **window, 'capacity': min_capacity, 'features': required_features
+                })]
+                for window in windows
+            ]
+
+        return [
+            {**window, "available_room_ids": room_ids}
+            for window, room_ids in zip(windows, room_ids_per_window)
+        ]
+
+    def busy_intervals(self, room_ids, search_start, search_end):
+        """Sorted (start_ts, end_ts) bookings per room that overlap the search span."""
+        if self.engine == "index":
+            index = self.availability_index()
+            return {
+                room_id: [(start_ts, end_ts) for _, start_ts, end_ts in index.room_intervals(room_id)
+                          if end_ts > search_start and start_ts < search_end]
+                for room_id in room_ids
+            }
+
+        busy = {}
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT room_id, start_ts, end_ts FROM reservations "
+                "WHERE end_ts > ? AND start_ts < ? ORDER BY room_id, start_ts",
+                (search_start, search_end)
+            )
+            for room_id, start_ts, end_ts in rows:
+                busy.setdefault(room_id, []).append((start_ts, end_ts))
+        return busy
+
+    def find_next_available(self, query_parameters):
+        return slot_finder.find_next_available(self, query_parameters)
+
+    def check_availability_with_alternatives(self, query_parameters):
+        return alternatives.check_availability_with_alternatives(self, query_parameters)
+
+    def catalog_room(self, room_id):
+        """Look a room up in the cached catalog, reloading it once for rooms added since."""
+        room = self.room_catalog().get(room_id)
+        if room is None:
+            self.invalidate_room_catalog()
+            room = self.room_catalog().get(room_id)
+        return room
+
+    def reserve_room(self, reservation_data):
+        try:
+            flexible = parse_flag(reservation_data.get('flexible'), 'flexible')
+        except ValueError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        if flexible:
+            return room_optimizer.reserve_flexible(self, reservation_data)
+        if self.write_queue is not None:
+            return self.write_queue.submit(reservation_data).result()
+        return self._reserve_batch([reservation_data])[0]
+
+    def _reserve_batch(self, batch):
+        """
+        Book several reservations in one write transaction.
+
+        Each request is checked on its own, against the table and the
+        requests before it in the batch, so one conflict only fails that
+        request. This is reserve_room for a batch of one and the commit
+        function of the write queue.
+
+        Returns:
+        list: One reserve_room result dict per request, in order
+        """
+        results = [None] * len(batch)
+        pending = []
+        for position, reservation_data in enumerate(batch):
+            try:
+                reservation = reservation_from_parameters(reservation_data)
+            except ValueError as e:
+                results[position] = {
+                    "status": "error",
+                    "message": str(e)
+                }
+                continue
+            room = self.catalog_room(reservation["room_id"])
+            if room is None:
+                results[position] = {
+                    "status": "error",
+                    "message": f"Room {reservation['room_id']} does not exist"
+                }
+                continue
+            pending.append((position, reservation, room))
+
+        booked = []
+        try:
+            # Check and insert are one statement under the write lock, so two
+            # concurrent bookings of the same room can never both succeed
+            if pending:
+                with self.connection() as conn, transaction(conn):
+                    for position, reservation, room in pending:
+                        reservation_id = insert_reservation(conn, reservation)
+                        if reservation_id is None:
+                            results[position] = {
+                                "status": "error",
+                                "message": f"Room {reservation['room_id']} is not available during the requested time"
+                            }
+                        else:
+                            booked.append((position, {**reservation, "id": reservation_id}, room))
+        except Exception as e:
+            for position, _, _ in pending:
+                results[position] = {
+                    "status": "error",
+                    "message": f"Error making reservation: {str(e)}"
+                }
+            return results
+
+        for position, reservation, room in booked:
+            self.notify_added(reservation)
+            results[position] = reservation_result(reservation, room)
+        return results
+
+    def reserve_group(self, group_data):
+        return room_assignment.reserve_group(self, group_data)
+
+    def reserve_recurring(self, reservation_data):
+        return recurrence.reserve_recurring(self, reservation_data)
+
+    def optimize_room_assignment(self, options=None):
+        return room_optimizer.optimize_room_assignment(self, options)
+
+    def write_queue_stats(self):
+        """Counters of the group-commit write queue, or {"enabled": False}."""
+        if self.write_queue is None:
+            return {"enabled": False}
+        return self.write_queue.stats()
+
+    def cancel_reservation(self, cancellation):
+        return modifications.cancel_reservation(self, cancellation)
+
+    def modify_reservation(self, modification):
+        return modifications.modify_reservation(self, modification)
+
+    def import_reservations(self, rows, chunk_size=None):
+        return bulk_import.import_reservations(self, rows, chunk_size)
+
+    def list_rooms(self):
+        with self.connection() as conn:
+            rows = conn.execute("SELECT id, capacity, features FROM rooms ORDER BY id").fetchall()
+        return [
+            {"id": room_id, "capacity": capacity, "features": json.loads(features_json)}
+            for room_id, capacity, features_json in rows
+        ]
+
+    def list_reservations(self, filters=None):
+        filters = filters or {}
+        # Archived history is only read when asked for, through the union view
+        include_archived = bool(filters.get('include_archived'))
+        query = f"""
+        SELECT id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts,
+            {"archived" if include_archived else "0"}
+        FROM {"all_reservations" if include_archived else "reservations"}
+        WHERE 1 = 1
+        """
+        params = []
+        if filters.get('room_id') is not None:
+            query += " AND room_id = ?"
+            params.append(filters['room_id'])
+        if filters.get('date'):
+            # Everything overlapping the day, including stays that started earlier
+            query += " AND end_ts > ? AND start_ts < ?"
+            params.extend(day_bounds(filters['date']))
+        query += " ORDER BY start_ts, room_id"
+
+        with self.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {
+                "id": reservation_id,
+                "room_id": room_id,
+                "guest_name": guest_name,
+                "date": date,
+                "start_time": start_time,
+                "end_time": end_time,
+                "check_in": format_minutes(start_ts),
+                "check_out": format_minutes(end_ts),
+                **({"archived": bool(archived)} if include_archived else {})
+            }
+            for reservation_id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts, archived in rows
+        ]
+
+    def archive_reservations(self, before=None, batch_size=None):
+        return archive.archive_reservations(self, before, batch_size)
+
+    def occupancy_report(self, query_parameters):
+        return occupancy.occupancy_report(self, query_parameters)
+
+    def rebuild_occupancy(self, first_date=None, last_date=None):
+        return occupancy.rebuild_occupancy(self, first_date, last_date)
+
+    def check_occupancy(self, first_date=None, last_date=None):
+        return occupancy.check_occupancy(self, first_date, last_date)
+
+    def close(self):
+        if self.write_queue is not None:
+            self.write_queue.close()
+        self.pool.close_all()
+
+
+class FileSQLiteBackend(SQLiteBackend):
+    """SQLite database stored in a file on disk."""
+
+    def __init__(self, path, pool_size=None, auto_migrate=None, engine=None, cache=None, write_queue=None):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(path, pool_size=pool_size, engine=engine, cache=cache, write_queue=write_queue)
+        if settings.DB_AUTO_MIGRATE if auto_migrate is None else auto_migrate:
+            self.migrate()
+
+
+class MemorySQLiteBackend(SQLiteBackend):
+    """
+    Shared-cache in-memory SQLite database.
+
+    Every pooled connection attaches to the same named in-memory database.
+    An anchor connection keeps it alive for as long as the backend exists,
+    and all migrations are applied on construction since the database starts empty.
+    """
+
+    _counter = 0
+
+    def __init__(self, name=None, pool_size=None, engine=None, cache=None, write_queue=None):
+        if name is None:
+            MemorySQLiteBackend._counter += 1
+            name = f"hotel_memdb_{os.getpid()}_{MemorySQLiteBackend._counter}"
+        super().__init__(f"file:{name}?mode=memory&cache=shared", uri=True, pool_size=pool_size, engine=engine,
+                         cache=cache, write_queue=write_queue)
+        self._anchor = self.pool._open()
+        migrate(self._anchor)
+
+    def close(self):
+        super().close()
+        self._anchor.close()
+
+
+def create_backend(database_url):
+    """
+    Build a storage backend from a database URL.
+
+    Supported forms:
+        sqlite:///hotel.db          file relative to the working directory
+        sqlite:////var/db/hotel.db  absolute file path
+        sqlite:///:memory:          shared-cache in-memory database (also sqlite://)
+    """
+    parsed = urlparse(database_url)
+    if parsed.scheme != "sqlite":
+        raise ValueError(f"Unsupported DATABASE_URL scheme: {parsed.scheme or database_url}")
+
+    path = database_url[len("sqlite://"):]
+    if path.startswith("/"):
+        path = path[1:]
+    if path in ("", ":memory:"):
+        return MemorySQLiteBackend()
+    return FileSQLiteBackend(path)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the process-wide backend selected by settings.DATABASE_URL."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(settings.DATABASE_URL)
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the process-wide backend (used by tests and benchmarks)."""
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+    return previous
+
+
+def get_connection():
+    """Check out a pooled connection from the configured backend."""
+    return get_backend().connection()
@@ -0,0 +1,220 @@
+# src/database/bulk_import.py
+import io
+import os
+import sys
+import csv
+import json
+import sqlite3
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.availability_index import RoomIntervals
+from database.connection import transaction
+from database.reservations import reservation_from_parameters, insert_reservations
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Staging table for bulk imports, private to the importing connection
+IMPORT_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS import_batch (
+    row_number INTEGER PRIMARY KEY,
+    room_id INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL
+)
+"""
+
+# Staged rows overlapping an existing reservation, found in one join
+IMPORT_CONFLICT_SQL = """
+SELECT DISTINCT b.row_number FROM temp.import_batch b
+JOIN reservations r ON r.room_id = b.room_id AND r.end_ts > b.start_ts AND r.start_ts < b.end_ts
+"""
+
+
+def detect_format(filename):
+    """Pick the import format from a file name's extension."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of '{filename}', expected one of {IMPORT_FORMATS}")
+
+
+def check_encoding(binary, encoding="utf-8"):
+    """
+    Make sure a seekable binary stream decodes as text, then rewind it.
+
+    Checked before importing, so a file with a bad line is refused as a
+    whole instead of failing after its first chunks are committed.
+
+    Raises:
+    ValueError: If a line does not decode, naming the line
+    """
+    for line_number, line in enumerate(binary, start=1):
+        try:
+            line.decode(encoding)
+        except UnicodeDecodeError:
+            raise ValueError(f"Line {line_number} is not valid {encoding.upper()} text")
+    binary.seek(0)
+
+
+def read_reservation_rows(stream, file_format):
+    """
+    Lazily read reservation records from a text stream.
+
+    CSV files need a header row naming the reserve_room fields (room_id,
+    guest_name and either date/start_time/end_time or check_in/check_out);
+    empty cells are treated as missing. JSONL files hold one JSON object per
+    line. A line that is not valid JSON is yielded as its raw text so the
+    importer can report it instead of aborting the load.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if key and value not in (None, "")}
+    elif file_format == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield line
+    else:
+        raise ValueError(f"Unknown import format '{file_format}', expected one of {IMPORT_FORMATS}")
+
+
+def import_reservations(backend, rows, chunk_size=None):
+    """
+    Load reservations in chunks of chunk_size rows, one transaction per chunk.
+
+    Each chunk is checked set-wise: the rows are staged in a temp table and
+    joined against the reservations table once, then checked against each
+    other in input order, so the first of two overlapping rows wins.
+    Rejected rows are reported and the load carries on.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to load into
+    rows (iterable): Reservation dicts in the reserve_room format; rows are
+        numbered from 1 in the report
+    chunk_size (int): Rows per transaction (default BULK_IMPORT_CHUNK_SIZE)
+
+    Returns:
+    dict: status, imported count, rejected_count and the rejected rows with their reason
+    """
+    chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK_SIZE
+    imported = 0
+    rejected = []
+    chunk = []
+    for row_number, row in enumerate(rows, start=1):
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            imported += _import_chunk(backend, chunk, rejected)
+            chunk = []
+    if chunk:
+        imported += _import_chunk(backend, chunk, rejected)
+
+    return {
+        "status": "success",
+        "imported": imported,
+        "rejected_count": len(rejected),
+        "rejected": rejected
+    }
+
+
+def _import_chunk(backend, chunk, rejected):
+    """Validate, conflict-check and insert one chunk; returns the number of rows inserted."""
+    def reject(row_number, row, reason):
+        rejected.append({"row": row_number, "reason": reason, "data": row})
+
+    candidates = []
+    for row_number, row in chunk:
+        if not isinstance(row, dict):
+            reject(row_number, row, "Row is not a reservation record")
+            continue
+        try:
+            candidates.append((row_number, row, reservation_from_parameters(row)))
+        except ValueError as e:
+            reject(row_number, row, str(e))
+
+    catalog = backend.room_catalog()
+    if any(catalog.get(record["room_id"]) is None for _, _, record in candidates):
+        backend.invalidate_room_catalog()
+        catalog = backend.room_catalog()
+
+    # Rows refused under the lock are only reported once the chunk has committed
+    refused = []
+    try:
+        with backend.connection() as conn, transaction(conn):
+            conn.execute(IMPORT_STAGING_SQL)
+            conn.execute("DELETE FROM temp.import_batch")
+            conn.executemany(
+                "INSERT INTO temp.import_batch (row_number, room_id, start_ts, end_ts) VALUES (?, ?, ?, ?)",
+                [(row_number, record["room_id"], record["start_ts"], record["end_ts"])
+                 for row_number, _, record in candidates]
+            )
+            taken = {row_number for (row_number,) in conn.execute(IMPORT_CONFLICT_SQL)}
+
+            accepted = []
+            booked = {}
+            for row_number, row, record in candidates:
+                room_id = record["room_id"]
+                if catalog.get(room_id) is None:
+                    refused.append((row_number, row, f"Room {room_id} does not exist"))
+                    continue
+                if row_number in taken:
+                    refused.append((row_number, row, f"Room {room_id} is not available during the requested time"))
+                    continue
+                intervals = booked.setdefault(room_id, RoomIntervals())
+                if intervals.overlaps(record["start_ts"], record["end_ts"]):
+                    refused.append((row_number, row, f"Room {room_id} is booked by an earlier row of the import"))
+                    continue
+                intervals.add(row_number, record["start_ts"], record["end_ts"])
+                accepted.append(record)
+
+            new_ids = insert_reservations(conn, accepted)
+            conn.execute("DELETE FROM temp.import_batch")
+    except sqlite3.Error as e:
+        # The chunk rolled back as a whole; earlier chunks stay committed and the load carries on
+        for row_number, row, _ in candidates:
+            reject(row_number, row, f"Error importing reservation: {str(e)}")
+        return 0
+
+    for row_number, row, reason in refused:
+        reject(row_number, row, reason)
+    for reservation_id, record in zip(new_ids, accepted):
+        backend.notify_added({**record, "id": reservation_id})
+    return len(accepted)
+
+
+def import_file(path, file_format=None, chunk_size=None):
+    """Import a CSV or JSONL file into the configured database."""
+    from database.backends import get_backend
+
+    file_format = file_format or detect_format(path)
+    with open(path, "rb") as binary:
+        check_encoding(binary)
+        stream = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+        return get_backend().import_reservations(read_reservation_rows(stream, file_format), chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import reservations from CSV or JSONL")
+    parser.add_argument("path", help="file to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="file format (default: from the extension)")
+    parser.add_argument("--chunk-size", type=int, help="rows committed per transaction")
+    args = parser.parse_args()
+
+    try:
+        report = import_file(args.path, args.format, args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Imported {report['imported']} reservations, rejected {report['rejected_count']}")
+    for rejection in report["rejected"]:
+        print(f"    row {rejection['row']}: {rejection['reason']}")
+
+
+if __name__ == "__main__":
+    main()
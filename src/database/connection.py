@@ -0,0 +1,141 @@
+# src/database/connection.py
+import os
+import sys
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+
+# Connection currently checked out by this thread / asyncio task, per pool
+_active_connections = ContextVar("active_connections", default=None)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections.
+
+    Each thread (or asyncio task, since the checkout is tracked in a
+    ContextVar) gets one connection from the pool and reuses it for nested
+    calls, so a request never pays connection setup twice. Connections are
+    opened lazily, configured once with the performance pragmas and kept
+    open with their prepared statement cache for the lifetime of the pool.
+    """
+
+    def __init__(self, database, max_size=None, timeout=None, uri=False):
+        self.database = database
+        self.uri = uri
+        self.max_size = max_size or settings.DB_POOL_SIZE
+        self.timeout = timeout if timeout is not None else settings.DB_POOL_TIMEOUT
+        self._idle = queue.LifoQueue(maxsize=self.max_size)
+        self._opened = 0
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.database,
+            uri=self.uri,
+            timeout=settings.DB_BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=settings.DB_STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(settings.DB_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size={int(settings.DB_MMAP_SIZE)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _acquire(self):
+        """Take an idle connection, opening a new one while under the size limit."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.max_size:
+                self._opened += 1
+                try:
+                    conn = self._open()
+                except Exception:
+                    self._opened -= 1
+                    raise
+                self._all.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out waiting for a database connection (pool size {self.max_size})"
+            )
+
+    def _release(self, conn):
+        """Return a connection to the pool, discarding any unfinished transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the current thread or task.
+
+        Nested uses inside the same context receive the same connection and
+        only the outermost one returns it to the pool.
+        """
+        active = _active_connections.get()
+        if active is not None and id(self) in active:
+            yield active[id(self)]
+            return
+
+        conn = self._acquire()
+        token = _active_connections.set({**(active or {}), id(self): conn})
+        try:
+            yield conn
+        finally:
+            _active_connections.reset(token)
+            self._release(conn)
+
+    def close_all(self):
+        """Close every connection opened by this pool."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all = []
+            self._opened = 0
+            self._idle = queue.LifoQueue(maxsize=self.max_size)
+
+
+@contextmanager
+def transaction(conn, mode="IMMEDIATE"):
+    """
+    Run a block in an explicit transaction and commit it, or roll back on error.
+
+    The default IMMEDIATE mode takes the write lock up front, so checks made
+    inside the block cannot be invalidated by another writer before commit.
+
+    Transactions do not nest: the block must start on a connection with no
+    open transaction, so earlier uncommitted writes are never committed on
+    the caller's behalf.
+
+    Raises:
+    sqlite3.ProgrammingError: If the connection is already in a transaction
+    """
+    if conn.in_transaction:
+        raise sqlite3.ProgrammingError(
+            "transaction() started on a connection with an open transaction; commit or roll it back first"
+        )
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
@@ -1,8 +1,8 @@
-import sqlite3
-import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-conn = sqlite3.connect("hotel.db")
-cursor = conn.cursor()  
+from database.backends import get_backend
 
 
 def check_availability(query_parameters):
@@ -14,68 +14,32 @@ def check_availability(query_parameters):
         - date (str): Date in format 'YYYY-MM-DD'
         - start_time (str): Start time in format 'HH:MM'
         - end_time (str): End time in format 'HH:MM'
+        - check_in (str): Instead of date/start_time/end_time, for stays over several days:
+          check-in in format 'YYYY-MM-DD HH:MM' (a bare date uses the hotel check-in time)
+        - check_out (str): Check-out in format 'YYYY-MM-DD HH:MM' (a bare date uses the hotel check-out time)
         - capacity (int): Minimum capacity required
         - features (list): List of required features
+        - sort (str): Result order: 'id' (default), 'capacity' (smallest first) or '-capacity'
+        - limit (int): Return at most this many rooms
+        - after_room_id (int): Resume after this room, i.e. the last room of the previous page
     
     Returns:
     list: List of available room IDs matching the criteria
     """
-    conn = sqlite3.connect("hotel.db")
-    cursor = conn.cursor()
-    
-    # Extract parameters with defaults
-    date = query_parameters.get('date')
-    start_time = query_parameters.get('start_time')
-    end_time = query_parameters.get('end_time')
-    min_capacity = query_parameters.get('capacity', 1)
-    required_features = query_parameters.get('features', [])
-    
-    # Base query to get all rooms meeting capacity requirement
-    query = """
-    SELECT r.id, r.capacity, r.features 
-    FROM rooms r
-    WHERE r.capacity >= ?
-    """
-    params = [min_capacity]
-    
-    # If time constraints specified, filter out rooms with reservations that conflict
-    if date and start_time and end_time:
-        query = """
-        SELECT r.id, r.capacity, r.features 
-        FROM rooms r
-        WHERE r.capacity >= ?
-        AND r.id NOT IN (
-            SELECT room_id 
-            FROM reservations 
-            WHERE date = ?
-            AND NOT (end_time <= ? OR start_time >= ?)
-        )
-        """
-        params = [min_capacity, date, start_time, end_time]
-    
-    # Execute query
-    cursor.execute(query, params)
-    available_rooms = []
-    
-    # Process results
-    for room_id, capacity, features_json in cursor.fetchall():
-        features = json.loads(features_json)
-        
-        # Check if room has all required features
-        if required_features:
-            has_all_features = all(feature in features for feature in required_features)
-            if not has_all_features:
-                continue
-        
-        # Add room to available rooms
-        available_rooms.append({
-            "id": room_id,
-            "capacity": capacity,
-            "features": features
-        })
-    
-    conn.close()
-    return available_rooms
+    return get_backend().check_availability(query_parameters)
+
+
+def iter_available_rooms(query_parameters):
+    """
+    Yield the rooms check_availability would return, fetched page by page.
+    
+    Parameters:
+    query_parameters (dict): Search criteria in the format accepted by check_availability
+    
+    Returns:
+    generator: Available rooms, one dict at a time
+    """
+    return get_backend().iter_available_rooms(query_parameters)
 
 
 def reserve_room(reservation_data):
@@ -89,88 +53,304 @@ def reserve_room(reservation_data):
         - date (str): Date in format 'YYYY-MM-DD'
         - start_time (str): Start time in format 'HH:MM'
         - end_time (str): End time in format 'HH:MM'
+        - check_in (str): Instead of date/start_time/end_time, for stays over several days:
+          check-in in format 'YYYY-MM-DD HH:MM'
+        - check_out (str): Check-out in format 'YYYY-MM-DD HH:MM'
+        - flexible (bool): Optional; book whichever room equivalent to room_id
+          (same capacity, at least its features) fits the window best, and let
+          optimize_room_assignment move the booking later. room_id may then be
+          left out in favour of capacity (int) and features (list)
     
     Returns:
     dict: Result of the reservation with status and reservation ID if successful
     """
-    try:
-        conn = sqlite3.connect("hotel.db")
-        cursor = conn.cursor()
-        
-        # Extract parameters
-        room_id = reservation_data.get('room_id')
-        guest_name = reservation_data.get('guest_name')
-        date = reservation_data.get('date')
-        start_time = reservation_data.get('start_time')
-        end_time = reservation_data.get('end_time')
-        
-        # Validate required fields
-        if not all([room_id, guest_name, date, start_time, end_time]):
-            return {
-                "status": "error",
-                "message": "Missing required reservation information"
-            }
-        
-        # Check if the room exists
-        cursor.execute("SELECT id FROM rooms WHERE id = ?", (room_id,))
-        if not cursor.fetchone():
-            return {
-                "status": "error",
-                "message": f"Room {room_id} does not exist"
-            }
-        
-        # Check if the room is available during the requested time
-        cursor.execute("""
-            SELECT id FROM reservations 
-            WHERE room_id = ? AND date = ? 
-            AND NOT (end_time <= ? OR start_time >= ?)
-        """, (room_id, date, start_time, end_time))
-        
-        if cursor.fetchone():
-            return {
-                "status": "error",
-                "message": f"Room {room_id} is not available during the requested time"
-            }
-        
-        # Insert the reservation
-        cursor.execute("""
-            INSERT INTO reservations (room_id, guest_name, date, start_time, end_time)
-            VALUES (?, ?, ?, ?, ?)
-        """, (room_id, guest_name, date, start_time, end_time))
-        
-        # Get the reservation ID
-        reservation_id = cursor.lastrowid
-        
-        # Commit the changes
-        conn.commit()
-        
-        # Get room details to include in response
-        cursor.execute("SELECT capacity, features FROM rooms WHERE id = ?", (room_id,))
-        room_data = cursor.fetchone()
-        capacity = room_data[0]
-        features = json.loads(room_data[1])
-        
-        conn.close()
-        
-        return {
-            "status": "success",
-            "reservation_id": reservation_id,
-            "message": f"Room {room_id} reserved successfully for {guest_name} on {date} from {start_time} to {end_time}",
-            "details": {
-                "room_id": room_id,
-                "capacity": capacity,
-                "features": features,
-                "guest_name": guest_name,
-                "date": date,
-                "start_time": start_time,
-                "end_time": end_time
-            }
-        }
-        
-    except Exception as e:
-        if conn:
-            conn.close()
-        return {
-            "status": "error",
-            "message": f"Error making reservation: {str(e)}"
-        }
\ No newline at end of file
+    return get_backend().reserve_room(reservation_data)
+
+
+def reserve_group(group_data):
+    """
+    Reserve several rooms for a group in one window, all of them or none.
+    
+    Parameters:
+    group_data (dict): A dictionary containing:
+        - guest_name (str): Name the group's reservations are made under
+        - headcount (int): Number of guests to seat
+        - features (list): Features every room must offer (optional)
+        - date (str): Date in format 'YYYY-MM-DD'
+        - start_time (str): Start time in format 'HH:MM'
+        - end_time (str): End time in format 'HH:MM'
+        - check_in (str): Instead of date/start_time/end_time, for stays over several days:
+          check-in in format 'YYYY-MM-DD HH:MM'
+        - check_out (str): Check-out in format 'YYYY-MM-DD HH:MM'
+        - max_rooms (int): Use at most this many rooms (optional)
+    
+    Returns:
+    dict: Result with status, the rooms and reservation IDs, and the wasted capacity if successful
+    """
+    return get_backend().reserve_group(group_data)
+
+
+def reserve_recurring(reservation_data):
+    """
+    Reserve one room on every occurrence of a daily or weekly series.
+    
+    Parameters:
+    reservation_data (dict): The first occurrence in the reserve_room format
+        (room_id, guest_name, date/start_time/end_time or check_in/check_out), plus:
+        - frequency (str): 'daily' or 'weekly'
+        - interval (int): Repeat every this many days or weeks (optional, default 1)
+        - weekdays (list): Weekday names such as ['monday', 'friday'], or one
+          comma-separated string (optional;
+          a weekly series defaults to the first date's weekday)
+        - until (str): Last date of the series in format 'YYYY-MM-DD'
+        - count (int): Number of occurrences; until, count or both must be given
+        - skip_conflicts (bool): Book the free occurrences even if some are taken
+          (optional; by default one conflict books nothing)
+    
+    Returns:
+    dict: Result with status, the reservation IDs, and the occurrences that
+        conflict with existing bookings
+    """
+    return get_backend().reserve_recurring(reservation_data)
+
+
+def cancel_reservation(cancellation):
+    """
+    Cancel an existing reservation.
+    
+    Parameters:
+    cancellation (dict): A dictionary containing:
+        - reservation_id (int): The ID returned when the room was reserved
+        - guest_name (str): Optional; the cancellation only goes ahead if the
+          reservation is booked under this name
+    
+    Returns:
+    dict: Result with status and the cancelled booking if successful
+    """
+    return get_backend().cancel_reservation(cancellation)
+
+
+def modify_reservation(modification):
+    """
+    Change an existing reservation, re-checking that the new slot is free.
+    
+    Parameters:
+    modification (dict): A dictionary containing:
+        - reservation_id (int): The ID returned when the room was reserved
+        - room_id (int): Optional new room
+        - guest_name (str): Optional new guest name
+        - date (str): Optional new date in format 'YYYY-MM-DD'; on its own it
+          moves the whole booking and keeps its length
+        - start_time (str): Optional new start time in format 'HH:MM'
+        - end_time (str): Optional new end time in format 'HH:MM'
+        - check_in (str): Optional new check-in in format 'YYYY-MM-DD HH:MM'
+        - check_out (str): Optional new check-out in format 'YYYY-MM-DD HH:MM'
+    
+    Returns:
+    dict: Result with status, the updated booking and the previous one if successful
+    """
+    return get_backend().modify_reservation(modification)
+
+
+def check_availability_batch(queries):
+    """
+    Run several availability searches in one call.
+    
+    Parameters:
+    queries (list): Query dictionaries, each in the format accepted by check_availability
+    
+    Returns:
+    dict: Query index -> {"status": "success", "rooms": [...]} or {"status": "error", "message": ...}
+    """
+    return get_backend().check_availability_batch(queries)
+
+
+def check_availability_matrix(query_parameters):
+    """
+    Find the rooms free for each of several time windows at once.
+    
+    Parameters:
+    query_parameters (dict): A dictionary containing:
+        - windows (list): Dicts with date ('YYYY-MM-DD'), start_time and end_time ('HH:MM'),
+          or with check_in and check_out ('YYYY-MM-DD HH:MM')
+        - capacity (int): Minimum capacity required
+        - features (list): List of required features
+    
+    Returns:
+    list: One entry per window with its available_room_ids
+    """
+    return get_backend().availability_matrix(query_parameters)
+
+
+def check_availability_with_alternatives(query_parameters):
+    """
+    Check for available rooms and, if none match, suggest the closest alternatives in the same call.
+    
+    Parameters:
+    query_parameters (dict): The criteria accepted by check_availability, plus:
+        - flex_minutes (int): How far an alternative may move the window (default 120)
+        - max_alternatives (int): Alternatives to return (default 5)
+    
+    Returns:
+    dict: rooms (exact matches) and, when there are none, alternatives ranked best first.
+          Each alternative is a room with a reason: 'missing_feature' (with missing_feature),
+          'smaller_room', or 'shifted_time' (with shift_minutes, check_in and check_out)
+    """
+    return get_backend().check_availability_with_alternatives(query_parameters)
+
+
+def find_next_available(query_parameters):
+    """
+    Find the earliest free time windows of a given length, for when the requested time is taken.
+    
+    Parameters:
+    query_parameters (dict): A dictionary containing:
+        - duration_minutes (int): Length of the wanted booking in minutes (e.g. 120, or 4320 for three days)
+        - search_from (str): Earliest start, format 'YYYY-MM-DD HH:MM' (default: now)
+        - search_until (str): Latest end, format 'YYYY-MM-DD HH:MM' (default: search_from + horizon_days)
+        - horizon_days (int): Days to search when search_until is not given (default 14)
+        - capacity (int): Minimum capacity required
+        - features (list): List of required features
+        - windows_per_room (int): Free windows to return per room (default 3)
+        - max_rooms (int): Rooms to return, those free earliest first (default 5)
+    
+    Returns:
+    list: Rooms with id, capacity, features and windows, each window with check_in and
+          check_out ('YYYY-MM-DD HH:MM') ready for reserve_room, and free_until
+    """
+    return get_backend().find_next_available(query_parameters)
+
+
+def import_reservations(rows, chunk_size=None):
+    """
+    Load many reservations at once, e.g. when migrating a property's bookings.
+    
+    Parameters:
+    rows (iterable): Reservation dicts in the format accepted by reserve_room
+    chunk_size (int): Rows committed per transaction
+    
+    Returns:
+    dict: Number of rows imported and the rejected rows with the reason for each
+    """
+    return get_backend().import_reservations(rows, chunk_size)
+
+
+def availability_cache_stats():
+    """
+    Report the availability cache counters.
+    
+    Returns:
+    dict: enabled flag, entries, hits, misses, evictions, expirations and invalidations
+    """
+    return get_backend().availability_cache_stats()
+
+
+def optimize_room_assignment(options=None):
+    """
+    Move flexible reservations between equivalent rooms to consolidate idle gaps.
+    
+    Parameters:
+    options (dict): Optional; from and until ('YYYY-MM-DD HH:MM') bound the
+        check-ins considered, dry_run reports the moves without applying them
+    
+    Returns:
+    dict: Result with status, the moves, and stranded minutes and bookable
+        slots before and after
+    """
+    return get_backend().optimize_room_assignment(options)
+
+
+def write_queue_stats():
+    """
+    Report the group-commit write queue counters.
+    
+    Returns:
+    dict: enabled flag, batches, items, mean and largest batch size,
+        throughput and submit-to-result latency percentiles
+    """
+    return get_backend().write_queue_stats()
+
+
+def list_rooms():
+    """
+    List every room in the hotel.
+    
+    Returns:
+    list: List of rooms with their id, capacity and features
+    """
+    return get_backend().list_rooms()
+
+
+def list_reservations(filters=None):
+    """
+    List reservations, optionally filtered.
+    
+    Parameters:
+    filters (dict): Optional criteria:
+        - room_id (int): Only reservations for this room
+        - date (str): Only reservations on this date, format 'YYYY-MM-DD'
+        - include_archived (bool): Also read archived past reservations,
+          each flagged with "archived"
+    
+    Returns:
+    list: List of reservations ordered by date and start time
+    """
+    return get_backend().list_reservations(filters)
+
+
+def archive_reservations(before=None, batch_size=None):
+    """
+    Move reservations that have ended to the archive table.
+    
+    Parameters:
+    before (str): Cutoff 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM'; reservations ending
+        by then are archived (default: ARCHIVE_AFTER_DAYS days before today)
+    batch_size (int): Rows moved per transaction
+    
+    Returns:
+    dict: Number of reservations archived, batches used and the cutoff
+    """
+    return get_backend().archive_reservations(before, batch_size)
+
+
+def occupancy_report(query_parameters):
+    """
+    Summarize occupancy from the daily occupancy table.
+    
+    Parameters:
+    query_parameters (dict): A dictionary containing:
+        - from (str): First day in format 'YYYY-MM-DD' (default: today)
+        - to (str): Last day, inclusive (default: OCCUPANCY_DEFAULT_DAYS days in all)
+        - group_by (str): 'day', 'room' or 'feature' (default: 'day')
+    
+    Returns:
+    dict: Booked and available minutes and the occupancy ratio, in total and per group
+    """
+    return get_backend().occupancy_report(query_parameters)
+
+
+def rebuild_occupancy(first_date=None, last_date=None):
+    """
+    Recompute the daily occupancy table from the reservations.
+    
+    Parameters:
+    first_date, last_date (str): Days to rebuild in format 'YYYY-MM-DD', inclusive (default: all)
+    
+    Returns:
+    dict: Number of room-day rows written
+    """
+    return get_backend().rebuild_occupancy(first_date, last_date)
+
+
+def check_occupancy(first_date=None, last_date=None):
+    """
+    Compare the daily occupancy table with the reservations.
+    
+    Parameters:
+    first_date, last_date (str): Days to check in format 'YYYY-MM-DD', inclusive (default: all)
+    
+    Returns:
+    dict: consistent flag, counts of missing, unexpected and mismatched
+        room-day rows, and a sample of the differences
+    """
+    return get_backend().check_occupancy(first_date, last_date)
@@ -0,0 +1,231 @@
+# src/database/generate_dataset.py
+import os
+import sys
+import json
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.time_utils import MINUTES_PER_DAY, to_minutes, from_minutes, parse_time
+
+# Share of rooms offering each feature
+FEATURE_DISTRIBUTION = {
+    "WiFi": 0.95,
+    "TV": 0.8,
+    "AC": 0.7,
+    "Work Desk": 0.35,
+    "Coffee Machine": 0.3,
+    "Mini-bar": 0.3,
+    "Balcony": 0.25,
+    "Kitchen": 0.2,
+    "Ocean View": 0.15,
+    "Pet Friendly": 0.15,
+    "Accessibility Features": 0.1,
+    "Pool Access": 0.1,
+    "Projector": 0.05,
+    "Conference Room": 0.03,
+}
+
+# (capacity, weight): mostly doubles, a few suites and meeting rooms
+CAPACITY_DISTRIBUTION = [(1, 10), (2, 40), (3, 15), (4, 20), (6, 10), (8, 4), (12, 1)]
+
+# Bookings start on this grid, in minutes
+START_GRID_MINUTES = 30
+
+
+def generate_rooms(rng, room_count, first_room_id=1, feature_distribution=None):
+    """
+    Yield (id, capacity, features JSON) rows for room_count rooms.
+
+    Each feature is present independently with its probability in
+    feature_distribution (default FEATURE_DISTRIBUTION).
+    """
+    feature_distribution = feature_distribution or FEATURE_DISTRIBUTION
+    capacities, weights = zip(*CAPACITY_DISTRIBUTION)
+    for room_id in range(first_room_id, first_room_id + room_count):
+        capacity = rng.choices(capacities, weights)[0]
+        features = [feature for feature, share in feature_distribution.items() if rng.random() < share]
+        yield room_id, capacity, json.dumps(features)
+
+
+def _booking_length(rng, stay_share, check_in_minute, check_out_minute):
+    """Kind ("stay" of nights or "block" of hours) and length in minutes of one booking."""
+    if rng.random() < stay_share:
+        nights = rng.choice((1, 1, 2, 2, 3, 4, 7))
+        return "stay", nights * MINUTES_PER_DAY - (check_in_minute - check_out_minute)
+    return "block", rng.randint(1, 8) * 60
+
+
+def generate_reservations(rng, room_ids, start_date, days, occupancy=0.6, stay_share=0.3,
+                          check_in_time="15:00", check_out_time="11:00"):
+    """
+    Yield non-overlapping reservations for every room over days from start_date.
+
+    Each room's timeline is walked forward alternating bookings and idle gaps;
+    the mean gap is sized so that about `occupancy` of the time is booked.
+    stay_share of the bookings are multi-night stays from check_in_time to
+    check_out_time, the rest are blocks of 1-8 hours on the START_GRID_MINUTES grid.
+
+    Yields:
+    tuple: (room_id, guest_name, date, start_time, end_time, start_ts, end_ts)
+    """
+    if not 0 < occupancy < 1:
+        raise ValueError("occupancy must be between 0 and 1")
+    check_in_minute, check_out_minute = parse_time(check_in_time), parse_time(check_out_time)
+    horizon_start = to_minutes(start_date, 0)
+    horizon_end = horizon_start + days * MINUTES_PER_DAY
+
+    # Mean booking length of the mix, used to size the gaps
+    mean_stay = 2.86 * MINUTES_PER_DAY - (check_in_minute - check_out_minute)
+    mean_length = stay_share * mean_stay + (1 - stay_share) * 4.5 * 60
+    # Stays also wait on average half a day for check-in time, so shorten the random gap by that
+    mean_gap = max(mean_length * (1 - occupancy) / occupancy - stay_share * MINUTES_PER_DAY / 2, START_GRID_MINUTES)
+
+    guest = 0
+    for room_id in room_ids:
+        cursor = horizon_start + int(rng.expovariate(1 / mean_gap))
+        while True:
+            kind, length = _booking_length(rng, stay_share, check_in_minute, check_out_minute)
+            if kind == "stay":
+                # Stays start at check-in time on the first day the room is free from then
+                day_start = cursor - cursor % MINUTES_PER_DAY
+                start_ts = day_start + check_in_minute
+                if start_ts < cursor:
+                    start_ts += MINUTES_PER_DAY
+            else:
+                start_ts = -(-cursor // START_GRID_MINUTES) * START_GRID_MINUTES
+            end_ts = start_ts + length
+            if end_ts > horizon_end:
+                break
+
+            guest += 1
+            date, start_time = from_minutes(start_ts)
+            yield room_id, f"Guest {guest}", date, start_time, from_minutes(end_ts)[1], start_ts, end_ts
+            cursor = end_ts + int(rng.expovariate(1 / mean_gap))
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def populate(conn, rooms=5000, days=730, start_date="2024-01-01", occupancy=0.6, stay_share=0.3,
+             seed=0, chunk_size=10000, feature_distribution=None):
+    """
+    Fill a migrated, empty database with a reproducible synthetic hotel.
+
+    The same arguments always produce the same rooms and reservations.
+
+    Parameters:
+    conn: Connection to a database at the latest schema version
+    rooms (int): Number of rooms
+    days (int): Length of the booking history and future, from start_date
+    start_date (str): First day of the generated span, format 'YYYY-MM-DD'
+    occupancy (float): Target share of each room's time that is booked
+    stay_share (float): Share of bookings that are multi-night stays
+    seed (int): Random seed
+    feature_distribution (dict): Probability of each room feature
+        (default FEATURE_DISTRIBUTION)
+
+    Returns:
+    dict: Number of rooms and reservations written
+    """
+    rng = random.Random(seed)
+    if conn.in_transaction:
+        conn.commit()
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            "INSERT INTO rooms (id, capacity, features) VALUES (?, ?, ?)",
+            generate_rooms(rng, rooms, feature_distribution=feature_distribution)
+        )
+        conn.commit()
+
+        room_ids = [row[0] for row in conn.execute("SELECT id FROM rooms ORDER BY id")]
+        reservation_count = 0
+        for chunk in _chunks(generate_reservations(rng, room_ids, start_date, days, occupancy, stay_share), chunk_size):
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("""
+                INSERT INTO reservations (room_id, guest_name, date, start_time, end_time, start_ts, end_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, chunk)
+            conn.commit()
+            reservation_count += len(chunk)
+
+        # Give the planner statistics for the new data distribution
+        conn.execute("ANALYZE")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {"rooms": rooms, "reservations": reservation_count}
+
+
+def parse_feature_distribution(text):
+    """
+    Read a feature distribution from the command line.
+
+    Accepts a JSON object ('{"WiFi": 0.5}') or comma-separated
+    feature=probability pairs ('WiFi=0.5,Ocean View=0.9').
+
+    Returns:
+    dict: Feature name -> probability
+
+    Raises:
+    argparse.ArgumentTypeError: If the text is malformed or a probability is outside [0, 1]
+    """
+    try:
+        if text.lstrip().startswith("{"):
+            distribution = {str(feature): float(share) for feature, share in json.loads(text).items()}
+        else:
+            pairs = [pair.split("=", 1) for pair in text.split(",") if pair.strip()]
+            distribution = {feature.strip(): float(share) for feature, share in pairs}
+    except (ValueError, TypeError, AttributeError):
+        raise argparse.ArgumentTypeError(
+            f"invalid feature distribution '{text}', expected JSON or feature=probability pairs"
+        )
+    for feature, share in distribution.items():
+        if not feature or not 0 <= share <= 1:
+            raise argparse.ArgumentTypeError(f"invalid probability {share} for feature '{feature}'")
+    if not distribution:
+        raise argparse.ArgumentTypeError("the feature distribution is empty")
+    return distribution
+
+
+def main():
+    from database.backends import create_backend, get_backend
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic hotel dataset for benchmarking")
+    parser.add_argument("--database", help="DATABASE_URL to fill (default: the configured one)")
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--occupancy", type=float, default=0.6)
+    parser.add_argument("--stay-share", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--feature-distribution", type=parse_feature_distribution,
+                        help="probability of each room feature, as JSON or 'WiFi=0.5,Ocean View=0.9' "
+                             "(default: the built-in distribution)")
+    args = parser.parse_args()
+
+    backend = create_backend(args.database) if args.database else get_backend()
+    backend.migrate()
+    with backend.connection() as conn:
+        if conn.execute("SELECT EXISTS (SELECT 1 FROM rooms)").fetchone()[0]:
+            parser.error("the database already has rooms; generate into an empty database")
+        counts = populate(conn, args.rooms, args.days, args.start_date, args.occupancy, args.stay_share, args.seed,
+                          feature_distribution=args.feature_distribution)
+    backend.close()
+    print(f"Generated {counts['rooms']} rooms and {counts['reservations']} reservations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+# src/database/migrations.py
+import os
+import sys
+import argparse
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.time_utils import normalize_window
+
+
+def _backfill_reservation_timestamps(conn):
+    """Encode every existing TEXT date/time reservation as integer minutes."""
+    rows = conn.execute(
+        "SELECT id, date, start_time, end_time FROM reservations WHERE start_ts IS NULL"
+    ).fetchall()
+    updates = []
+    for reservation_id, day, start_time, end_time in rows:
+        try:
+            start_ts, end_ts = normalize_window(day, start_time, end_time)
+        except ValueError as e:
+            raise ValueError(f"Reservation {reservation_id} has an unreadable time window: {e}")
+        updates.append((start_ts, end_ts, reservation_id))
+    conn.executemany("UPDATE reservations SET start_ts = ?, end_ts = ? WHERE id = ?", updates)
+
+
+# Every reservation, archived ones included, split at midnight into per-room, per-day booked minutes
+_OCCUPANCY_BACKFILL_SQL = '''
+INSERT INTO occupancy_daily (date, room_id, booked_minutes)
+WITH RECURSIVE days (room_id, start_ts, end_ts, day) AS (
+    SELECT room_id, start_ts, end_ts, start_ts / 1440 FROM all_reservations
+    WHERE end_ts > start_ts AND room_id IS NOT NULL
+    UNION ALL
+    SELECT room_id, start_ts, end_ts, day + 1 FROM days WHERE (day + 1) * 1440 < end_ts
+)
+SELECT date(day * 86400, 'unixepoch'), room_id,
+    SUM(MIN(end_ts, (day + 1) * 1440) - MAX(start_ts, day * 1440))
+FROM days
+GROUP BY day, room_id
+'''
+
+
+def _occupancy_delta_sql(row, sign):
+    """
+    Trigger statements adding (sign 1) or subtracting (sign -1) a reservation's minutes in occupancy_daily.
+
+    row is NEW or OLD. Rows without a room or a window (such as a raw insert
+    before reservations_encode_window fills it in) change nothing.
+    """
+    statements = f'''
+            INSERT INTO occupancy_daily (date, room_id, booked_minutes)
+            WITH RECURSIVE days (day) AS (
+                SELECT {row}.start_ts / 1440
+                UNION ALL
+                SELECT day + 1 FROM days WHERE (day + 1) * 1440 < {row}.end_ts
+            )
+            SELECT date(day * 86400, 'unixepoch'), {row}.room_id,
+                {sign} * (MIN({row}.end_ts, (day + 1) * 1440) - MAX({row}.start_ts, day * 1440))
+            FROM days
+            WHERE {row}.room_id IS NOT NULL AND {row}.end_ts > {row}.start_ts
+            ON CONFLICT (date, room_id) DO UPDATE SET booked_minutes = booked_minutes + excluded.booked_minutes;'''
+    if sign < 0:
+        statements += f'''
+            DELETE FROM occupancy_daily
+            WHERE room_id = {row}.room_id AND booked_minutes <= 0
+            AND date BETWEEN date({row}.start_ts / 1440 * 86400, 'unixepoch')
+                AND date(({row}.end_ts - 1) / 1440 * 86400, 'unixepoch');'''
+    return statements
+
+
+# Ordered list of (version, name, steps). A step is either an SQL string or a
+# callable taking the connection, for data migrations that need Python.
+# Never edit an applied migration; append a new one instead.
+MIGRATIONS = [
+    (1, "create rooms and reservations", [
+        '''
+        CREATE TABLE IF NOT EXISTS rooms (
+            id INTEGER PRIMARY KEY,
+            capacity INTEGER NOT NULL,
+            features TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS reservations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            room_id INTEGER,
+            guest_name TEXT,
+            date TEXT,          -- Format: YYYY-MM-DD
+            start_time TEXT,    -- Format: HH:MM
+            end_time TEXT,      -- Format: HH:MM
+            FOREIGN KEY (room_id) REFERENCES rooms(id)
+        )
+        ''',
+    ]),
+    (2, "index reservations for availability and conflict checks", [
+        # Availability: date equality, then every room's slots read from the index
+        '''
+        CREATE INDEX IF NOT EXISTS idx_reservations_date_room
+        ON reservations (date, room_id, start_time, end_time)
+        ''',
+        # Conflict check for one room; the leading room_id also serves the foreign key
+        '''
+        CREATE INDEX IF NOT EXISTS idx_reservations_room_date
+        ON reservations (room_id, date, start_time, end_time)
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_rooms_capacity ON rooms (capacity)",
+        "ANALYZE",
+    ]),
+    (3, "normalize room features with a bitmask column", [
+        '''
+        CREATE TABLE IF NOT EXISTS features (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS room_features (
+            room_id INTEGER NOT NULL,
+            feature_id INTEGER NOT NULL,
+            PRIMARY KEY (room_id, feature_id),
+            FOREIGN KEY (room_id) REFERENCES rooms(id),
+            FOREIGN KEY (feature_id) REFERENCES features(id)
+        ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_room_features_feature ON room_features (feature_id, room_id)",
+        # Bit (id - 1) is set for each feature with id <= FEATURE_MASK_BITS
+        "ALTER TABLE rooms ADD COLUMN feature_mask INTEGER NOT NULL DEFAULT 0",
+        # Keep the normalized tables in step with the JSON column on every write
+        '''
+        CREATE TRIGGER IF NOT EXISTS rooms_features_insert AFTER INSERT ON rooms
+        BEGIN
+            INSERT OR IGNORE INTO features (name) SELECT value FROM json_each(NEW.features);
+            INSERT OR IGNORE INTO room_features (room_id, feature_id)
+                SELECT NEW.id, f.id FROM json_each(NEW.features) j JOIN features f ON f.name = j.value;
+            UPDATE rooms SET feature_mask = (
+                SELECT COALESCE(SUM(1 << (feature_id - 1)), 0) FROM room_features
+                WHERE room_id = NEW.id AND feature_id <= 63
+            ) WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS rooms_features_update AFTER UPDATE OF features ON rooms
+        BEGIN
+            DELETE FROM room_features WHERE room_id = NEW.id;
+            INSERT OR IGNORE INTO features (name) SELECT value FROM json_each(NEW.features);
+            INSERT OR IGNORE INTO room_features (room_id, feature_id)
+                SELECT NEW.id, f.id FROM json_each(NEW.features) j JOIN features f ON f.name = j.value;
+            UPDATE rooms SET feature_mask = (
+                SELECT COALESCE(SUM(1 << (feature_id - 1)), 0) FROM room_features
+                WHERE room_id = NEW.id AND feature_id <= 63
+            ) WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS rooms_features_delete AFTER DELETE ON rooms
+        BEGIN
+            DELETE FROM room_features WHERE room_id = OLD.id;
+        END
+        ''',
+        # Backfill existing rooms from their JSON features
+        "INSERT OR IGNORE INTO features (name) SELECT DISTINCT j.value FROM rooms r, json_each(r.features) j",
+        '''
+        INSERT OR IGNORE INTO room_features (room_id, feature_id)
+        SELECT r.id, f.id FROM rooms r, json_each(r.features) j JOIN features f ON f.name = j.value
+        ''',
+        '''
+        UPDATE rooms SET feature_mask = (
+            SELECT COALESCE(SUM(1 << (feature_id - 1)), 0) FROM room_features
+            WHERE room_id = rooms.id AND feature_id <= 63
+        )
+        ''',
+    ]),
+    (4, "encode reservation windows as integer minutes", [
+        "ALTER TABLE reservations ADD COLUMN start_ts INTEGER",
+        "ALTER TABLE reservations ADD COLUMN end_ts INTEGER",
+        _backfill_reservation_timestamps,
+        # Rows inserted with only the TEXT columns get encoded on the way in;
+        # an end before the start wraps to the next day as in normalize_window
+        '''
+        CREATE TRIGGER IF NOT EXISTS reservations_encode_window AFTER INSERT ON reservations
+        WHEN NEW.start_ts IS NULL
+        BEGIN
+            UPDATE reservations SET
+                start_ts = CAST(strftime('%s', NEW.date || ' ' || NEW.start_time) AS INTEGER) / 60,
+                end_ts = CAST(strftime('%s', NEW.date || ' ' || NEW.end_time) AS INTEGER) / 60
+                    + CASE WHEN NEW.end_time < NEW.start_time THEN 1440 ELSE 0 END
+            WHERE id = NEW.id;
+        END
+        ''',
+        # Overlap is "end_ts > start AND start_ts < end". Leading with end_ts makes
+        # the range scan skip all past bookings, which is where history accumulates.
+        '''
+        CREATE INDEX IF NOT EXISTS idx_reservations_span
+        ON reservations (end_ts, start_ts, room_id)
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_reservations_room_span
+        ON reservations (room_id, end_ts, start_ts)
+        ''',
+        # Superseded by the integer indexes; the room_id foreign key is still led by idx_reservations_room_span
+        "DROP INDEX IF EXISTS idx_reservations_date_room",
+        "DROP INDEX IF EXISTS idx_reservations_room_date",
+        "ANALYZE",
+    ]),
+    (5, "archive table for past reservations", [
+        # Past reservations move here with their ids, so the hot table only holds
+        # bookings that can still conflict; AUTOINCREMENT keeps ids from being reused
+        '''
+        CREATE TABLE IF NOT EXISTS reservations_archive (
+            id INTEGER PRIMARY KEY,
+            room_id INTEGER,
+            guest_name TEXT,
+            date TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            start_ts INTEGER NOT NULL,
+            end_ts INTEGER NOT NULL,
+            archived_at TEXT NOT NULL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_reservations_archive_span ON reservations_archive (end_ts, start_ts, room_id)",
+        "CREATE INDEX IF NOT EXISTS idx_reservations_archive_room ON reservations_archive (room_id, start_ts)",
+        # Historical reads go through this view to see both tables
+        '''
+        CREATE VIEW IF NOT EXISTS all_reservations AS
+        SELECT id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts, 0 AS archived
+        FROM reservations
+        UNION ALL
+        SELECT id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts, 1 AS archived
+        FROM reservations_archive
+        ''',
+    ]),
+    (6, "flexible reservations", [
+        # 1 if the guest accepted any equivalent room, so the optimizer may move the booking
+        "ALTER TABLE reservations ADD COLUMN flexible INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_reservations_flexible ON reservations (start_ts) WHERE flexible = 1",
+    ]),
+    (7, "daily occupancy summary", [
+        # Booked minutes per room and day, kept current by the triggers of migration 8
+        '''
+        CREATE TABLE IF NOT EXISTS occupancy_daily (
+            date TEXT NOT NULL,         -- Format: YYYY-MM-DD
+            room_id INTEGER NOT NULL,
+            booked_minutes INTEGER NOT NULL,
+            PRIMARY KEY (date, room_id)
+        ) WITHOUT ROWID
+        ''',
+        # Backfill from every reservation, archived ones included, split at midnight
+        _OCCUPANCY_BACKFILL_SQL,
+    ]),
+    (8, "maintain the occupancy summary with triggers", [
+        # The summary changes in the same transaction as the reservation, whoever writes it
+        f'''
+        CREATE TRIGGER IF NOT EXISTS reservations_occupancy_insert AFTER INSERT ON reservations
+        BEGIN{_occupancy_delta_sql("NEW", 1)}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS reservations_occupancy_update
+        AFTER UPDATE OF room_id, start_ts, end_ts ON reservations
+        BEGIN{_occupancy_delta_sql("OLD", -1)}{_occupancy_delta_sql("NEW", 1)}
+        END
+        ''',
+        # Archiving copies a row to reservations_archive before deleting it, and
+        # archived bookings keep counting toward history
+        f'''
+        CREATE TRIGGER IF NOT EXISTS reservations_occupancy_delete AFTER DELETE ON reservations
+        WHEN NOT EXISTS (SELECT 1 FROM reservations_archive WHERE id = OLD.id)
+        BEGIN{_occupancy_delta_sql("OLD", -1)}
+        END
+        ''',
+        # Rows written since migration 7 without a listener are picked up here
+        "DELETE FROM occupancy_daily",
+        _OCCUPANCY_BACKFILL_SQL,
+    ]),
+]
+
+# Feature ids that fit in rooms.feature_mask (bits 0..62, keeping the sign bit clear)
+FEATURE_MASK_BITS = 63
+
+
+def _ensure_migrations_table(conn):
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL
+    )
+    ''')
+
+
+def current_version(conn):
+    """Return the highest applied migration version, 0 for a fresh database."""
+    _ensure_migrations_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn, target=None):
+    """
+    Apply every pending migration up to target (default: latest).
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction and the
+    version is re-read under the write lock, so several workers starting
+    at once apply each migration exactly once.
+
+    Returns:
+    list: Versions applied by this call
+    """
+    if conn.in_transaction:
+        conn.commit()
+    _ensure_migrations_table(conn)
+    if conn.in_transaction:
+        conn.commit()
+
+    applied = []
+    for version, name, steps in MIGRATIONS:
+        if target is not None and version > target:
+            break
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= current_version(conn):
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, datetime.now().isoformat(timespec="seconds"))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+
+    return applied
+
+
+def explain_query_plan(conn, query, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def main():
+    from database.backends import get_backend
+
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--target", type=int, help="migrate up to this version only")
+    parser.add_argument("--explain", action="store_true",
+                        help="print the query plans of the hot queries after migrating")
+    args = parser.parse_args()
+
+    backend = get_backend()
+    with backend.connection() as conn:
+        applied = migrate(conn, args.target)
+        print(f"Applied migrations: {applied or 'none'} (schema version {current_version(conn)})")
+
+    if args.explain:
+        for name, report in backend.explain_hot_queries().items():
+            status = "uses index" if report["uses_index"] else "FULL SCAN"
+            print(f"{name}: {status}")
+            for line in report["plan"]:
+                print(f"    {line}")
+
+
+if __name__ == "__main__":
+    main()
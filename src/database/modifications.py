@@ -0,0 +1,192 @@
+# src/database/modifications.py
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import transaction
+from database.reservations import modified_reservation, describe_window
+from database.time_utils import format_minutes
+
+RESERVATION_COLUMNS = "id, room_id, guest_name, date, start_time, end_time, start_ts, end_ts"
+
+# Move a reservation unless the new window overlaps another booking of the target room
+MODIFY_SQL = """
+UPDATE reservations SET
+    room_id = :room_id, guest_name = :guest_name, date = :date,
+    start_time = :start_time, end_time = :end_time, start_ts = :start_ts, end_ts = :end_ts
+WHERE id = :id
+AND NOT EXISTS (
+    SELECT 1 FROM reservations
+    WHERE room_id = :room_id AND id != :id AND end_ts > :start_ts AND start_ts < :end_ts
+)
+RETURNING id
+"""
+
+
+def _fetch_reservation(conn, reservation_id):
+    row = conn.execute(
+        f"SELECT {RESERVATION_COLUMNS} FROM reservations WHERE id = ?", (reservation_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(zip(("id", "room_id", "guest_name", "date", "start_time", "end_time", "start_ts", "end_ts"), row))
+
+
+def _missing_reservation_message(conn, reservation_id):
+    archived = conn.execute("SELECT 1 FROM reservations_archive WHERE id = ?", (reservation_id,)).fetchone()
+    if archived:
+        return f"Reservation {reservation_id} has already ended and was archived"
+    return f"Reservation {reservation_id} does not exist"
+
+
+def _reservation_id(parameters):
+    reservation_id = parameters.get('reservation_id')
+    if not reservation_id:
+        raise ValueError("Missing reservation_id")
+    try:
+        return int(reservation_id)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid reservation_id '{reservation_id}'")
+
+
+def cancel_reservation(backend, cancellation):
+    """
+    Delete a reservation, optionally checking it is booked under the given guest name.
+
+    Parameters:
+    backend (SQLiteBackend): The backend holding the reservation
+    cancellation (dict): reservation_id and optionally guest_name
+
+    Returns:
+    dict: A dictionary with the status and details of the cancellation
+    """
+    try:
+        reservation_id = _reservation_id(cancellation)
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    guest_name = cancellation.get('guest_name')
+
+    try:
+        with backend.connection() as conn, transaction(conn):
+            reservation = _fetch_reservation(conn, reservation_id)
+            if reservation is None:
+                message = _missing_reservation_message(conn, reservation_id)
+            elif guest_name and guest_name.strip().lower() != (reservation["guest_name"] or "").strip().lower():
+                # Guards the agent against cancelling someone else's booking by a mistyped id
+                message = f"Reservation {reservation_id} is not booked under the name {guest_name}"
+                reservation = None
+            else:
+                conn.execute("DELETE FROM reservations WHERE id = ?", (reservation_id,))
+
+        if reservation is None:
+            return {
+                "status": "error",
+                "message": message
+            }
+
+        backend.notify_removed(reservation)
+
+        return {
+            "status": "success",
+            "reservation_id": reservation_id,
+            "message": f"Reservation {reservation_id} for {reservation['guest_name']} in room "
+                       f"{reservation['room_id']} {describe_window(reservation['start_ts'], reservation['end_ts'])} was cancelled",
+            "details": {
+                "room_id": reservation["room_id"],
+                "guest_name": reservation["guest_name"],
+                "check_in": format_minutes(reservation["start_ts"]),
+                "check_out": format_minutes(reservation["end_ts"])
+            }
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error cancelling reservation: {str(e)}"
+        }
+
+
+def modify_reservation(backend, modification):
+    """
+    Change a reservation's room, guest or window in one write transaction.
+
+    The booking is read, re-checked and updated under one write lock, so it
+    either moves to a free window or stays exactly as it was.
+
+    Parameters:
+    backend (SQLiteBackend): The backend holding the reservation
+    modification (dict): reservation_id and the fields to change
+
+    Returns:
+    dict: A dictionary with the status, the new details and the previous booking
+    """
+    try:
+        reservation_id = _reservation_id(modification)
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+    try:
+        with backend.connection() as conn, transaction(conn):
+            previous = _fetch_reservation(conn, reservation_id)
+            if previous is None:
+                return {
+                    "status": "error",
+                    "message": _missing_reservation_message(conn, reservation_id)
+                }
+            try:
+                updated = {**modified_reservation(previous, modification), "id": reservation_id}
+            except ValueError as e:
+                return {
+                    "status": "error",
+                    "message": str(e)
+                }
+            room = backend.catalog_room(updated["room_id"])
+            if room is None:
+                return {
+                    "status": "error",
+                    "message": f"Room {updated['room_id']} does not exist"
+                }
+            if conn.execute(MODIFY_SQL, updated).fetchone() is None:
+                return {
+                    "status": "error",
+                    "message": f"Room {updated['room_id']} is not available during the requested time"
+                }
+
+        backend.notify_removed(previous)
+        backend.notify_added(updated)
+
+        return {
+            "status": "success",
+            "reservation_id": reservation_id,
+            "message": f"Reservation {reservation_id} for {updated['guest_name']} moved to room "
+                       f"{updated['room_id']} {describe_window(updated['start_ts'], updated['end_ts'])}",
+            "details": {
+                "room_id": updated["room_id"],
+                "capacity": room.capacity,
+                "features": list(room.features),
+                "guest_name": updated["guest_name"],
+                "date": updated["date"],
+                "start_time": updated["start_time"],
+                "end_time": updated["end_time"],
+                "check_in": format_minutes(updated["start_ts"]),
+                "check_out": format_minutes(updated["end_ts"])
+            },
+            "previous": {
+                "room_id": previous["room_id"],
+                "guest_name": previous["guest_name"],
+                "check_in": format_minutes(previous["start_ts"]),
+                "check_out": format_minutes(previous["end_ts"])
+            }
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error modifying reservation: {str(e)}"
+        }
@@ -0,0 +1,325 @@
+# src/database/occupancy.py
+import os
+import sys
+import argparse
+from datetime import date as date_type, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.connection import transaction
+from database.time_utils import MINUTES_PER_DAY, from_minutes, to_minutes, day_bounds, parse_date
+
+GROUP_BY = ("day", "room", "feature")
+
+# Per-room, per-day booked minutes of every reservation overlapping [:start_ts, :end_ts),
+# archived ones included: each booking is clipped to the range, then split at midnight
+EXPECTED_OCCUPANCY_SQL = f"""
+WITH RECURSIVE days (room_id, start_ts, end_ts, day) AS (
+    SELECT room_id, MAX(start_ts, :start_ts), MIN(end_ts, :end_ts), MAX(start_ts, :start_ts) / {MINUTES_PER_DAY}
+    FROM all_reservations
+    WHERE end_ts > :start_ts AND start_ts < :end_ts AND room_id IS NOT NULL
+    UNION ALL
+    SELECT room_id, start_ts, end_ts, day + 1 FROM days WHERE (day + 1) * {MINUTES_PER_DAY} < end_ts
+)
+SELECT date(day * 86400, 'unixepoch'), room_id,
+    SUM(MIN(end_ts, (day + 1) * {MINUTES_PER_DAY}) - MAX(start_ts, day * {MINUTES_PER_DAY}))
+FROM days
+GROUP BY day, room_id
+"""
+
+# All time the table can hold; the range used for a full rebuild or check
+FULL_RANGE = (0, to_minutes("9999-12-31", 0))
+
+
+def rebuild(conn, start_ts=None, end_ts=None):
+    """
+    Recompute occupancy_daily from the reservations for whole days in [start_ts, end_ts).
+
+    Must run inside a write transaction.
+
+    Returns:
+    int: Number of (room, day) rows written
+    """
+    start_ts = FULL_RANGE[0] if start_ts is None else start_ts
+    end_ts = FULL_RANGE[1] if end_ts is None else end_ts
+    conn.execute(
+        "DELETE FROM occupancy_daily WHERE date >= ? AND date < ?",
+        (from_minutes(start_ts)[0], from_minutes(end_ts)[0])
+    )
+    conn.execute(
+        "INSERT INTO occupancy_daily (date, room_id, booked_minutes) " + EXPECTED_OCCUPANCY_SQL,
+        {"start_ts": start_ts, "end_ts": end_ts}
+    )
+    return conn.execute(
+        "SELECT COUNT(*) FROM occupancy_daily WHERE date >= ? AND date < ?",
+        (from_minutes(start_ts)[0], from_minutes(end_ts)[0])
+    ).fetchone()[0]
+
+
+def check(conn, start_ts=None, end_ts=None, sample_size=20):
+    """
+    Compare occupancy_daily with the raw reservations for whole days in [start_ts, end_ts).
+
+    Returns:
+    dict: consistent flag, rows checked, counts of missing, unexpected and
+        mismatched (room, day) rows, and up to sample_size of the differences
+    """
+    start_ts = FULL_RANGE[0] if start_ts is None else start_ts
+    end_ts = FULL_RANGE[1] if end_ts is None else end_ts
+    expected = {
+        (date, room_id): minutes
+        for date, room_id, minutes in conn.execute(
+            EXPECTED_OCCUPANCY_SQL, {"start_ts": start_ts, "end_ts": end_ts}
+        )
+    }
+    stored = {
+        (date, room_id): minutes
+        for date, room_id, minutes in conn.execute(
+            "SELECT date, room_id, booked_minutes FROM occupancy_daily WHERE date >= ? AND date < ?",
+            (from_minutes(start_ts)[0], from_minutes(end_ts)[0])
+        )
+    }
+
+    differences = []
+    counts = {"missing": 0, "unexpected": 0, "mismatched": 0}
+    for key in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(key), stored.get(key)
+        if want == have:
+            continue
+        kind = "missing" if have is None else "unexpected" if want is None else "mismatched"
+        counts[kind] += 1
+        if len(differences) < sample_size:
+            differences.append({
+                "date": key[0], "room_id": key[1], "kind": kind,
+                "expected_minutes": want or 0, "stored_minutes": have or 0
+            })
+    return {
+        "consistent": not any(counts.values()),
+        "rows_checked": len(expected.keys() | stored.keys()),
+        **counts,
+        "differences": differences,
+    }
+
+
+def summarize(conn, rooms, start_ts, end_ts, group_by):
+    """
+    Booked and available minutes for whole days in [start_ts, end_ts), read from occupancy_daily.
+
+    Every room of the catalog offers MINUTES_PER_DAY a day; bookings of
+    rooms no longer in the catalog still count toward the day totals.
+
+    Parameters:
+    conn (sqlite3.Connection): Open connection
+    rooms (list): The catalog's Room tuples
+    start_ts, end_ts (int): Day-aligned range, minutes since the epoch
+    group_by (str): 'day', 'room' or 'feature'
+
+    Returns:
+    list: One dict per group with booked_minutes, available_minutes and occupancy
+    """
+    first, stop = from_minutes(start_ts)[0], from_minutes(end_ts)[0]
+    days = (end_ts - start_ts) // MINUTES_PER_DAY
+
+    def share(booked, available):
+        return {
+            "booked_minutes": booked,
+            "available_minutes": available,
+            "occupancy": round(booked / available, 4) if available else None
+        }
+
+    if group_by == "day":
+        booked = {
+            date: (minutes, booked_rooms) for date, minutes, booked_rooms in conn.execute(
+                "SELECT date, SUM(booked_minutes), COUNT(*) FROM occupancy_daily "
+                "WHERE date >= ? AND date < ? GROUP BY date", (first, stop)
+            )
+        }
+        groups = []
+        for day_start in range(start_ts, end_ts, MINUTES_PER_DAY):
+            date = from_minutes(day_start)[0]
+            minutes, booked_rooms = booked.get(date, (0, 0))
+            groups.append({"date": date, "rooms_booked": booked_rooms,
+                           **share(minutes, len(rooms) * MINUTES_PER_DAY)})
+        return groups
+
+    booked = {
+        room_id: (minutes, booked_days) for room_id, minutes, booked_days in conn.execute(
+            "SELECT room_id, SUM(booked_minutes), COUNT(*) FROM occupancy_daily "
+            "WHERE date >= ? AND date < ? GROUP BY room_id", (first, stop)
+        )
+    }
+    if group_by == "room":
+        return [
+            {"room_id": room.id, "capacity": room.capacity, "features": list(room.features),
+             "days_booked": booked.get(room.id, (0, 0))[1],
+             **share(booked.get(room.id, (0, 0))[0], days * MINUTES_PER_DAY)}
+            for room in rooms
+        ]
+
+    by_feature = {}
+    for room in rooms:
+        for feature in room.features:
+            by_feature.setdefault(feature, []).append(room.id)
+    return [
+        {"feature": feature, "rooms": len(room_ids),
+         **share(sum(booked.get(room_id, (0, 0))[0] for room_id in room_ids),
+                 len(room_ids) * days * MINUTES_PER_DAY)}
+        for feature, room_ids in sorted(by_feature.items())
+    ]
+
+
+def day_range(first_date, last_date):
+    """[start_ts, end_ts) covering first_date through last_date; an omitted end is unbounded."""
+    start_ts = day_bounds(first_date)[0] if first_date else None
+    end_ts = day_bounds(last_date)[1] if last_date else None
+    if start_ts is not None and end_ts is not None and end_ts <= start_ts:
+        raise ValueError("to must not be before from")
+    return start_ts, end_ts
+
+
+def occupancy_report(backend, query_parameters):
+    """
+    Summarize occupancy over a range of days from the occupancy_daily table.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to report on
+    query_parameters (dict):
+        - from (str): First day 'YYYY-MM-DD' (default: today)
+        - to (str): Last day, inclusive (default: OCCUPANCY_DEFAULT_DAYS days in all)
+        - group_by (str): 'day' (default), 'room' or 'feature'
+
+    Returns:
+    dict: status, the range, totals and one entry per group
+    """
+    group_by = query_parameters.get('group_by') or "day"
+    if group_by not in GROUP_BY:
+        return {
+            "status": "error",
+            "message": f"Invalid group_by '{group_by}', expected one of {', '.join(GROUP_BY)}"
+        }
+    try:
+        first_date = parse_date(query_parameters.get('from') or date_type.today())
+        last_date = parse_date(
+            query_parameters.get('to') or first_date + timedelta(days=settings.OCCUPANCY_DEFAULT_DAYS - 1)
+        )
+        start_ts, end_ts = day_range(first_date, last_date)
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    if end_ts - start_ts > settings.OCCUPANCY_MAX_DAYS * MINUTES_PER_DAY:
+        return {
+            "status": "error",
+            "message": f"The range is longer than {settings.OCCUPANCY_MAX_DAYS} days"
+        }
+
+    rooms = backend.room_catalog().rooms
+    with backend.connection() as conn:
+        groups = summarize(conn, rooms, start_ts, end_ts, group_by)
+        booked = conn.execute(
+            "SELECT COALESCE(SUM(booked_minutes), 0) FROM occupancy_daily WHERE date >= ? AND date < ?",
+            (first_date.isoformat(), from_minutes(end_ts)[0])
+        ).fetchone()[0]
+    available = len(rooms) * (end_ts - start_ts)
+    return {
+        "status": "success",
+        "from": first_date.isoformat(),
+        "to": last_date.isoformat(),
+        "group_by": group_by,
+        "total": {
+            "booked_minutes": booked,
+            "available_minutes": available,
+            "occupancy": round(booked / available, 4) if available else None
+        },
+        "groups": groups
+    }
+
+
+def rebuild_occupancy(backend, first_date=None, last_date=None):
+    """
+    Recompute occupancy_daily from the reservations, archived ones included, in one transaction.
+
+    The triggers keep the table current, so this only repairs a summary
+    edited by hand or restored out of step with the reservations.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to repair
+    first_date, last_date (str): Days 'YYYY-MM-DD' to rebuild, inclusive (default: all)
+
+    Returns:
+    dict: status and the number of (room, day) rows written
+    """
+    try:
+        start_ts, end_ts = day_range(first_date, last_date)
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    with backend.connection() as conn, transaction(conn):
+        rows = rebuild(conn, start_ts, end_ts)
+    return {
+        "status": "success",
+        "rows": rows,
+        "message": f"Rebuilt {rows} room-day occupancy row(s)"
+    }
+
+
+def check_occupancy(backend, first_date=None, last_date=None):
+    """
+    Compare occupancy_daily with what the reservations add up to.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to check
+    first_date, last_date (str): Days 'YYYY-MM-DD' to check, inclusive (default: all)
+
+    Returns:
+    dict: status, consistent flag, difference counts and a sample of the differences
+    """
+    try:
+        start_ts, end_ts = day_range(first_date, last_date)
+    except ValueError as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    with backend.connection() as conn:
+        result = check(conn, start_ts, end_ts)
+    if result["consistent"]:
+        message = f"The occupancy summary matches the reservations ({result['rows_checked']} room-day rows)"
+    else:
+        message = (f"The occupancy summary differs from the reservations: {result['missing']} missing, "
+                   f"{result['unexpected']} unexpected and {result['mismatched']} mismatched room-day rows; "
+                   f"run `python -m database.occupancy rebuild`")
+    return {
+        "status": "success",
+        **result,
+        "message": message
+    }
+
+
+def main():
+    from database.backends import get_backend
+
+    parser = argparse.ArgumentParser(description="Maintain the daily occupancy summary table")
+    parser.add_argument("command", choices=("rebuild", "check"))
+    parser.add_argument("--from", dest="start", help="first day 'YYYY-MM-DD' (default: all history)")
+    parser.add_argument("--to", dest="end", help="last day 'YYYY-MM-DD', inclusive (default: all)")
+    args = parser.parse_args()
+
+    backend = get_backend()
+    if args.command == "rebuild":
+        result = backend.rebuild_occupancy(args.start, args.end)
+    else:
+        result = backend.check_occupancy(args.start, args.end)
+        for difference in result.get("differences", []):
+            print(f"    {difference['date']} room {difference['room_id']}: {difference['kind']}, "
+                  f"expected {difference['expected_minutes']} stored {difference['stored_minutes']}")
+    print(result["message"])
+    if result["status"] == "error" or result.get("consistent") is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# src/database/pagination.py
+from database.room_catalog import RoomCatalog
+
+# Result orders for check_availability; every order ends with r.id so room ids are a stable cursor
+AVAILABILITY_SORTS = {
+    "id": "r.id",
+    "capacity": "r.capacity, r.id",
+    "-capacity": "r.capacity DESC, r.id",
+}
+
+# Keyset conditions resuming after a room, per sort; the cursor room's capacity is looked up
+AFTER_ROOM_SQL = {
+    "id": ("r.id > ?", lambda after: [after]),
+    "capacity": (
+        "(r.capacity, r.id) > ((SELECT capacity FROM rooms WHERE id = ?), ?)",
+        lambda after: [after, after]
+    ),
+    "-capacity": (
+        "(r.capacity < (SELECT capacity FROM rooms WHERE id = ?) "
+        "OR (r.capacity = (SELECT capacity FROM rooms WHERE id = ?) AND r.id > ?))",
+        lambda after: [after, after, after]
+    ),
+}
+
+# Every room in id order: the page of an unpaginated query
+DEFAULT_PAGE = ("id", None, None)
+
+
+def page_from_parameters(parameters):
+    """
+    Resolve the sort and keyset cursor of an availability query.
+
+    Returns:
+    tuple: (sort, after_room_id, limit); after_room_id and limit may be None
+
+    Raises:
+    ValueError: If the sort is unknown or the limit is not positive
+    """
+    sort = parameters.get('sort') or "id"
+    if sort not in AVAILABILITY_SORTS:
+        raise ValueError(f"Unknown sort '{sort}', expected one of {list(AVAILABILITY_SORTS)}")
+    limit = parameters.get('limit')
+    if limit is not None and int(limit) < 1:
+        raise ValueError("limit must be at least 1")
+    after_room_id = parameters.get('after_room_id')
+    return (
+        sort,
+        int(after_room_id) if after_room_id is not None else None,
+        int(limit) if limit is not None else None
+    )
+
+
+def page_sql(page):
+    """
+    The ORDER BY / keyset / LIMIT clauses of a page, appended to an availability query.
+
+    Returns:
+    tuple: (sql, params)
+    """
+    sort, after_room_id, limit = page
+    query = ""
+    params = []
+    if after_room_id is not None:
+        condition, condition_params = AFTER_ROOM_SQL[sort]
+        query += f"\n        AND {condition}"
+        params += condition_params(after_room_id)
+    query += f"\n        ORDER BY {AVAILABILITY_SORTS[sort]}"
+    if limit is not None:
+        query += "\n        LIMIT ?"
+        params.append(limit)
+    return query, params
+
+
+def paginate(rooms, page, catalog):
+    """Apply a (sort, after_room_id, limit) page to room dicts in id order, as the SQL path would."""
+    sort, after_room_id, limit = page
+    sort_key = {
+        "id": lambda room: room["id"],
+        "capacity": lambda room: (room["capacity"], room["id"]),
+        "-capacity": lambda room: (-room["capacity"], room["id"]),
+    }[sort]
+    if sort != "id":
+        rooms = sorted(rooms, key=sort_key)
+    if after_room_id is not None:
+        if sort == "id":
+            cursor = after_room_id
+        else:
+            # Like the SQL subquery, a cursor room that no longer exists ends the listing
+            cursor_room = catalog.get(after_room_id)
+            if cursor_room is None:
+                return []
+            cursor = sort_key(RoomCatalog.as_dict(cursor_room))
+        rooms = [room for room in rooms if sort_key(room) > cursor]
+    return rooms[:limit] if limit is not None else rooms
@@ -0,0 +1,227 @@
+# src/database/recurrence.py
+import os
+import sys
+import json
+from datetime import timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.connection import transaction
+from database.reservations import reservation_from_parameters, parse_flag, insert_reservations
+from database.time_utils import parse_date, from_minutes, format_minutes, MINUTES_PER_DAY
+
+FREQUENCIES = ("daily", "weekly")
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Existing bookings of one room overlapping any occurrence of a series,
+# given as a JSON array of [start_ts, end_ts] pairs; key is the occurrence's position
+RECURRING_CONFLICT_SQL = """
+SELECT o.key, r.id FROM json_each(:occurrences) o
+JOIN reservations r ON r.room_id = :room_id
+    AND r.end_ts > json_extract(o.value, '$[0]') AND r.start_ts < json_extract(o.value, '$[1]')
+ORDER BY o.key, r.id
+"""
+
+
+def parse_weekdays(values):
+    """
+    Resolve weekday names ('monday', 'mon', 'MO') or numbers (0 = Monday) into a set of numbers.
+
+    values is a list, or a single comma-separated string such as 'monday, friday'.
+
+    Raises:
+    ValueError: If a weekday is not recognised
+    """
+    if isinstance(values, str):
+        values = [value for value in values.split(",") if value.strip()]
+    weekdays = set()
+    for value in values:
+        if isinstance(value, int) and 0 <= value < 7:
+            weekdays.add(value)
+            continue
+        text = str(value).strip().lower()
+        matches = [number for number, name in enumerate(WEEKDAYS) if len(text) >= 2 and name.startswith(text)]
+        if len(matches) != 1:
+            raise ValueError(f"Invalid weekday '{value}'")
+        weekdays.add(matches[0])
+    return weekdays
+
+
+def expand_occurrences(start_ts, end_ts, rule, max_occurrences):
+    """
+    Expand a recurrence rule into the windows it books.
+
+    The first window is start_ts-end_ts; every occurrence is that window
+    moved by whole days, so stays keep their nights. daily repeats every
+    `interval` days, weekly every `interval` weeks on `weekdays` (by default
+    the first window's weekday); weekdays also filter a daily rule. Dates
+    before the first window's date are never booked, and the series ends
+    at `until` (inclusive) or after `count` occurrences, whichever comes
+    first.
+
+    Parameters:
+    start_ts, end_ts (int): The first window, minutes since the epoch
+    rule (dict): frequency ('daily' or 'weekly'), interval (int, default 1),
+        weekdays (list, optional), until ('YYYY-MM-DD') and/or count (int)
+    max_occurrences (int): Largest series accepted
+
+    Returns:
+    list: (start_ts, end_ts) of each occurrence in date order
+
+    Raises:
+    ValueError: If the rule is malformed, unbounded, too long or its
+        occurrences overlap each other
+    """
+    frequency = str(rule.get('frequency') or '').strip().lower()
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Invalid frequency '{rule.get('frequency')}', expected one of {', '.join(FREQUENCIES)}")
+    interval = int(rule.get('interval') or 1)
+    if interval < 1:
+        raise ValueError("interval must be at least 1")
+    until, count = rule.get('until'), rule.get('count')
+    if not until and not count:
+        raise ValueError("A recurrence needs an until date or a count")
+    count = int(count) if count else None
+    if count is not None and count < 1:
+        raise ValueError("count must be at least 1")
+
+    first = parse_date(from_minutes(start_ts)[0])
+    last = parse_date(until) if until else None
+    if last is not None and last < first:
+        raise ValueError("until must not be before the first occurrence")
+    weekdays = parse_weekdays(rule.get('weekdays') or [])
+    if frequency == "weekly" and not weekdays:
+        weekdays = {first.weekday()}
+
+    if frequency == "weekly":
+        # Weeks are counted from the Monday of the first week
+        anchor = first - timedelta(days=first.weekday())
+        period_of = lambda day: (day - anchor).days // 7
+    else:
+        period_of = lambda day: (day - first).days
+
+    # A rule whose weekdays never line up with its interval must still end
+    horizon = first + timedelta(days=7 * interval * (max_occurrences + 1))
+    occurrences = []
+    day = first
+    while day <= min(last or horizon, horizon) and (count is None or len(occurrences) < count):
+        if period_of(day) % interval == 0 and (not weekdays or day.weekday() in weekdays):
+            if len(occurrences) == max_occurrences:
+                raise ValueError(f"The recurrence has more than {max_occurrences} occurrences")
+            shift = (day - first).days * MINUTES_PER_DAY
+            occurrences.append((start_ts + shift, end_ts + shift))
+        day += timedelta(days=1)
+
+    if not occurrences:
+        raise ValueError("The recurrence does not fall on any date")
+    for (_, previous_end), (next_start, _) in zip(occurrences, occurrences[1:]):
+        if next_start < previous_end:
+            raise ValueError("The booking is longer than the time between its occurrences")
+    return occurrences
+
+
+def reserve_recurring(backend, reservation_data):
+    """
+    Book a room on every occurrence of a daily or weekly series.
+
+    The rule is expanded in memory by expand_occurrences, every occurrence
+    is checked against the room's bookings by one set query and the free
+    ones are inserted, all in one write transaction. By default a single
+    conflict books nothing; skip_conflicts books the free occurrences and
+    reports the others.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to book on
+    reservation_data (dict): The first occurrence in the reserve_room format,
+        the recurrence rule fields and optionally skip_conflicts
+
+    Returns:
+    dict: A dictionary with the status, the ids booked and the conflicting occurrences
+    """
+    try:
+        first = reservation_from_parameters(reservation_data)
+        occurrences = expand_occurrences(
+            first["start_ts"], first["end_ts"], reservation_data, settings.RECURRENCE_MAX_OCCURRENCES
+        )
+        skip_conflicts = parse_flag(reservation_data.get('skip_conflicts'), 'skip_conflicts')
+    except (TypeError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    room_id = first["room_id"]
+
+    room = backend.catalog_room(room_id)
+    if room is None:
+        return {
+            "status": "error",
+            "message": f"Room {room_id} does not exist"
+        }
+
+    rows = []
+    for start_ts, end_ts in occurrences:
+        date, start_time = from_minutes(start_ts)
+        rows.append({
+            **first, "date": date, "start_time": start_time, "end_time": from_minutes(end_ts)[1],
+            "start_ts": start_ts, "end_ts": end_ts
+        })
+
+    try:
+        with backend.connection() as conn, transaction(conn):
+            conflicting = {}
+            for position, reservation_id in conn.execute(
+                RECURRING_CONFLICT_SQL, {"room_id": room_id, "occurrences": json.dumps(occurrences)}
+            ):
+                conflicting.setdefault(position, []).append(reservation_id)
+
+            free = [row for position, row in enumerate(rows) if position not in conflicting]
+            booked = []
+            if free and (skip_conflicts or not conflicting):
+                new_ids = insert_reservations(conn, free)
+                booked = [{**row, "id": reservation_id} for reservation_id, row in zip(new_ids, free)]
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error making recurring reservation: {str(e)}"
+        }
+
+    for reservation in booked:
+        backend.notify_added(reservation)
+
+    conflicts = [
+        {
+            "occurrence": position + 1,
+            "date": rows[position]["date"],
+            "start_time": rows[position]["start_time"],
+            "end_time": rows[position]["end_time"],
+            "check_in": format_minutes(rows[position]["start_ts"]),
+            "check_out": format_minutes(rows[position]["end_ts"]),
+            "conflicting_reservation_ids": reservation_ids
+        }
+        for position, reservation_ids in sorted(conflicting.items())
+    ]
+    result = {
+        "status": "success" if booked or not conflicts else "error",
+        "reservation_ids": [reservation["id"] for reservation in booked],
+        "occurrences": len(rows),
+        "booked": len(booked),
+        "conflicts": conflicts,
+        "details": {
+            "room_id": room_id,
+            "capacity": room.capacity,
+            "features": list(room.features),
+            "guest_name": first["guest_name"],
+            "first_check_in": format_minutes(rows[0]["start_ts"]),
+            "last_check_out": format_minutes(rows[-1]["end_ts"])
+        }
+    }
+    if not conflicts:
+        result["message"] = (f"Room {room_id} reserved for {first['guest_name']} on all {len(rows)} occurrence(s) "
+                             f"from {rows[0]['date']} to {rows[-1]['date']}")
+    elif booked:
+        result["message"] = (f"Room {room_id} reserved for {first['guest_name']} on {len(booked)} of "
+                             f"{len(rows)} occurrence(s); {len(conflicts)} were already taken")
+    else:
+        result["message"] = (f"Room {room_id} is taken on {len(conflicts)} of {len(rows)} occurrence(s); "
+                             f"nothing was reserved")
+    return result
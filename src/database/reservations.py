@@ -0,0 +1,220 @@
+# src/database/reservations.py
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.time_utils import (
+    normalize_window, normalize_range, from_minutes, format_minutes, to_minutes, MINUTES_PER_DAY
+)
+
+# Books the window only if the room exists and nothing overlaps it, in one
+# statement; returns no row when the booking was refused
+RESERVE_SQL = """
+INSERT INTO reservations (room_id, guest_name, date, start_time, end_time, start_ts, end_ts, flexible)
+SELECT :room_id, :guest_name, :date, :start_time, :end_time, :start_ts, :end_ts, :flexible
+WHERE EXISTS (SELECT 1 FROM rooms WHERE id = :room_id)
+AND NOT EXISTS (
+    SELECT 1 FROM reservations
+    WHERE room_id = :room_id AND end_ts > :start_ts AND start_ts < :end_ts
+)
+RETURNING id
+"""
+
+INSERT_RESERVATION_SQL = """
+INSERT INTO reservations (room_id, guest_name, date, start_time, end_time, start_ts, end_ts, flexible)
+VALUES (:room_id, :guest_name, :date, :start_time, :end_time, :start_ts, :end_ts, :flexible)
+"""
+
+
+def _has_window(parameters):
+    """True if the parameters name a same-day window or a check-in/check-out range."""
+    return bool(
+        (parameters.get('check_in') and parameters.get('check_out'))
+        or (parameters.get('date') and parameters.get('start_time') and parameters.get('end_time'))
+    )
+
+
+def parse_flag(value, name):
+    """
+    Read a yes/no option strictly.
+
+    Tool calls and query strings spell booleans as text, and 'False' is a
+    truthy string, so only the spellings below are accepted.
+
+    Parameters:
+    value: True, False, None, 0, 1 or one of 'true', 'false', '1', '0' (any case)
+    name (str): The option, for the error message
+
+    Returns:
+    bool: The flag; None counts as False
+
+    Raises:
+    ValueError: If the value is not one of the accepted spellings
+    """
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in ("true", "1"):
+        return True
+    if text in ("false", "0"):
+        return False
+    raise ValueError(f"Invalid {name} '{value}', expected true or false")
+
+
+def window_from_parameters(parameters):
+    """
+    Resolve the time range of a query or reservation.
+
+    check_in / check_out ('YYYY-MM-DD HH:MM', possibly days apart; a bare date
+    uses the hotel's default check-in / check-out time) take precedence over
+    the same-day date / start_time / end_time form.
+
+    Returns:
+    tuple: (start_ts, end_ts), or None if no range was given
+
+    Raises:
+    ValueError: If the values are malformed
+    """
+    if parameters.get('check_in') and parameters.get('check_out'):
+        return normalize_range(
+            parameters['check_in'], parameters['check_out'],
+            settings.DEFAULT_CHECK_IN_TIME, settings.DEFAULT_CHECK_OUT_TIME
+        )
+    if parameters.get('date') and parameters.get('start_time') and parameters.get('end_time'):
+        return normalize_window(parameters['date'], parameters['start_time'], parameters['end_time'])
+    return None
+
+
+def reservation_from_parameters(reservation_data, room_required=True):
+    """
+    Validate reservation fields and resolve them into the row that gets stored.
+
+    room_required=False accepts a missing room_id (None in the result), for
+    flexible bookings that are given a room afterwards.
+
+    Returns:
+    dict: room_id, guest_name, the canonical date/start_time/end_time, start_ts/end_ts
+        and the flexible flag (0 or 1)
+
+    Raises:
+    ValueError: If a required field is missing or malformed
+    """
+    room_id = reservation_data.get('room_id')
+    guest_name = reservation_data.get('guest_name')
+    if (room_required and not room_id) or not guest_name or not _has_window(reservation_data):
+        raise ValueError("Missing required reservation information")
+    try:
+        room_id = int(room_id) if room_id else None
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid room_id '{room_id}'")
+
+    # Accept any supported date/time spelling, store the canonical one
+    start_ts, end_ts = window_from_parameters(reservation_data)
+    date, start_time = from_minutes(start_ts)
+    return {
+        "room_id": room_id,
+        "guest_name": guest_name,
+        "date": date,
+        "start_time": start_time,
+        "end_time": from_minutes(end_ts)[1],
+        "start_ts": start_ts,
+        "end_ts": end_ts,
+        "flexible": int(parse_flag(reservation_data.get('flexible'), 'flexible'))
+    }
+
+
+def modified_reservation(current, changes):
+    """
+    Apply the fields of a modification to a stored reservation.
+
+    check_in / check_out replace the window. Otherwise date, start_time and
+    end_time default to the stored values, except that a new date on its own
+    moves the whole booking and keeps its length, so a stay keeps its nights.
+
+    Returns:
+    dict: The updated row, in the shape of reservation_from_parameters
+
+    Raises:
+    ValueError: If a changed field is malformed
+    """
+    merged = {
+        'room_id': changes.get('room_id') or current['room_id'],
+        'guest_name': changes.get('guest_name') or current['guest_name'],
+    }
+    if changes.get('check_in') or changes.get('check_out'):
+        merged['check_in'] = changes.get('check_in') or format_minutes(current['start_ts'])
+        merged['check_out'] = changes.get('check_out') or format_minutes(current['end_ts'])
+    elif changes.get('start_time') or changes.get('end_time'):
+        merged['date'] = changes.get('date') or current['date']
+        merged['start_time'] = changes.get('start_time') or current['start_time']
+        merged['end_time'] = changes.get('end_time') or current['end_time']
+    else:
+        start_ts = current['start_ts']
+        if changes.get('date'):
+            start_ts = to_minutes(changes['date'], start_ts % MINUTES_PER_DAY)
+        merged['check_in'] = format_minutes(start_ts)
+        merged['check_out'] = format_minutes(start_ts + current['end_ts'] - current['start_ts'])
+    return reservation_from_parameters(merged)
+
+
+def describe_window(start_ts, end_ts):
+    """Human readable range for confirmation messages."""
+    start_date, start_time = from_minutes(start_ts)
+    end_date, end_time = from_minutes(end_ts)
+    if end_ts - start_ts < MINUTES_PER_DAY and (end_date == start_date or end_time <= start_time):
+        return f"on {start_date} from {start_time} to {end_time}"
+    return f"from {start_date} {start_time} to {end_date} {end_time}"
+
+
+def insert_reservation(conn, reservation):
+    """
+    Insert a reservation unless it overlaps another booking of the room.
+
+    Must run inside a write transaction.
+
+    Returns:
+    int: The new reservation id, or None if the window was taken
+    """
+    row = conn.execute(RESERVE_SQL, reservation).fetchone()
+    return row[0] if row else None
+
+
+def insert_reservations(conn, reservations):
+    """
+    Insert rows already checked for conflicts, with one executemany.
+
+    Must run inside a write transaction.
+
+    Returns:
+    list: The new reservation ids, in the order of the rows
+    """
+    # Under the write lock the new AUTOINCREMENT ids are exactly those above the old maximum
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reservations").fetchone()[0]
+    conn.executemany(INSERT_RESERVATION_SQL, reservations)
+    return [row[0] for row in conn.execute(
+        "SELECT id FROM reservations WHERE id > ? ORDER BY id", (last_id,)
+    )]
+
+
+def reservation_result(reservation, room):
+    """The success dict returned for one booked reservation of a catalog room."""
+    start_ts, end_ts = reservation["start_ts"], reservation["end_ts"]
+    return {
+        "status": "success",
+        "reservation_id": reservation["id"],
+        "message": f"Room {room.id} reserved successfully for {reservation['guest_name']} {describe_window(start_ts, end_ts)}",
+        "details": {
+            "room_id": room.id,
+            "capacity": room.capacity,
+            "features": list(room.features),
+            "guest_name": reservation["guest_name"],
+            "date": reservation["date"],
+            "start_time": reservation["start_time"],
+            "end_time": reservation["end_time"],
+            "check_in": format_minutes(start_ts),
+            "check_out": format_minutes(end_ts)
+        }
+    }
@@ -0,0 +1,172 @@
+# src/database/room_assignment.py
+import os
+import sys
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import transaction
+from database.reservations import window_from_parameters, describe_window, insert_reservation
+from database.time_utils import from_minutes, format_minutes
+
+
+class _RoomTaken(Exception):
+    """Raised inside a transaction to roll back a multi-room booking when one room is taken."""
+
+
+def best_fit_rooms(rooms, headcount, max_rooms=None):
+    """
+    Choose the rooms that seat a group with the least wasted capacity.
+
+    A 0/1 knapsack over capacities: dp[total] is the fewest rooms whose
+    capacities add up to exactly total, for every total up to headcount plus
+    the largest capacity (a smallest cover never exceeds that). The answer
+    is the smallest total >= headcount reachable with at most max_rooms
+    rooms, so ties in waste go to fewer rooms. Rooms of one capacity are
+    interchangeable, and no cover uses more of them than it takes to
+    exceed that bound on its own, so only that many are kept per capacity
+    (lowest ids first); the work is then independent of the hotel size.
+
+    Parameters:
+    rooms (list): Room dicts with id and capacity, e.g. from check_availability
+    headcount (int): Number of guests to seat
+    max_rooms (int): Upper bound on the number of rooms, None for no bound
+
+    Returns:
+    list: The chosen room dicts in id order, or None if no set seats everyone
+    """
+    if headcount < 1:
+        raise ValueError("headcount must be at least 1")
+    by_capacity = defaultdict(list)
+    for room in sorted(rooms, key=lambda room: room["id"]):
+        if room["capacity"] > 0:
+            by_capacity[room["capacity"]].append(room)
+    if not by_capacity:
+        return None
+
+    bound = headcount + max(by_capacity) - 1
+    items = []
+    for capacity, group in sorted(by_capacity.items()):
+        items.extend(group[:bound // capacity + 1])
+
+    unreachable = len(items) + 1
+    fewest = [0] + [unreachable] * bound
+    # improved[i] holds the totals whose best count was last set by item i
+    improved = []
+    for room in items:
+        capacity = room["capacity"]
+        changed = set()
+        for total in range(bound, capacity - 1, -1):
+            if fewest[total - capacity] + 1 < fewest[total]:
+                fewest[total] = fewest[total - capacity] + 1
+                changed.add(total)
+        improved.append(changed)
+
+    limit = len(items) if max_rooms is None else min(max_rooms, len(items))
+    total = next((t for t in range(headcount, bound + 1) if fewest[t] <= limit), None)
+    if total is None:
+        return None
+
+    chosen = []
+    for position in range(len(items) - 1, -1, -1):
+        if total in improved[position]:
+            chosen.append(items[position])
+            total -= items[position]["capacity"]
+            if total == 0:
+                break
+    return sorted(chosen, key=lambda room: room["id"])
+
+
+def reserve_group(backend, group_data):
+    """
+    Book rooms for a whole group in one window, choosing the set that wastes the fewest beds.
+
+    The rooms free in the window are read under the write lock, the set
+    is picked by best_fit_rooms and every reservation is inserted in the
+    same transaction, so the group is either fully booked or not at all.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to book on
+    group_data (dict): guest_name, headcount, the window, and optionally
+        features and max_rooms
+
+    Returns:
+    dict: A dictionary with the status, the rooms booked and the wasted capacity
+    """
+    guest_name = group_data.get('guest_name')
+    headcount = group_data.get('headcount')
+    max_rooms = group_data.get('max_rooms')
+    try:
+        if not guest_name or not headcount:
+            raise ValueError("Missing required group reservation information")
+        headcount = int(headcount)
+        if headcount < 1:
+            raise ValueError("headcount must be at least 1")
+        max_rooms = int(max_rooms) if max_rooms is not None else None
+        window = window_from_parameters(group_data)
+        if window is None:
+            raise ValueError("Missing required group reservation information")
+    except (TypeError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    required_features = group_data.get('features') or []
+    date, start_time = from_minutes(window[0])
+    row = {
+        "guest_name": guest_name, "date": date, "start_time": start_time, "end_time": from_minutes(window[1])[1],
+        "start_ts": window[0], "end_ts": window[1], "flexible": 0
+    }
+
+    try:
+        with backend.connection() as conn, transaction(conn):
+            free_rooms = backend.available_rooms(1, required_features, window)
+            chosen = best_fit_rooms(free_rooms, headcount, max_rooms)
+            if chosen is None:
+                return {
+                    "status": "error",
+                    "message": f"Not enough free rooms for {headcount} guests {describe_window(*window)}: "
+                               f"{len(free_rooms)} matching rooms with {sum(room['capacity'] for room in free_rooms)} "
+                               f"beds in total" + (f" (at most {max_rooms} rooms)" if max_rooms else "")
+                }
+            booked = []
+            for room in chosen:
+                reservation = {**row, "room_id": room["id"]}
+                reservation_id = insert_reservation(conn, reservation)
+                if reservation_id is None:
+                    # A booking committed since the in-memory engines last heard of it
+                    raise _RoomTaken(room["id"])
+                booked.append({**reservation, "id": reservation_id})
+    except _RoomTaken as e:
+        return {
+            "status": "error",
+            "message": f"Room {e.args[0]} was just booked by someone else; no rooms were reserved, please try again"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error making group reservation: {str(e)}"
+        }
+
+    for reservation in booked:
+        backend.notify_added(reservation)
+
+    total_capacity = sum(room["capacity"] for room in chosen)
+    return {
+        "status": "success",
+        "reservation_ids": [reservation["id"] for reservation in booked],
+        "message": f"{len(chosen)} room(s) reserved for {guest_name} ({headcount} guests) {describe_window(*window)}",
+        "rooms": [
+            {**room, "reservation_id": reservation["id"]} for room, reservation in zip(chosen, booked)
+        ],
+        "total_capacity": total_capacity,
+        "wasted_capacity": total_capacity - headcount,
+        "details": {
+            "guest_name": guest_name,
+            "headcount": headcount,
+            "date": row["date"],
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+            "check_in": format_minutes(window[0]),
+            "check_out": format_minutes(window[1])
+        }
+    }
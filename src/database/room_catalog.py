@@ -0,0 +1,45 @@
+# src/database/room_catalog.py
+import json
+from collections import namedtuple
+
+
+Room = namedtuple("Room", ["id", "capacity", "features", "feature_set"])
+
+
+class RoomCatalog:
+    """
+    Decoded snapshot of the rooms table.
+
+    Rooms change far less often than reservations, so the JSON features are
+    decoded once here and shared by every query instead of per row.
+    """
+
+    def __init__(self, rooms):
+        self.rooms = sorted(rooms, key=lambda room: room.id)
+        self.by_id = {room.id: room for room in self.rooms}
+
+    @classmethod
+    def load(cls, conn):
+        """Read every room from the database."""
+        rooms = []
+        for room_id, capacity, features_json in conn.execute("SELECT id, capacity, features FROM rooms"):
+            features = tuple(json.loads(features_json)) if features_json else ()
+            rooms.append(Room(room_id, capacity, features, frozenset(features)))
+        return cls(rooms)
+
+    def get(self, room_id):
+        """Return the room with this id, or None."""
+        return self.by_id.get(room_id)
+
+    def matching(self, min_capacity=1, required_features=None):
+        """Rooms with at least min_capacity that offer every required feature, by id."""
+        required = frozenset(required_features or ())
+        return [
+            room for room in self.rooms
+            if room.capacity >= min_capacity and required <= room.feature_set
+        ]
+
+    @staticmethod
+    def as_dict(room):
+        """The room in the shape returned by check_availability."""
+        return {"id": room.id, "capacity": room.capacity, "features": list(room.features)}
@@ -0,0 +1,499 @@
+# src/database/room_optimizer.py
+import os
+import sys
+import random
+import sqlite3
+import argparse
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.availability_index import RoomIntervals
+from database.connection import transaction
+from database.reservations import (
+    reservation_from_parameters, parse_flag, describe_window, insert_reservation, reservation_result
+)
+from database.time_utils import parse_datetime, to_minutes, format_minutes, MINUTES_PER_DAY
+
+
+def _neighbour_gaps(intervals, start_ts, end_ts, horizon):
+    """Free minutes between a window and the room's previous and next bookings, each capped at horizon."""
+    before = after = horizon
+    if intervals is not None and len(intervals):
+        count = bisect_right(intervals.starts, start_ts)
+        if count:
+            before = min(start_ts - intervals.max_end[count - 1], horizon)
+        position = bisect_left(intervals.starts, end_ts)
+        if position < len(intervals):
+            after = min(intervals.starts[position] - end_ts, horizon)
+    return before, after
+
+
+def placement_cost(intervals, start_ts, end_ts, min_gap, horizon):
+    """
+    Idle time a booking would leave next to a room's other bookings.
+
+    Gaps shorter than min_gap cannot be sold again and count as stranded;
+    the idle total is the gap before plus the gap after, each capped at
+    horizon. A booking that fits snugly between two others costs (0, 0).
+
+    Parameters:
+    intervals (RoomIntervals): The room's bookings, none overlapping the window (None for none)
+    start_ts, end_ts (int): The window to place
+    min_gap (int): Shortest gap, in minutes, that can still be booked
+    horizon (int): Gaps are capped at this many minutes
+
+    Returns:
+    tuple: (stranded minutes, idle minutes)
+    """
+    before, after = _neighbour_gaps(intervals, start_ts, end_ts, horizon)
+    stranded = sum(gap for gap in (before, after) if 0 < gap < min_gap)
+    return stranded, before + after
+
+
+def equivalent_rooms(catalog, room, limit=None):
+    """
+    Rooms a booking of `room` may move to: the same capacity and at least its features.
+
+    The closest matches (fewest extra features) come first, so flexible
+    bookings do not use up the better-equipped rooms; the room itself is
+    always included.
+    """
+    rooms = sorted(
+        (other for other in catalog.rooms if other.capacity == room.capacity and room.feature_set <= other.feature_set),
+        key=lambda other: (other.id != room.id, len(other.feature_set), other.id)
+    )
+    return rooms[:limit] if limit else rooms
+
+
+def fragmentation(busy, room_ids, span_start, span_end, min_gap, probe_minutes):
+    """
+    Measure how fragmented the free time of some rooms is over a span.
+
+    Parameters:
+    busy (dict): room_id -> (start_ts, end_ts) bookings
+    room_ids (iterable): Rooms to measure
+    span_start, span_end (int): The span, minutes since the epoch
+    min_gap (int): Gaps between two bookings shorter than this are stranded
+    probe_minutes (int): Length of the standard booking counted in bookable_slots
+
+    Returns:
+    dict: stranded_minutes, and bookable_slots, the number of probe_minutes
+        bookings that still fit in the free time
+    """
+    stranded = slots = 0
+    for room_id in room_ids:
+        cursor, after_booking = span_start, False
+        for start_ts, end_ts in sorted(busy.get(room_id, ())):
+            if end_ts <= span_start:
+                continue
+            if start_ts >= span_end:
+                break
+            gap = start_ts - cursor
+            if gap > 0:
+                if after_booking and gap < min_gap:
+                    stranded += gap
+                slots += gap // probe_minutes
+            cursor, after_booking = max(cursor, end_ts), True
+        if span_end > cursor:
+            slots += (span_end - cursor) // probe_minutes
+    return {"stranded_minutes": stranded, "bookable_slots": slots}
+
+
+def _stranded(gap, min_gap):
+    return gap if 0 < gap < min_gap else 0
+
+
+def _move_delta(source, target, start_ts, end_ts, min_gap, probe_minutes, horizon):
+    """
+    What moving a booking from source to target changes: (stranded minutes, bookable slots, sum of squared gaps).
+
+    Taking the booking out of source merges the gaps around it; putting it
+    in target splits the gap it lands in. Squared gaps grow as free time
+    gathers into long blocks, so they rise most when a booking leaves the
+    middle of a wide gap for a snug one.
+    """
+    length = end_ts - start_ts
+    before, after = _neighbour_gaps(source, start_ts, end_ts, horizon)
+    merged = min(before + length + after, horizon)
+    target_before, target_after = _neighbour_gaps(target, start_ts, end_ts, horizon)
+    split = min(target_before + length + target_after, horizon)
+    removed, added = (before, after, split), (merged, target_before, target_after)
+
+    def change(measure):
+        return sum(measure(gap) for gap in added) - sum(measure(gap) for gap in removed)
+
+    return (
+        change(lambda gap: _stranded(gap, min_gap)),
+        change(lambda gap: gap // probe_minutes),
+        change(lambda gap: gap * gap),
+    )
+
+
+def reassign(catalog, fixed, movable, min_gap, probe_minutes, horizon, candidates_per_booking=None, max_passes=5):
+    """
+    Move bookings between equivalent rooms to consolidate free time.
+
+    A best-fit local search over the current assignment: each movable
+    booking, in start order, moves to the free equivalent room where it
+    fits best, if that beats staying. A move may not strand more time or
+    lose a bookable probe_minutes slot; among the rest, fewer stranded
+    minutes, then more slots, then longer free blocks win. Every move keeps
+    the assignment conflict free and strictly improves it, so the search
+    ends; it stops after max_passes passes or a pass without moves.
+
+    Parameters:
+    catalog (RoomCatalog): The rooms
+    fixed (dict): room_id -> (start_ts, end_ts) bookings that must not move
+    movable (list): Dicts with id, room_id, start_ts and end_ts
+    min_gap, horizon (int): As for placement_cost
+    probe_minutes (int): Length of the standard booking, as for fragmentation
+    candidates_per_booking (int): Consider at most this many equivalent rooms per booking
+
+    Returns:
+    dict: reservation_id -> room_id for every movable booking
+    """
+    occupied = {}
+
+    def room_intervals(room_id):
+        intervals = occupied.get(room_id)
+        if intervals is None:
+            intervals = occupied[room_id] = RoomIntervals()
+        return intervals
+
+    for room_id, spans in fixed.items():
+        for start_ts, end_ts in spans:
+            room_intervals(room_id).add(None, start_ts, end_ts)
+    assignment = {}
+    for reservation in movable:
+        assignment[reservation["id"]] = reservation["room_id"]
+        room_intervals(reservation["room_id"]).add(reservation["id"], reservation["start_ts"], reservation["end_ts"])
+
+    classes = {}
+    ordered = sorted(movable, key=lambda r: (r["start_ts"], r["id"]))
+    for _ in range(max_passes):
+        moved = False
+        for reservation in ordered:
+            reservation_id, start_ts, end_ts = reservation["id"], reservation["start_ts"], reservation["end_ts"]
+            original = reservation["room_id"]
+            if original not in classes:
+                classes[original] = equivalent_rooms(catalog, catalog.get(original), candidates_per_booking)
+
+            current = assignment[reservation_id]
+            source = room_intervals(current)
+            source.remove(reservation_id)
+            best = ((0, 0, 0), current)
+            for candidate in classes[original]:
+                if candidate.id == current:
+                    continue
+                target = occupied.get(candidate.id)
+                if target is not None and target.overlaps(start_ts, end_ts):
+                    continue
+                stranded, slots, squares = _move_delta(source, target, start_ts, end_ts, min_gap, probe_minutes, horizon)
+                if stranded > 0 or slots < 0:
+                    continue
+                if (stranded, -slots, -squares) < best[0]:
+                    best = ((stranded, -slots, -squares), candidate.id)
+            room_intervals(best[1]).add(reservation_id, start_ts, end_ts)
+            if best[1] != current:
+                assignment[reservation_id] = best[1]
+                moved = True
+        if not moved:
+            break
+    return assignment
+
+
+def _flexible_candidates(backend, reservation, min_capacity, required_features):
+    """Free rooms a flexible booking may take, closest matches first; None if the named room does not exist."""
+    window = (reservation["start_ts"], reservation["end_ts"])
+    limit = settings.ROOM_OPTIMIZER_CANDIDATES
+    if reservation["room_id"] is not None:
+        # Any free room equivalent to the one asked for
+        room = backend.catalog_room(reservation["room_id"])
+        if room is None:
+            return None
+        free_ids = {free_room["id"] for free_room in backend.available_rooms(room.capacity, room.features, window)}
+        return [other for other in equivalent_rooms(backend.room_catalog(), room) if other.id in free_ids][:limit]
+
+    catalog = backend.room_catalog()
+    free = [
+        catalog.get(free_room["id"])
+        for free_room in backend.available_rooms(min_capacity, required_features, window)
+    ]
+    # The smallest rooms that fit, with the fewest features beyond those asked for
+    return sorted(free, key=lambda room: (room.capacity, len(room.feature_set), room.id))[:limit]
+
+
+def reserve_flexible(backend, reservation_data):
+    """
+    Book whichever equivalent room the window fits best.
+
+    The booking goes to the free room (equivalent to room_id, or matching
+    capacity and features when no room is named) where it leaves the
+    least stranded and idle time next to that room's other bookings, and
+    is stored as flexible so the optimizer may move it later.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to book on
+    reservation_data (dict): The reserve_room fields; room_id is optional
+        when capacity and features describe the room
+
+    Returns:
+    dict: A dictionary with the status and details of the reservation
+    """
+    try:
+        reservation = reservation_from_parameters({**reservation_data, 'flexible': True}, room_required=False)
+        capacity = int(reservation_data.get('capacity') or 1)
+    except (TypeError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    candidates = _flexible_candidates(backend, reservation, capacity, reservation_data.get('features') or [])
+    if candidates is None:
+        return {
+            "status": "error",
+            "message": f"Room {reservation['room_id']} does not exist"
+        }
+
+    start_ts, end_ts = reservation["start_ts"], reservation["end_ts"]
+    horizon = MINUTES_PER_DAY
+    busy = backend.busy_intervals([room.id for room in candidates], start_ts - horizon, end_ts + horizon)
+    ranked = []
+    for room in candidates:
+        intervals = RoomIntervals()
+        for busy_start, busy_end in busy.get(room.id, ()):
+            intervals.append(None, busy_start, busy_end)
+        cost = placement_cost(
+            intervals, start_ts, end_ts, settings.ROOM_OPTIMIZER_MIN_GAP_MINUTES, horizon
+        )
+        ranked.append((cost, room.id != reservation["room_id"], room))
+    ranked.sort(key=lambda entry: (entry[0], entry[1], entry[2].id))
+
+    try:
+        with backend.connection() as conn, transaction(conn):
+            # The insert re-checks each room, in case one was booked since the scan
+            for _, _, room in ranked:
+                reservation_id = insert_reservation(conn, {**reservation, "room_id": room.id})
+                if reservation_id is not None:
+                    break
+            else:
+                room = None
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error making reservation: {str(e)}"
+        }
+
+    if room is None:
+        return {
+            "status": "error",
+            "message": f"No matching room is available {describe_window(start_ts, end_ts)}"
+        }
+    reservation = {**reservation, "room_id": room.id, "id": reservation_id}
+    backend.notify_added(reservation)
+    return reservation_result(reservation, room)
+
+
+def optimize_room_assignment(backend, options=None):
+    """
+    Re-pack flexible reservations into equivalent rooms to reduce idle gaps.
+
+    Flexible bookings checking in between `from` and `until` are moved by
+    reassign while every other booking stays put. The plan is only applied
+    if it strands no more time and leaves no fewer bookable slots than the
+    current assignment. Reading, planning and updating happen in one write
+    transaction.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to optimize
+    options (dict):
+        - from (str): First check-in to consider, 'YYYY-MM-DD HH:MM' (default: now)
+        - until (str): Last check-in to consider (default: ROOM_OPTIMIZER_HORIZON_DAYS later)
+        - dry_run (bool): Report the moves without applying them
+        - min_gap_minutes, probe_minutes (int): Override the settings of the same name
+
+    Returns:
+    dict: Moves made and the stranded minutes / bookable slots before and after
+    """
+    options = options or {}
+    try:
+        from_ts = parse_datetime(options.get('from') or datetime.now(), "00:00")
+        until_ts = (
+            parse_datetime(options['until'], "00:00") if options.get('until')
+            else from_ts + settings.ROOM_OPTIMIZER_HORIZON_DAYS * MINUTES_PER_DAY
+        )
+        min_gap = int(options.get('min_gap_minutes') or settings.ROOM_OPTIMIZER_MIN_GAP_MINUTES)
+        probe = int(options.get('probe_minutes') or settings.ROOM_OPTIMIZER_PROBE_MINUTES)
+        dry_run = parse_flag(options.get('dry_run'), 'dry_run')
+    except (TypeError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+    if until_ts <= from_ts:
+        return {
+            "status": "error",
+            "message": "until must be after from"
+        }
+    horizon = MINUTES_PER_DAY
+    catalog = backend.room_catalog()
+
+    try:
+        with backend.connection() as conn, transaction(conn):
+            movable = [
+                {"id": reservation_id, "room_id": room_id, "date": date, "start_ts": start_ts, "end_ts": end_ts}
+                for reservation_id, room_id, date, start_ts, end_ts in conn.execute(
+                    "SELECT id, room_id, date, start_ts, end_ts FROM reservations "
+                    "WHERE flexible = 1 AND start_ts >= ? AND start_ts < ?", (from_ts, until_ts)
+                )
+                if catalog.get(room_id) is not None
+            ]
+            movable_ids = {reservation["id"] for reservation in movable}
+            span_end = max([until_ts] + [reservation["end_ts"] for reservation in movable])
+
+            current, fixed = {}, {}
+            for reservation_id, room_id, start_ts, end_ts in conn.execute(
+                "SELECT id, room_id, start_ts, end_ts FROM reservations WHERE end_ts > ? AND start_ts < ?",
+                (from_ts - horizon, span_end + horizon)
+            ):
+                current.setdefault(room_id, []).append((start_ts, end_ts))
+                if reservation_id not in movable_ids:
+                    fixed.setdefault(room_id, []).append((start_ts, end_ts))
+
+            assignment = reassign(
+                catalog, fixed, movable, min_gap, probe, horizon, settings.ROOM_OPTIMIZER_CANDIDATES
+            )
+
+            planned = {room_id: list(spans) for room_id, spans in fixed.items()}
+            for reservation in movable:
+                planned.setdefault(assignment[reservation["id"]], []).append((reservation["start_ts"], reservation["end_ts"]))
+            room_ids = [room.id for room in catalog.rooms]
+            before = fragmentation(current, room_ids, from_ts, until_ts, min_gap, probe)
+            after = fragmentation(planned, room_ids, from_ts, until_ts, min_gap, probe)
+
+            moves = [
+                (reservation, assignment[reservation["id"]]) for reservation in movable
+                if assignment[reservation["id"]] != reservation["room_id"]
+            ]
+            improved = (after["stranded_minutes"] <= before["stranded_minutes"]
+                        and after["bookable_slots"] >= before["bookable_slots"])
+            if not improved:
+                moves, after = [], before
+            if moves and not dry_run:
+                conn.executemany(
+                    "UPDATE reservations SET room_id = ? WHERE id = ?",
+                    [(room_id, reservation["id"]) for reservation, room_id in moves]
+                )
+    except sqlite3.Error as e:
+        return {
+            "status": "error",
+            "message": f"Error optimizing room assignment: {str(e)}"
+        }
+
+    if not dry_run:
+        for reservation, room_id in moves:
+            backend.notify_removed(reservation)
+            backend.notify_added({**reservation, "room_id": room_id})
+
+    verb = "Would move" if dry_run else "Moved"
+    return {
+        "status": "success",
+        "dry_run": dry_run,
+        "message": f"{verb} {len(moves)} of {len(movable)} flexible reservation(s)"
+                   + ("" if improved else "; the re-assignment did not reduce fragmentation"),
+        "from": format_minutes(from_ts),
+        "until": format_minutes(until_ts),
+        "movable": len(movable),
+        "moved": len(moves),
+        "moves": [
+            {"reservation_id": reservation["id"], "from_room": reservation["room_id"], "to_room": room_id}
+            for reservation, room_id in moves
+        ],
+        "min_gap_minutes": min_gap,
+        "probe_minutes": probe,
+        "before": before,
+        "after": after,
+        "recovered_stranded_minutes": before["stranded_minutes"] - after["stranded_minutes"],
+        "recovered_slots": after["bookable_slots"] - before["bookable_slots"],
+    }
+
+
+def report(rooms=300, days=28, flexible_share=0.5, occupancy=0.6, seed=0, min_gap=None, probe_minutes=None):
+    """
+    Generate a synthetic hotel, mark a share of its bookings flexible and measure a re-optimization.
+
+    Returns:
+    dict: The optimize_room_assignment report for the whole generated span
+    """
+    from database.backends import MemorySQLiteBackend
+    from database.generate_dataset import populate
+
+    start_date = "2030-01-01"
+    backend = MemorySQLiteBackend(cache=False)
+    try:
+        with backend.connection() as conn:
+            populate(conn, rooms=rooms, days=days, start_date=start_date, occupancy=occupancy, seed=seed)
+            rng = random.Random(seed)
+            ids = [row[0] for row in conn.execute("SELECT id FROM reservations ORDER BY id")]
+            conn.executemany(
+                "UPDATE reservations SET flexible = 1 WHERE id = ?",
+                [(reservation_id,) for reservation_id in ids if rng.random() < flexible_share]
+            )
+            conn.commit()
+        start_ts = to_minutes(start_date, 0)
+        return backend.optimize_room_assignment({
+            "from": format_minutes(start_ts),
+            "until": format_minutes(start_ts + days * MINUTES_PER_DAY),
+            "min_gap_minutes": min_gap,
+            "probe_minutes": probe_minutes,
+        })
+    finally:
+        backend.close()
+
+
+def _print_report(result):
+    if result["status"] != "success":
+        print(result["message"])
+        return
+    before, after = result["before"], result["after"]
+    print(f"{result['message']} (span {result['from']} to {result['until']})")
+    print(f"    flexible bookings:   {result['movable']}, moved {result['moved']}")
+    print(f"    stranded minutes:    {before['stranded_minutes']} -> {after['stranded_minutes']}")
+    print(f"    bookable {result['probe_minutes']}-minute slots: {before['bookable_slots']} -> {after['bookable_slots']} "
+          f"({result['recovered_slots']:+d})")
+
+
+def main():
+    from database.backends import get_backend
+
+    parser = argparse.ArgumentParser(description="Re-pack flexible reservations to reduce idle gaps")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run = subcommands.add_parser("run", help="optimize the configured database")
+    run.add_argument("--from", dest="start", help="first check-in to consider, 'YYYY-MM-DD HH:MM' (default: now)")
+    run.add_argument("--until", help="last check-in to consider (default: ROOM_OPTIMIZER_HORIZON_DAYS later)")
+    run.add_argument("--dry-run", action="store_true", help="report the moves without applying them")
+
+    generated = subcommands.add_parser("report", help="measure the optimizer on a generated dataset")
+    generated.add_argument("--rooms", type=int, default=300)
+    generated.add_argument("--days", type=int, default=28)
+    generated.add_argument("--flexible-share", type=float, default=0.5)
+    generated.add_argument("--occupancy", type=float, default=0.6)
+    generated.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        result = get_backend().optimize_room_assignment({
+            "from": args.start, "until": args.until, "dry_run": args.dry_run
+        })
+    else:
+        result = report(args.rooms, args.days, args.flexible_share, args.occupancy, args.seed)
+    _print_report(result)
+    if result["status"] != "success":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# src/database/slot_bitmap.py
+import threading
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for AVAILABILITY_ENGINE=bitmap
+    np = None
+
+from database.time_utils import MINUTES_PER_DAY
+
+
+class SlotBitmapEngine:
+    """
+    Occupancy of every room as NumPy boolean arrays of fixed-size time slots.
+
+    Each day with bookings is a (rooms x slots-per-day) array. A booking marks
+    every slot it touches, so windows that are not slot-aligned are answered
+    conservatively: a room sharing a partial slot with a booking counts as
+    busy. Availability for many windows is then a prefix sum over the
+    occupancy plus vectorized capacity and feature masks, with no Python loop
+    over rooms.
+
+    The engine covers the rooms of the catalog it was built from and the days
+    from horizon_day onward; covers() tells the caller when to fall back to
+    another engine. It registers as a ReservationListener for write-through.
+    """
+
+    def __init__(self, catalog, slot_minutes=5, horizon_day=None):
+        if np is None:
+            raise ImportError("The slot bitmap engine requires numpy (pip install numpy)")
+        if MINUTES_PER_DAY % slot_minutes:
+            raise ValueError("slot_minutes must divide a day evenly")
+
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = MINUTES_PER_DAY // slot_minutes
+        self.horizon_day = horizon_day
+
+        self.room_ids = np.array([room.id for room in catalog.rooms], dtype=np.int64)
+        self.capacities = np.array([room.capacity for room in catalog.rooms], dtype=np.int64)
+        self._row = {room.id: row for row, room in enumerate(catalog.rooms)}
+
+        vocabulary = sorted({feature for room in catalog.rooms for feature in room.features})
+        self._feature_column = {feature: column for column, feature in enumerate(vocabulary)}
+        self.features = np.zeros((len(catalog.rooms), len(vocabulary)), dtype=bool)
+        for row, room in enumerate(catalog.rooms):
+            for feature in room.features:
+                self.features[row, self._feature_column[feature]] = True
+
+        self._days = {}
+        self._bookings = defaultdict(dict)   # room_id -> {reservation_id: (start_ts, end_ts)}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, conn, catalog, slot_minutes=5, horizon_day=None):
+        """Build the occupancy arrays from the reservations table."""
+        engine = cls(catalog, slot_minutes, horizon_day)
+        query = "SELECT id, room_id, start_ts, end_ts FROM reservations WHERE start_ts IS NOT NULL"
+        params = ()
+        if horizon_day is not None:
+            query += " AND end_ts > ?"
+            params = (horizon_day * MINUTES_PER_DAY,)
+        for reservation_id, room_id, start_ts, end_ts in conn.execute(query, params):
+            engine._add(reservation_id, room_id, start_ts, end_ts)
+        return engine
+
+    def _slot_range(self, start_ts, end_ts):
+        """Global slot numbers [first, last) touched by a window."""
+        return start_ts // self.slot_minutes, -(-end_ts // self.slot_minutes)
+
+    def _day_array(self, day):
+        array = self._days.get(day)
+        if array is None:
+            array = self._days[day] = np.zeros((len(self.room_ids), self.slots_per_day), dtype=bool)
+        return array
+
+    def _mark(self, row, start_ts, end_ts):
+        first, last = self._slot_range(start_ts, end_ts)
+        for day in range(first // self.slots_per_day, (last - 1) // self.slots_per_day + 1):
+            if self.horizon_day is not None and day < self.horizon_day:
+                continue
+            offset = day * self.slots_per_day
+            self._day_array(day)[row, max(first - offset, 0):min(last - offset, self.slots_per_day)] = True
+
+    def _add(self, reservation_id, room_id, start_ts, end_ts):
+        row = self._row.get(room_id)
+        if row is None:
+            return
+        self._bookings[room_id][reservation_id] = (start_ts, end_ts)
+        self._mark(row, start_ts, end_ts)
+
+    def covers(self, start_ts):
+        """True if windows starting at start_ts are inside the loaded horizon."""
+        return self.horizon_day is None or start_ts // MINUTES_PER_DAY >= self.horizon_day
+
+    def room_mask(self, min_capacity=1, required_features=None):
+        """Boolean mask of rooms meeting the capacity and feature requirements."""
+        mask = self.capacities >= min_capacity
+        for feature in set(required_features or ()):
+            column = self._feature_column.get(feature)
+            if column is None:
+                return np.zeros(len(self.room_ids), dtype=bool)
+            mask &= self.features[:, column]
+        return mask
+
+    def free_matrix(self, windows, min_capacity=1, required_features=None):
+        """
+        Availability of every room for every window.
+
+        Parameters:
+        windows (list): (start_ts, end_ts) tuples
+        min_capacity (int): Minimum capacity required
+        required_features (list): Features every room must offer
+
+        Returns:
+        numpy.ndarray: Boolean matrix (rooms x windows), rows ordered as room_ids
+        """
+        free = np.zeros((len(self.room_ids), len(windows)), dtype=bool)
+        eligible = self.room_mask(min_capacity, required_features)
+        if not windows or not eligible.any():
+            return free
+
+        # Windows covering the same days share one prefix sum over those days
+        groups = defaultdict(list)
+        for column, (start_ts, end_ts) in enumerate(windows):
+            first, last = self._slot_range(start_ts, end_ts)
+            groups[(first // self.slots_per_day, (last - 1) // self.slots_per_day)].append((column, first, last))
+
+        with self._lock:
+            for (first_day, last_day), members in groups.items():
+                empty = np.zeros((len(self.room_ids), self.slots_per_day), dtype=bool)
+                timeline = np.concatenate(
+                    [self._days.get(day, empty) for day in range(first_day, last_day + 1)], axis=1
+                )
+                busy_prefix = np.zeros((len(self.room_ids), timeline.shape[1] + 1), dtype=np.int32)
+                np.cumsum(timeline, axis=1, out=busy_prefix[:, 1:])
+
+                origin = first_day * self.slots_per_day
+                columns = [column for column, _, _ in members]
+                lows = np.array([first - origin for _, first, _ in members])
+                highs = np.array([last - origin for _, _, last in members])
+                free[:, columns] = (busy_prefix[:, highs] - busy_prefix[:, lows]) == 0
+
+        free &= eligible[:, None]
+        return free
+
+    def free_room_ids(self, start_ts, end_ts, min_capacity=1, required_features=None):
+        """Ids of the rooms free for one window, in id order."""
+        free = self.free_matrix([(start_ts, end_ts)], min_capacity, required_features)[:, 0]
+        return self.room_ids[free].tolist()
+
+    # Write-through listener interface
+
+    def reservation_added(self, reservation):
+        with self._lock:
+            self._add(reservation["id"], reservation["room_id"], reservation["start_ts"], reservation["end_ts"])
+
+    def reservation_removed(self, reservation):
+        room_id = reservation["room_id"]
+        with self._lock:
+            window = self._bookings[room_id].pop(reservation["id"], None)
+            row = self._row.get(room_id)
+            if window is None or row is None:
+                return
+
+            # Clear the slots of the removed booking, then repaint any other
+            # booking of the room that shares those days
+            first, last = self._slot_range(*window)
+            first_day, last_day = first // self.slots_per_day, (last - 1) // self.slots_per_day
+            for day in range(first_day, last_day + 1):
+                if day in self._days:
+                    self._days[day][row, :] = False
+            for start_ts, end_ts in self._bookings[room_id].values():
+                other_first, other_last = self._slot_range(start_ts, end_ts)
+                if other_first // self.slots_per_day <= last_day and (other_last - 1) // self.slots_per_day >= first_day:
+                    self._mark(row, start_ts, end_ts)
+
+    def reservations_archived(self, before_ts):
+        # Days entirely before the cutoff are dropped; the cutoff's own day keeps
+        # its slots, which is conservative for the archived part of it
+        cutoff_day = before_ts // MINUTES_PER_DAY
+        with self._lock:
+            for bookings in self._bookings.values():
+                for reservation_id in [rid for rid, (_, end_ts) in bookings.items() if end_ts <= before_ts]:
+                    del bookings[reservation_id]
+            for day in [day for day in self._days if day < cutoff_day]:
+                del self._days[day]
+            # Repaint the early days of bookings that survive across the cutoff
+            for room_id, bookings in self._bookings.items():
+                row = self._row.get(room_id)
+                for start_ts, end_ts in bookings.values():
+                    if row is not None and start_ts < cutoff_day * MINUTES_PER_DAY:
+                        self._mark(row, start_ts, end_ts)
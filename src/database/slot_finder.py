@@ -0,0 +1,119 @@
+# src/database/slot_finder.py
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from database.room_catalog import RoomCatalog
+from database.time_utils import parse_datetime, format_minutes, MINUTES_PER_DAY
+
+
+def free_windows(busy, search_start, search_end, duration, count, step=1):
+    """
+    Scan one room's bookings for the earliest free windows of a given length.
+
+    busy must be sorted by start; overlapping intervals are allowed. Each
+    gap between bookings that can hold the duration contributes one window,
+    starting as early as the gap allows (rounded up to a multiple of step),
+    so the windows returned are distinct openings rather than shifts of one.
+
+    Parameters:
+    busy (iterable): (start_ts, end_ts) intervals sorted by start_ts
+    search_start (int): Earliest allowed window start, minutes since the epoch
+    search_end (int): Latest allowed window end
+    duration (int): Window length in minutes
+    count (int): Maximum number of windows to return
+    step (int): Window starts are multiples of this many minutes
+
+    Returns:
+    list: (start_ts, end_ts, free_until) tuples; free_until is where the gap ends
+    """
+    windows = []
+    cursor = search_start
+    for start_ts, end_ts in busy:
+        if len(windows) >= count or cursor >= search_end:
+            break
+        if end_ts <= cursor:
+            continue
+        _add_window(windows, cursor, min(start_ts, search_end), duration, step)
+        cursor = max(cursor, end_ts)
+    if len(windows) < count and cursor < search_end:
+        _add_window(windows, cursor, search_end, duration, step)
+    return windows[:count]
+
+
+def _add_window(windows, gap_start, gap_end, duration, step):
+    start_ts = -(-gap_start // step) * step
+    if start_ts + duration <= gap_end:
+        windows.append((start_ts, start_ts + duration, gap_end))
+
+
+def find_next_available(backend, query_parameters):
+    """
+    Find the earliest free windows of a given length, per matching room.
+
+    All bookings in the search span are read once, sorted by room and
+    start, and each room's gaps are scanned in a single pass, instead of
+    probing candidate windows one check_availability call at a time.
+
+    Parameters:
+    backend (SQLiteBackend): The backend to search
+    query_parameters (dict): duration_minutes, capacity, features, search_from,
+        search_until or horizon_days, windows_per_room and max_rooms
+
+    Returns:
+    list: Rooms (id, capacity, features) with their windows, ordered by
+          the earliest window, at most max_rooms of them
+
+    Raises:
+    ValueError: If the duration or search span is invalid
+    """
+    try:
+        duration = int(query_parameters.get('duration_minutes') or 0)
+    except (TypeError, ValueError):
+        raise ValueError("duration_minutes must be a whole number of minutes")
+    if duration <= 0:
+        raise ValueError("duration_minutes must be positive")
+
+    step = settings.NEXT_AVAILABLE_STEP_MINUTES
+    if query_parameters.get('search_from'):
+        search_start = parse_datetime(query_parameters['search_from'], "00:00")
+    else:
+        search_start = parse_datetime(datetime.now())
+    if query_parameters.get('search_until'):
+        search_end = parse_datetime(query_parameters['search_until'], "24:00")
+    else:
+        horizon_days = int(query_parameters.get('horizon_days') or settings.NEXT_AVAILABLE_HORIZON_DAYS)
+        search_end = search_start + horizon_days * MINUTES_PER_DAY
+    if search_end - search_start < duration:
+        raise ValueError("The search span is shorter than the requested duration")
+
+    windows_per_room = int(query_parameters.get('windows_per_room') or 3)
+    max_rooms = int(query_parameters.get('max_rooms') or 5)
+    rooms = backend.room_catalog().matching(
+        query_parameters.get('capacity', 1), query_parameters.get('features', [])
+    )
+    busy = backend.busy_intervals([room.id for room in rooms], search_start, search_end)
+
+    found = []
+    for room in rooms:
+        windows = free_windows(busy.get(room.id, ()), search_start, search_end, duration, windows_per_room, step)
+        if windows:
+            found.append((windows[0][0], room.id, room, windows))
+    found.sort(key=lambda entry: entry[:2])
+
+    return [
+        {
+            **RoomCatalog.as_dict(room),
+            "windows": [
+                {
+                    "check_in": format_minutes(start_ts),
+                    "check_out": format_minutes(end_ts),
+                    "free_until": format_minutes(free_until)
+                }
+                for start_ts, end_ts, free_until in windows
+            ]
+        }
+        for _, _, room, windows in found[:max_rooms]
+    ]
@@ -0,0 +1,143 @@
+# src/database/time_utils.py
+from datetime import date as date_type, datetime, timedelta
+
+# Reservations are stored as minutes since 1970-01-01 00:00 (naive hotel-local time)
+MINUTES_PER_DAY = 24 * 60
+EPOCH_ORDINAL = date_type(1970, 1, 1).toordinal()
+
+_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%I %p", "%I%p")
+
+
+def parse_date(value):
+    """
+    Parse a date given as 'YYYY-MM-DD' (or a date/datetime object).
+
+    Raises:
+    ValueError: If the value is not a valid date
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_type):
+        return value
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected format YYYY-MM-DD")
+
+
+def parse_time(value):
+    """
+    Parse a time of day into minutes after midnight.
+
+    Accepts 'HH:MM' as well as 'H:MM', 'HH:MM:SS' and 12-hour forms such as
+    '2:30 PM'. '24:00' is accepted as the end of the day.
+
+    Raises:
+    ValueError: If the value is not a valid time
+    """
+    text = str(value).strip().upper()
+    if text in ("24:00", "24:00:00"):
+        return MINUTES_PER_DAY
+    for time_format in _TIME_FORMATS:
+        try:
+            parsed = datetime.strptime(text, time_format)
+        except ValueError:
+            continue
+        return parsed.hour * 60 + parsed.minute
+    raise ValueError(f"Invalid time '{value}', expected format HH:MM")
+
+
+def to_minutes(day, minute_of_day):
+    """Encode a date and a minute of that day as minutes since the epoch."""
+    return (parse_date(day).toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY + minute_of_day
+
+
+def from_minutes(timestamp):
+    """
+    Decode minutes since the epoch.
+
+    Returns:
+    tuple: (date 'YYYY-MM-DD', time 'HH:MM')
+    """
+    days, minute_of_day = divmod(timestamp, MINUTES_PER_DAY)
+    day = date_type.fromordinal(EPOCH_ORDINAL + days)
+    return day.isoformat(), f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+def normalize_window(day, start_time, end_time):
+    """
+    Convert a date plus start/end times into an integer [start, end) range.
+
+    An end time earlier than the start time is read as the next day, so an
+    overnight booking such as 22:00-02:00 is a single four-hour window.
+
+    Returns:
+    tuple: (start_ts, end_ts) in minutes since the epoch
+
+    Raises:
+    ValueError: If any value is malformed or the window is empty
+    """
+    start_minute = parse_time(start_time)
+    end_minute = parse_time(end_time)
+    if end_minute == start_minute:
+        raise ValueError("End time must be different from start time")
+    if end_minute < start_minute:
+        end_minute += MINUTES_PER_DAY
+
+    start_ts = to_minutes(day, start_minute)
+    return start_ts, start_ts + (end_minute - start_minute)
+
+
+def day_bounds(day):
+    """Return the [start, end) minute range covering a whole day."""
+    start_ts = to_minutes(day, 0)
+    return start_ts, start_ts + MINUTES_PER_DAY
+
+
+def days_between(start_ts, end_ts):
+    """List every 'YYYY-MM-DD' date touched by the [start, end) range."""
+    first = date_type.fromordinal(EPOCH_ORDINAL + start_ts // MINUTES_PER_DAY)
+    last = date_type.fromordinal(EPOCH_ORDINAL + (end_ts - 1) // MINUTES_PER_DAY)
+    return [(first + timedelta(days=offset)).isoformat() for offset in range((last - first).days + 1)]
+
+
+def parse_datetime(value, default_time=None):
+    """
+    Parse 'YYYY-MM-DD HH:MM' (or ISO 'YYYY-MM-DDTHH:MM') into minutes since the epoch.
+
+    A bare 'YYYY-MM-DD' uses default_time, e.g. the hotel check-in time.
+
+    Raises:
+    ValueError: If the value is malformed, or has no time and no default is given
+    """
+    if isinstance(value, datetime):
+        return to_minutes(value.date(), value.hour * 60 + value.minute)
+    text = str(value).strip().replace("T", " ")
+    day, _, time_of_day = text.partition(" ")
+    if not time_of_day:
+        if default_time is None:
+            raise ValueError(f"Invalid date and time '{value}', expected format YYYY-MM-DD HH:MM")
+        time_of_day = default_time
+    return to_minutes(day, parse_time(time_of_day))
+
+
+def normalize_range(check_in, check_out, check_in_time=None, check_out_time=None):
+    """
+    Convert a check-in / check-out pair, possibly days apart, into an integer range.
+
+    Returns:
+    tuple: (start_ts, end_ts) in minutes since the epoch
+
+    Raises:
+    ValueError: If either value is malformed or check-out is not after check-in
+    """
+    start_ts = parse_datetime(check_in, check_in_time)
+    end_ts = parse_datetime(check_out, check_out_time)
+    if end_ts <= start_ts:
+        raise ValueError("Check-out must be after check-in")
+    return start_ts, end_ts
+
+
+def format_minutes(timestamp):
+    """Format minutes since the epoch as 'YYYY-MM-DD HH:MM'."""
+    return " ".join(from_minutes(timestamp))
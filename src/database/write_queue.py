@@ -0,0 +1,139 @@
+# src/database/write_queue.py
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class WriteQueue:
+    """
+    Single writer thread committing queued writes in micro-batches.
+
+    Callers submit a request and get a Future. The writer takes the oldest
+    waiting request, gathers more for up to max_wait_ms or until
+    max_batch_size, and passes the whole batch to commit_batch, which writes
+    it in one transaction and returns one result per request. Under a burst
+    many bookings then share one write lock and one commit instead of each
+    contending for the lock and syncing on its own; when traffic is light a
+    request waits at most max_wait_ms.
+
+    The thread starts on the first submit and stops on close().
+    """
+
+    def __init__(self, commit_batch, max_batch_size=64, max_wait_ms=2.0, latency_samples=1024):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._commit_batch = commit_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.largest_batch = 0
+        self.busy_seconds = 0.0
+        self._latencies = deque(maxlen=latency_samples)   # seconds from submit to result
+        self._stats_lock = threading.Lock()
+
+    def submit(self, request):
+        """Queue a request; the returned Future resolves to its commit_batch result."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write queue is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((request, future, time.perf_counter()))
+        return future
+
+    def close(self, wait=True):
+        """Stop the writer once the requests already queued are committed."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None and wait:
+            thread.join()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            stopping = False
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                # Past the deadline, still take whatever is already waiting
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch):
+        started = time.perf_counter()
+        try:
+            results = self._commit_batch([request for request, _, _ in batch])
+            error = None
+        except Exception as e:
+            results, error = None, e
+        finished = time.perf_counter()
+
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.failed_batches += error is not None
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.busy_seconds += finished - started
+            self._latencies.extend(finished - submitted for _, _, submitted in batch)
+
+        for position, (_, future, _) in enumerate(batch):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[position])
+
+    def stats(self):
+        """Batching, throughput and submit-to-result latency counters."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            batches, items, busy_seconds = self.batches, self.items, self.busy_seconds
+            failed_batches, largest_batch = self.failed_batches, self.largest_batch
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 3)
+
+        return {
+            "enabled": True,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "pending": self._queue.qsize(),
+            "batches": batches,
+            "items": items,
+            "failed_batches": failed_batches,
+            "mean_batch_size": round(items / batches, 2) if batches else 0,
+            "largest_batch": largest_batch,
+            # Writes per second of writer time, i.e. what the writer sustains when kept busy
+            "throughput_per_second": round(items / busy_seconds, 1) if busy_seconds else None,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+        }
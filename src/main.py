@@ -4,6 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import router as api_router
 from core.config import settings
+from database.backends import get_backend
+from database.async_operations import db_executor
 
 # Create FastAPI application
 app = FastAPI(
@@ -24,6 +26,17 @@ app.add_middleware(
 # Include API routes
 app.include_router(api_router, prefix=settings.API_PREFIX)
 
+@app.on_event("startup")
+def load_database_structures():
+    """Build the in-memory availability structures before serving requests."""
+    get_backend().warm_up()
+
+@app.on_event("shutdown")
+def close_database_connections():
+    """Release the database threads and pooled connections when the server stops."""
+    db_executor.shutdown()
+    get_backend().close()
+
 @app.get("/")
 async def root():
     return {
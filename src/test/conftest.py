@@ -0,0 +1,70 @@
+import os
+import sys
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.backends import MemorySQLiteBackend, set_backend
+from database.create_database import seed_sample_data
+
+
+@pytest.fixture
+def backend():
+    """In-memory backend seeded with the sample data, installed as the process backend."""
+    backend = MemorySQLiteBackend()
+    with backend.connection() as conn:
+        seed_sample_data(conn)
+        conn.commit()
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+    backend.close()
+
+
+@pytest.fixture
+def make_backend():
+    """Factory of in-memory backends seeded with the sample data, closed after the test."""
+    made = []
+
+    def make(warm_up=False, **options):
+        backend = MemorySQLiteBackend(**options)
+        made.append(backend)
+        with backend.connection() as conn:
+            seed_sample_data(conn)
+            conn.commit()
+        if warm_up:
+            backend.warm_up()
+        return backend
+    yield make
+    for backend in made:
+        backend.close()
+
+
+@pytest.fixture(params=["sql", "index"])
+def engine_backend(request, make_backend):
+    """A seeded, warmed-up backend on each availability engine, with the availability cache on."""
+    return make_backend(engine=request.param, cache=True, warm_up=True)
+
+
+@pytest.fixture
+def agent_call(monkeypatch):
+    """Parse a tool call the way the agent does, returning the name and arguments the tool receives."""
+    # The agent module builds its model client on import
+    monkeypatch.setenv("GEMINI_API_KEY", os.getenv("GEMINI_API_KEY") or "test-key")
+    from agents.ReservationAgent import process_tool_call
+
+    def call(tool_code):
+        message = process_tool_call(f"```tool_code\n{tool_code}\n```")
+        tool_call = message.tool_calls[0]
+        return tool_call["name"], next(iter(tool_call["args"].values()))
+    return call
+
+
+@pytest.fixture
+def client(backend, monkeypatch):
+    """HTTP client for the API, served from the seeded backend."""
+    monkeypatch.setenv("GEMINI_API_KEY", os.getenv("GEMINI_API_KEY") or "test-key")
+    from fastapi.testclient import TestClient
+    from main import app
+
+    # Not entered as a context manager: the shutdown hook would close the shared executor
+    return TestClient(app)
@@ -0,0 +1,37 @@
+from database.database_operations import check_availability, check_availability_with_alternatives
+
+
+def test_exact_matches_need_no_alternatives(backend):
+    query = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00', 'capacity': 6}
+    result = check_availability_with_alternatives(query)
+    assert result == {'rooms': check_availability(query), 'alternatives': []}
+
+
+def test_near_misses_are_ranked(backend):
+    # Room 9 (capacity 8, Projector) is booked 09:00-17:00 on May 15
+    result = check_availability_with_alternatives({
+        'date': '2025-05-15', 'start_time': '15:00', 'end_time': '17:00',
+        'capacity': 8, 'features': ['Projector'], 'flex_minutes': 120
+    })
+    assert result['rooms'] == []
+    alternatives = result['alternatives']
+    assert alternatives[0]['id'] == 9
+    assert alternatives[0]['reason'] == 'shifted_time'
+    assert alternatives[0]['shift_minutes'] == 120
+    assert (alternatives[0]['check_in'], alternatives[0]['check_out']) == ('2025-05-15 17:00', '2025-05-15 19:00')
+    # Room 5 (capacity 6) is the next size down but has no projector, so it is not offered
+    assert all(alternative['id'] != 5 for alternative in alternatives)
+    assert [alternative['score'] for alternative in alternatives] == sorted(alternative['score'] for alternative in alternatives)
+
+
+def test_missing_feature_and_smaller_room(backend):
+    result = check_availability_with_alternatives({
+        'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00',
+        'capacity': 7, 'features': ['Kitchen'], 'flex_minutes': 0
+    })
+    assert result['rooms'] == []
+    assert [(a['id'], a['reason'], a['score']) for a in result['alternatives']] == [
+        (5, 'smaller_room', 1.0),
+        (9, 'missing_feature', 1.5),
+    ]
+    assert result['alternatives'][1]['missing_feature'] == 'Kitchen'
@@ -0,0 +1,209 @@
+import json
+
+from core.config import settings
+
+API = settings.API_PREFIX
+
+
+def test_list_reservations_filters_by_date(client):
+    response = client.get(f"{API}/reservations", params={"date": "2025-05-10"})
+    assert response.status_code == 200
+    assert response.json() and all(r["date"] == "2025-05-10" for r in response.json())
+
+    response = client.get(f"{API}/reservations", params={"date": "bad"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid date 'bad', expected format YYYY-MM-DD"
+
+
+def test_bulk_import_reports_rows_and_refuses_bad_files(client):
+    csv_file = ("room_id,guest_name,date,start_time,end_time\n"
+                "6,Ann,2025-08-01,09:00,10:00\n"
+                "99,Ben,2025-08-01,09:00,10:00\n").encode("utf-8")
+    response = client.post(f"{API}/reservations/bulk", files={"file": ("bookings.csv", csv_file, "text/csv")})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["rejected_count"]) == (1, 1)
+    assert report["rejected"][0]["reason"] == "Room 99 does not exist"
+
+    latin1 = "room_id,guest_name,date,start_time,end_time\n6,Zoë,2025-08-02,09:00,10:00\n".encode("latin-1")
+    response = client.post(f"{API}/reservations/bulk", files={"file": ("bookings.csv", latin1, "text/csv")})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Line 2 is not valid UTF-8 text"
+    response = client.post(f"{API}/reservations/bulk", files={"file": ("bookings.txt", csv_file, "text/plain")})
+    assert response.status_code == 400
+
+
+def test_availability_batch_answers_each_query(client, monkeypatch):
+    queries = [{"date": "2025-05-10", "start_time": "15:00", "end_time": "17:00"},
+               {"date": "2025-05-10", "start_time": "nope", "end_time": "17:00"}]
+    response = client.post(f"{API}/rooms/availability/batch", json={"queries": queries})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results["0"]["status"] == "success" and results["0"]["rooms"]
+    assert results["1"] == {"status": "error", "rooms": None,
+                            "message": "Invalid time 'nope', expected format HH:MM"}
+
+    monkeypatch.setattr(settings, "AVAILABILITY_BATCH_MAX_QUERIES", 1)
+    response = client.post(f"{API}/rooms/availability/batch", json={"queries": queries})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "A batch may contain at most 1 queries"
+
+
+def test_availability_pages_and_streams(client):
+    window = {"date": "2025-06-01", "start_time": "12:00", "end_time": "14:00"}
+    response = client.post(f"{API}/rooms/availability", json={**window, "limit": 3})
+    assert response.status_code == 200
+    first_page = [room["id"] for room in response.json()]
+    assert len(first_page) == 3
+    after = int(response.headers["X-Next-After-Room-Id"])
+    assert after == first_page[-1]
+    rest = client.post(f"{API}/rooms/availability", json={**window, "after_room_id": after}).json()
+    assert all(room["id"] > after for room in rest)
+
+    response = client.post(f"{API}/rooms/availability/stream", json=window)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert streamed == first_page + [room["id"] for room in rest]
+
+    for route in ("availability", "availability/stream"):
+        response = client.post(f"{API}/rooms/{route}", json={**window, "sort": "price"})
+        assert response.status_code == 400
+
+
+def test_next_available_finds_the_earliest_windows(client):
+    response = client.post(f"{API}/rooms/next-available", json={
+        "duration_minutes": 120, "search_from": "2025-05-12 08:00", "capacity": 6,
+        "max_rooms": 2, "windows_per_room": 1
+    })
+    assert response.status_code == 200
+    assert [(room["id"], room["windows"][0]["check_in"]) for room in response.json()] == \
+        [(5, "2025-05-12 08:00"), (9, "2025-05-12 08:00")]
+
+    response = client.post(f"{API}/rooms/next-available", json={"duration_minutes": 120, "search_from": "soon"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid date 'soon', expected format YYYY-MM-DD"
+
+
+def test_alternatives_route_ranks_near_misses(client):
+    response = client.post(f"{API}/rooms/availability/alternatives", json={
+        "date": "2025-05-11", "start_time": "10:00", "end_time": "12:00",
+        "capacity": 7, "features": ["Kitchen"], "flex_minutes": 0
+    })
+    assert response.status_code == 200
+    result = response.json()
+    assert result["rooms"] == []
+    assert [(a["id"], a["reason"]) for a in result["alternatives"]] == [(5, "smaller_room"), (9, "missing_feature")]
+
+    response = client.post(f"{API}/rooms/availability/alternatives", json={
+        "date": "2025-05-11", "start_time": "10:00", "end_time": "12:00", "flex_minutes": -5
+    })
+    assert response.status_code == 422
+    response = client.post(f"{API}/rooms/availability/alternatives", json={
+        "date": "bad", "start_time": "10:00", "end_time": "12:00"
+    })
+    assert response.status_code == 400
+
+
+def test_archive_route_moves_past_reservations(client):
+    response = client.post(f"{API}/reservations/archive", params={"before": "2025-05-11"})
+    assert response.status_code == 200
+    assert response.json()["archived"] == 3
+    live = client.get(f"{API}/reservations", params={"date": "2025-05-10"}).json()
+    everything = client.get(f"{API}/reservations", params={"date": "2025-05-10", "include_archived": True}).json()
+    assert live == [] and len(everything) == 3 and all(r["archived"] for r in everything)
+
+    response = client.post(f"{API}/reservations/archive", params={"before": "yesterday"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid date 'yesterday', expected format YYYY-MM-DD"
+
+
+def test_modify_and_cancel_routes(client):
+    booked = client.post(f"{API}/rooms/reserve", json={"room_id": 6, "guest_name": "Ann", "date": "2025-06-02",
+                                                      "start_time": "09:00", "end_time": "10:00"}).json()
+    reservation = f"{API}/reservations/{booked['reservation_id']}"
+
+    response = client.patch(reservation, json={"end_time": "11:00"})
+    assert response.status_code == 200
+    assert response.json()["details"]["end_time"] == "11:00"
+    response = client.patch(reservation, json={"room_id": 99})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Room 99 does not exist"
+
+    response = client.delete(reservation, params={"guest_name": "Bob"})
+    assert response.status_code == 400
+    assert client.delete(reservation, params={"guest_name": "Ann"}).status_code == 200
+    response = client.delete(reservation)
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Reservation {booked['reservation_id']} does not exist"
+
+
+def test_group_route_books_the_best_fit_rooms(client):
+    window = {"date": "2025-06-02", "start_time": "09:00", "end_time": "12:00"}
+    response = client.post(f"{API}/rooms/reserve-group", json={"guest_name": "Smith Wedding", "headcount": 9, **window})
+    assert response.status_code == 200
+    result = response.json()
+    assert ([room["id"] for room in result["rooms"]], result["wasted_capacity"]) == ([5, 6], 0)
+    assert {r["guest_name"] for r in client.get(f"{API}/reservations", params={"date": "2025-06-02"}).json()} == \
+        {"Smith Wedding"}
+
+    response = client.post(f"{API}/rooms/reserve-group", json={"guest_name": "Huge", "headcount": 500, **window})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Not enough free rooms for 500 guests")
+
+
+def test_optimize_route_reports_the_plan(client):
+    booked = client.post(f"{API}/rooms/reserve", json={"room_id": 4, "guest_name": "Ann", "date": "2025-06-02",
+                                                      "start_time": "09:00", "end_time": "10:00", "flexible": True})
+    assert booked.status_code == 200
+    window = {"from": "2025-06-02 00:00", "until": "2025-06-03 00:00"}
+    response = client.post(f"{API}/rooms/optimize", params={**window, "dry_run": True})
+    assert response.status_code == 200
+    assert response.json()["dry_run"] is True and response.json()["movable"] == 1
+
+    response = client.post(f"{API}/rooms/optimize", params={"from": "2025-06-03 00:00", "until": "2025-06-02 00:00"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "until must be after from"
+
+
+def test_recurring_route_books_or_reports_conflicts(client):
+    series = {"room_id": 9, "guest_name": "Acme Corp", "date": "2025-06-02", "start_time": "09:00",
+              "end_time": "10:00", "frequency": "weekly", "weekdays": ["monday", "friday"], "until": "2025-06-13"}
+    response = client.post(f"{API}/rooms/reserve-recurring", json=series)
+    assert response.status_code == 200
+    assert response.json()["booked"] == 4
+
+    # Booking the same series again conflicts on every date; the detail lists them
+    response = client.post(f"{API}/rooms/reserve-recurring", json=series)
+    assert response.status_code == 409
+    assert [c["date"] for c in response.json()["detail"]["conflicts"]] == \
+        ["2025-06-02", "2025-06-06", "2025-06-09", "2025-06-13"]
+
+    response = client.post(f"{API}/rooms/reserve-recurring", json={**series, "frequency": "monthly"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid frequency 'monthly'")
+
+
+def test_occupancy_routes(client):
+    client.post(f"{API}/rooms/reserve", json={"room_id": 4, "guest_name": "Ann", "check_in": "2025-06-01 22:00",
+                                              "check_out": "2025-06-03 11:00"})
+    response = client.get(f"{API}/analytics/occupancy", params={"from": "2025-06-01", "to": "2025-06-03"})
+    assert response.status_code == 200
+    assert [group["booked_minutes"] for group in response.json()["groups"]] == [120, 1440, 660]
+    by_room = client.get(f"{API}/analytics/occupancy",
+                         params={"from": "2025-06-01", "to": "2025-06-03", "group_by": "room"}).json()
+    assert {group["room_id"]: group["days_booked"] for group in by_room["groups"]}[4] == 3
+
+    response = client.get(f"{API}/analytics/occupancy/check")
+    assert response.status_code == 200 and response.json()["consistent"]
+
+    for route, params in [("occupancy", {"group_by": "week"}), ("occupancy", {"from": "2025-06-03", "to": "2025-06-01"}),
+                          ("occupancy/check", {"from": "June"})]:
+        response = client.get(f"{API}/analytics/{route}", params=params)
+        assert response.status_code == 400, (route, params)
+
+
+def test_availability_cache_is_off_by_default(client):
+    response = client.get(f"{API}/rooms/availability/cache")
+    assert response.status_code == 200
+    assert response.json() == {"enabled": False}
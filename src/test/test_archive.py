@@ -0,0 +1,38 @@
+MAY_11 = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00'}
+
+
+def test_archive_moves_finished_reservations_in_batches(engine_backend):
+    # Henry holds room 6 on May 11; the answer is cached before archiving
+    assert 6 not in [room['id'] for room in engine_backend.check_availability(MAY_11)]
+
+    result = engine_backend.archive_reservations('2025-05-12', batch_size=4)
+    assert result['status'] == 'success'
+    assert (result['archived'], result['batches']) == (6, 2)
+    assert result['before'] == '2025-05-12 00:00'
+
+    hot = engine_backend.list_reservations()
+    assert len(hot) == 9
+    assert all(reservation['check_out'] > '2025-05-12' for reservation in hot)
+
+    everything = engine_backend.list_reservations({'include_archived': True})
+    assert len(everything) == 15
+    assert [r['guest_name'] for r in everything if r['archived']] == [
+        'Charlie', 'David', 'Eve', 'Henry', 'Frank', 'Grace'
+    ]
+    assert engine_backend.list_reservations({'date': '2025-05-11', 'include_archived': True})[0]['id'] > 0
+
+    # The engine and the cache both forgot the archived windows
+    assert 6 in [room['id'] for room in engine_backend.check_availability(MAY_11)]
+    assert engine_backend.archive_reservations('2025-05-12')['archived'] == 0
+
+
+def test_archive_keeps_ids_unique_for_new_bookings(backend):
+    backend.archive_reservations('2025-05-16')
+    result = backend.reserve_room({'room_id': 4, 'guest_name': 'Zoe', **MAY_11})
+    assert result['status'] == 'success'
+    archived_ids = {r['id'] for r in backend.list_reservations({'include_archived': True}) if r['archived']}
+    assert result['reservation_id'] not in archived_ids
+
+
+def test_archive_rejects_a_bad_cutoff(backend):
+    assert backend.archive_reservations('next tuesday')['status'] == 'error'
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from database import async_operations, database_operations
+from database.async_operations import DatabaseExecutor
+
+
+QUERY = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00', 'capacity': 6}
+
+
+def test_async_operations_match_sync_results(backend):
+    async def run():
+        rooms, reservations = await asyncio.gather(
+            async_operations.check_availability(QUERY),
+            async_operations.list_reservations({'room_id': 5}),
+        )
+        return rooms, reservations, await async_operations.reserve_room({'room_id': 9, 'guest_name': 'Zoe', **QUERY})
+
+    rooms, reservations, booking = asyncio.run(run())
+    assert rooms == [{'id': 5, 'capacity': 6, 'features': ['TV', 'WiFi', 'Kitchen', 'AC', 'Pool Access']},
+                     {'id': 9, 'capacity': 8, 'features': ['TV', 'WiFi', 'Conference Room', 'Projector']}]
+    assert reservations == database_operations.list_reservations({'room_id': 5})
+    assert booking['status'] == 'success'
+    assert [room['id'] for room in database_operations.check_availability(QUERY)] == [5]
+
+
+def test_blocking_call_does_not_stall_the_event_loop():
+    executor = DatabaseExecutor(max_workers=1)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await executor.run(time.sleep, 0.2)
+        task.cancel()
+        return ticks
+
+    try:
+        assert asyncio.run(run()) >= 5
+    finally:
+        executor.shutdown()
+
+
+def test_errors_propagate_to_the_awaiting_caller(backend):
+    async def run():
+        return await async_operations.check_availability({**QUERY, 'start_time': 'noon'})
+
+    try:
+        asyncio.run(run())
+    except ValueError as e:
+        assert "noon" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
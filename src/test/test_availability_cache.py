@@ -0,0 +1,103 @@
+import pytest
+
+from core.config import settings
+from database.availability_cache import AvailabilityCache
+from database.backends import MemorySQLiteBackend
+from database.database_operations import check_availability, reserve_room
+from database.time_utils import normalize_window, normalize_range
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _key(date, start="10:00", end="12:00", capacity=1, features=()):
+    return AvailabilityCache.key(capacity, list(features), normalize_window(date, start, end))
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = AvailabilityCache(max_entries=2, ttl_seconds=10, clock=clock)
+    for day in ("2025-05-10", "2025-05-11"):
+        cache.put(_key(day), [day], cache.generation)
+    assert cache.get(_key("2025-05-10")) == ["2025-05-10"]
+
+    cache.put(_key("2025-05-12"), ["2025-05-12"], cache.generation)
+    assert cache.get(_key("2025-05-11")) is None          # least recently used
+    assert cache.get(_key("2025-05-10")) == ["2025-05-10"]
+
+    clock.now = 11
+    assert cache.get(_key("2025-05-10")) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidation_is_limited_to_touched_dates():
+    cache = AvailabilityCache()
+    same_day = _key("2025-05-11", capacity=4, features=["WiFi", "TV"])
+    other_day = _key("2025-05-12")
+    stay = AvailabilityCache.key(1, [], normalize_range("2025-05-09 15:00", "2025-05-11 11:00"))
+    no_window = AvailabilityCache.key(1, ["WiFi"], None)
+    for key in (same_day, other_day, stay, no_window):
+        cache.put(key, [], cache.generation)
+
+    assert same_day == _key("2025-05-11", capacity=4, features=["TV", "WiFi", "TV"])
+
+    cache.reservation_added({"id": 1, "room_id": 4, **dict(zip(("start_ts", "end_ts"),
+                                                                normalize_window("2025-05-11", "08:00", "09:00")))})
+    assert cache.get(same_day) is None
+    assert cache.get(stay) is None
+    assert cache.get(other_day) == []
+    assert cache.get(no_window) == []
+
+
+def test_result_computed_across_a_write_is_not_stored():
+    cache = AvailabilityCache()
+    key = _key("2025-05-11")
+    generation = cache.generation
+    cache.invalidate_dates(["2025-05-20"])
+    cache.put(key, ["stale"], generation)
+    assert cache.get(key) is None
+
+
+@pytest.fixture
+def cached_backend(monkeypatch, request):
+    """The seeded backend with the availability cache turned on, as it is off by default."""
+    monkeypatch.setattr(settings, 'AVAILABILITY_CACHE_ENABLED', True)
+    return request.getfixturevalue('backend')
+
+
+def test_backend_serves_repeats_from_cache_and_invalidates_on_reserve(cached_backend):
+    backend = cached_backend
+    query = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00', 'capacity': 6}
+    other = {'date': '2025-05-15', 'start_time': '10:00', 'end_time': '12:00', 'capacity': 6}
+    first = check_availability(query)
+    check_availability(other)
+    first[0]['features'].append('Mutated')
+
+    assert check_availability({**query, 'start_time': '10:00:00'}) == check_availability(query)
+    assert 'Mutated' not in check_availability(query)[0]['features']
+    assert backend.availability_cache_stats()['hits'] == 3
+
+    assert reserve_room({'room_id': 5, 'guest_name': 'Zoe', **query})['status'] == 'success'
+    assert [room['id'] for room in check_availability(query)] == [9]
+    stats = backend.availability_cache_stats()
+    assert stats['invalidations'] == 1
+    check_availability(other)
+    assert backend.availability_cache_stats()['hits'] == stats['hits'] + 1
+
+
+def test_cache_can_be_disabled():
+    backend = MemorySQLiteBackend(cache=False)
+    try:
+        assert backend.availability_cache is None
+        assert backend.availability_cache_stats() == {"enabled": False}
+        assert backend.check_availability({'capacity': 1}) == []
+    finally:
+        backend.close()
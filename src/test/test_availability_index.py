@@ -0,0 +1,50 @@
+import random
+
+from database.availability_index import RoomIntervals
+from database.time_utils import from_minutes, to_minutes
+
+
+def test_room_intervals_overlap():
+    intervals = RoomIntervals()
+    intervals.add(1, 100, 200)
+    intervals.add(2, 300, 400)
+    intervals.add(3, 120, 500)   # overlapping legacy data must still be found
+
+    assert intervals.overlaps(450, 460)
+    intervals.remove(3)
+    assert not intervals.overlaps(450, 460)
+    assert not intervals.overlaps(200, 300)
+    assert intervals.overlaps(199, 201)
+    assert intervals.overlaps(50, 500)
+
+
+def test_index_engine_matches_sql_engine(make_backend):
+    rng = random.Random(42)
+    sql_backend = make_backend(engine="sql")
+    index_backend = make_backend(engine="index", warm_up=True)
+    features = ['TV', 'WiFi', 'Kitchen', 'AC', 'Projector', 'Balcony']
+
+    for _ in range(300):
+        start_ts = to_minutes('2025-05-10', 0) + rng.randrange(0, 6 * 24 * 4) * 15
+        end_ts = start_ts + rng.randrange(1, 16) * 15
+        day, start_time = from_minutes(start_ts)
+        end_time = from_minutes(end_ts)[1]
+
+        # Write through both backends, then compare a random query
+        reservation = {
+            'room_id': rng.randint(1, 10),
+            'guest_name': 'Guest',
+            'date': day,
+            'start_time': start_time,
+            'end_time': end_time
+        }
+        assert sql_backend.reserve_room(reservation)['status'] == index_backend.reserve_room(reservation)['status']
+
+        query = {
+            'date': day,
+            'start_time': start_time,
+            'end_time': end_time,
+            'capacity': rng.randint(1, 6),
+            'features': rng.sample(features, rng.randint(0, 2))
+        }
+        assert sql_backend.check_availability(query) == index_backend.check_availability(query)
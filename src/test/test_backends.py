@@ -0,0 +1,155 @@
+import threading
+import pytest
+
+from database.backends import create_backend, FileSQLiteBackend, MemorySQLiteBackend
+from database.database_operations import check_availability, reserve_room, list_rooms, list_reservations
+
+
+def test_create_backend_from_url(tmp_path):
+    file_backend = create_backend(f"sqlite:///{tmp_path}/data/hotel.db")
+    assert isinstance(file_backend, FileSQLiteBackend)
+    assert file_backend.database == f"{tmp_path}/data/hotel.db"
+    file_backend.close()
+
+    for url in ("sqlite:///:memory:", "sqlite://"):
+        memory_backend = create_backend(url)
+        assert isinstance(memory_backend, MemorySQLiteBackend)
+        memory_backend.close()
+
+    with pytest.raises(ValueError):
+        create_backend("postgresql://localhost/hotel")
+
+
+def test_memory_backend_operations(backend):
+    assert [room['id'] for room in list_rooms()] == [4, 5, 6, 7, 8, 9, 10]
+
+    rooms = check_availability({
+        'date': '2025-05-11',
+        'start_time': '10:00',
+        'end_time': '12:00',
+        'capacity': 6
+    })
+    assert [room['id'] for room in rooms] == [5, 9]
+
+    result = reserve_room({
+        'room_id': 5,
+        'guest_name': 'Zoe',
+        'date': '2025-05-11',
+        'start_time': '10:00',
+        'end_time': '12:00'
+    })
+    assert result['status'] == 'success'
+    assert result['details']['features'] == ['TV', 'WiFi', 'Kitchen', 'AC', 'Pool Access']
+
+    rooms = check_availability({
+        'date': '2025-05-11',
+        'start_time': '11:00',
+        'end_time': '13:00',
+        'capacity': 6
+    })
+    assert [room['id'] for room in rooms] == [9]
+    assert [r['guest_name'] for r in list_reservations({'room_id': 5, 'date': '2025-05-11'})] == ['Zoe']
+
+
+def test_memory_backends_are_isolated(backend):
+    other = MemorySQLiteBackend()
+    try:
+        assert other.list_rooms() == []
+    finally:
+        other.close()
+
+
+def test_feature_filter_runs_in_sql(backend):
+    rooms = check_availability({
+        'date': '2025-05-10',
+        'start_time': '12:00',
+        'end_time': '14:00',
+        'features': ['Kitchen', 'Pet Friendly']
+    })
+    assert [room['id'] for room in rooms] == [7]
+    assert rooms[0]['features'] == ['WiFi', 'Kitchen', 'Pet Friendly']
+
+    assert check_availability({'features': ['Helipad']}) == []
+
+    # Rooms added after the migration are indexed by the triggers
+    with backend.connection() as conn:
+        conn.execute("INSERT INTO rooms (id, capacity, features) VALUES (11, 2, '[\"Helipad\", \"WiFi\"]')")
+        conn.commit()
+    assert [room['id'] for room in check_availability({'features': ['Helipad', 'WiFi']})] == [11]
+
+
+def test_batch_answers_each_query_and_reports_errors_inline(backend):
+    queries = [
+        {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00', 'capacity': 6},
+        {'date': '2025-05-11', 'start_time': 'noon', 'end_time': '12:00'},
+        {'date': '2025-05-10', 'start_time': '12:00', 'end_time': '14:00', 'features': ['Kitchen', 'Pet Friendly']},
+        {'features': ['Helipad']},
+    ]
+    results = backend.check_availability_batch(queries)
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert results[0] == {'status': 'success', 'rooms': check_availability(queries[0])}
+    assert results[1]['status'] == 'error'
+    assert [room['id'] for room in results[2]['rooms']] == [7]
+    assert results[3] == {'status': 'success', 'rooms': []}
+
+
+def test_concurrent_bookings_of_one_room_never_overlap(tmp_path):
+    backend = FileSQLiteBackend(str(tmp_path / "hotel.db"), pool_size=16)
+    with backend.connection() as conn:
+        conn.execute("INSERT INTO rooms (id, capacity, features) VALUES (1, 2, '[]')")
+        conn.commit()
+
+    # Every thread races for staggered, mostly overlapping windows of room 1
+    threads_count, attempts = 16, 10
+    barrier = threading.Barrier(threads_count)
+    results = []
+
+    def book(worker):
+        barrier.wait()
+        for attempt in range(attempts):
+            start = 8 * 60 + (worker * attempts + attempt) % 7 * 30
+            results.append(backend.reserve_room({
+                'room_id': 1,
+                'guest_name': f'guest-{worker}-{attempt}',
+                'date': '2025-06-01',
+                'start_time': f'{start // 60:02d}:{start % 60:02d}',
+                'end_time': f'{start // 60 + 1:02d}:{start % 60:02d}'
+            }))
+
+    threads = [threading.Thread(target=book, args=(worker,)) for worker in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    successes = [result for result in results if result['status'] == 'success']
+    assert len(results) == threads_count * attempts
+    assert successes
+    assert all(
+        result['message'] == 'Room 1 is not available during the requested time'
+        for result in results if result['status'] != 'success'
+    )
+
+    with backend.connection() as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0]
+        overlaps = conn.execute("""
+            SELECT COUNT(*) FROM reservations a JOIN reservations b
+            ON a.room_id = b.room_id AND a.id < b.id
+            AND a.end_ts > b.start_ts AND a.start_ts < b.end_ts
+        """).fetchone()[0]
+    backend.close()
+
+    assert stored == len(successes)
+    assert overlaps == 0
+
+
+def test_reserve_room_reports_unknown_room(backend):
+    result = reserve_room({
+        'room_id': 99,
+        'guest_name': 'Zoe',
+        'date': '2025-05-11',
+        'start_time': '10:00',
+        'end_time': '12:00'
+    })
+    assert result == {'status': 'error', 'message': 'Room 99 does not exist'}
@@ -0,0 +1,97 @@
+import io
+import json
+import pytest
+
+from database.bulk_import import detect_format, check_encoding, read_reservation_rows
+from database.time_utils import normalize_window
+from database.database_operations import import_reservations, list_reservations
+
+
+CSV_ROWS = """room_id,guest_name,date,start_time,end_time,check_in,check_out
+5,Ann,2025-05-11,10:00,12:00,,
+5,Ben,2025-05-11,11:00,13:00,,
+4,Cid,2025-05-12,08:00,10:00,,
+4,Dee,2025-05-12,12:00,14:00,,
+99,Eli,2025-05-13,08:00,10:00,,
+7,Fay,,,,2025-06-01,2025-06-04
+7,Gus,2025-06-02,noon,13:00,,
+"""
+
+
+def test_import_checks_conflicts_in_db_and_within_batch(backend):
+    rows = read_reservation_rows(io.StringIO(CSV_ROWS), "csv")
+    report = import_reservations(rows, chunk_size=3)
+
+    assert report["imported"] == 3
+    reasons = {rejection["row"]: rejection["reason"] for rejection in report["rejected"]}
+    assert reasons == {
+        2: "Room 5 is booked by an earlier row of the import",
+        4: "Room 4 is not available during the requested time",   # Leo 11:00-15:00
+        5: "Room 99 does not exist",
+        7: "Invalid time 'noon', expected format HH:MM",
+    }
+    assert report["rejected_count"] == 4
+
+    assert [r["guest_name"] for r in list_reservations({"room_id": 5, "date": "2025-05-11"})] == ["Ann"]
+    stay = list_reservations({"room_id": 7, "date": "2025-06-02"})
+    assert [(r["check_in"], r["check_out"]) for r in stay] == [("2025-06-01 15:00", "2025-06-04 11:00")]
+
+
+def test_import_conflicts_across_chunks_and_bad_jsonl_lines(backend):
+    lines = [
+        json.dumps({"room_id": 8, "guest_name": "Hal", "date": "2025-07-01", "start_time": "09:00", "end_time": "10:00"}),
+        "{not json",
+        json.dumps({"room_id": 8, "guest_name": "Ida", "date": "2025-07-01", "start_time": "09:30", "end_time": "11:00"}),
+    ]
+    report = import_reservations(read_reservation_rows(io.StringIO("\n".join(lines)), "jsonl"), chunk_size=1)
+
+    assert report["imported"] == 1
+    assert [(r["row"], r["reason"]) for r in report["rejected"]] == [
+        (2, "Row is not a reservation record"),
+        (3, "Room 8 is not available during the requested time"),
+    ]
+
+
+def test_imported_rows_reach_the_availability_index(backend):
+    index = backend.availability_index()
+    report = import_reservations([{"room_id": 10, "guest_name": "Jo", "date": "2025-08-01",
+                                   "start_time": "09:00", "end_time": "10:00"}])
+
+    assert report["imported"] == 1
+    assert not index.is_free(10, *normalize_window("2025-08-01", "09:30", "09:45"))
+
+
+def test_failed_chunk_is_reported_and_the_load_carries_on(backend):
+    with backend.connection() as conn:
+        conn.execute("CREATE TEMP TRIGGER refuse_guest BEFORE INSERT ON reservations "
+                     "WHEN NEW.guest_name = 'Boom' BEGIN SELECT RAISE(ABORT, 'refused by trigger'); END")
+        conn.commit()
+    rows = [{"room_id": 6, "guest_name": name, "date": f"2025-08-0{day}", "start_time": "09:00", "end_time": "10:00"}
+            for day, name in enumerate(["Ann", "Ben", "Boom", "Cid", "Dee", "Eve"], start=1)]
+    try:
+        report = import_reservations(rows, chunk_size=2)
+    finally:
+        with backend.connection() as conn:
+            conn.execute("DROP TRIGGER temp.refuse_guest")
+            conn.commit()
+
+    assert report["imported"] == 4
+    assert [(r["row"], r["reason"]) for r in report["rejected"]] == [
+        (3, "Error importing reservation: refused by trigger"),
+        (4, "Error importing reservation: refused by trigger"),
+    ]
+    assert {r["guest_name"] for r in list_reservations({"room_id": 6}) if r["date"] >= "2025-08-01"} == \
+        {"Ann", "Ben", "Dee", "Eve"}
+
+
+def test_check_encoding_names_the_bad_line():
+    good = io.BytesIO("room_id,guest_name\n5,Zoë\n".encode("utf-8"))
+    check_encoding(good)
+    assert good.tell() == 0
+    with pytest.raises(ValueError, match="Line 3 is not valid UTF-8 text"):
+        check_encoding(io.BytesIO(b"room_id,guest_name\n5,Ann\n6,Zo\xeb\n"))
+
+
+def test_detect_format():
+    assert detect_format("bookings.CSV") == "csv"
+    assert detect_format("bookings.ndjson") == "jsonl"
@@ -0,0 +1,128 @@
+import asyncio
+import sqlite3
+import threading
+import pytest
+
+from database.connection import ConnectionPool, transaction
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_size=2, timeout=0.2)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE items (name TEXT)")
+        conn.commit()
+    yield pool
+    pool.close_all()
+
+
+def _names(pool):
+    with pool.connection() as conn:
+        return [row[0] for row in conn.execute("SELECT name FROM items ORDER BY rowid")]
+
+
+def test_connection_is_reused_per_thread_and_task(pool):
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+        # A nested exit does not hand the connection back
+        with pool.connection() as again:
+            assert again is outer
+    with pool.connection() as later:
+        assert later is outer
+
+    seen = {}
+    # Both threads hold their connection until the other one has one too
+    both_holding = threading.Barrier(2, timeout=5)
+
+    def hold(name):
+        with pool.connection() as conn:
+            seen[name] = conn
+            both_holding.wait()
+
+    threads = [threading.Thread(target=hold, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert seen["a"] is not seen["b"]
+
+    async def task(name, started, release):
+        with pool.connection() as conn:
+            seen[name] = conn
+            started.set()
+            await release.wait()
+
+    async def run():
+        first_started, second_started, release = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        tasks = [asyncio.create_task(task("x", first_started, release)),
+                 asyncio.create_task(task("y", second_started, release))]
+        await first_started.wait()
+        await second_started.wait()
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert seen["x"] is not seen["y"]
+
+
+def test_pool_is_bounded_and_times_out(pool):
+    holding, release = threading.Barrier(3, timeout=5), threading.Event()
+
+    def hold():
+        with pool.connection():
+            holding.wait()
+            release.wait(5)
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    holding.wait()
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="Timed out waiting for a database connection"):
+            with pool.connection():
+                pass
+        assert pool._opened == 2
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    # A returned connection is handed to the next waiter
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert pool._opened == 2
+
+
+def test_connections_use_wal_and_normal_sync(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # 1 = NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_transaction_commits_rolls_back_and_does_not_nest(pool):
+    with pool.connection() as conn:
+        with transaction(conn):
+            conn.execute("INSERT INTO items VALUES ('kept')")
+        with pytest.raises(ValueError):
+            with transaction(conn):
+                conn.execute("INSERT INTO items VALUES ('rolled back')")
+                raise ValueError("abort")
+        assert not conn.in_transaction
+
+        # A nested transaction is refused and the outer one rolls back
+        with pytest.raises(sqlite3.ProgrammingError, match="open transaction"):
+            with transaction(conn):
+                conn.execute("INSERT INTO items VALUES ('outer')")
+                with transaction(conn):
+                    conn.execute("INSERT INTO items VALUES ('inner')")
+
+        # Uncommitted writes are not committed on the caller's behalf
+        conn.execute("INSERT INTO items VALUES ('pending')")
+        with pytest.raises(sqlite3.ProgrammingError):
+            with transaction(conn):
+                pass
+        assert conn.in_transaction
+    # Returning the connection to the pool discards the unfinished transaction
+    assert _names(pool) == ["kept"]
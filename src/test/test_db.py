@@ -1,3 +1,9 @@
+import pytest
+
+from database.database_operations import check_availability
+
+
+@pytest.mark.usefixtures("backend")
 def test_check_availability():
     print("Running availability tests...")
     
@@ -98,4 +104,5 @@ def test_check_availability():
     print(f"Test passed: {len(test7) == 0}")
 
 # Run the tests
-test_check_availability()
\ No newline at end of file
+if __name__ == "__main__":
+    test_check_availability()
\ No newline at end of file
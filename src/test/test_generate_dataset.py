@@ -0,0 +1,59 @@
+import argparse
+import json
+import pytest
+
+from database.backends import MemorySQLiteBackend
+from database.generate_dataset import populate, parse_feature_distribution
+from database.time_utils import to_minutes
+
+
+def _generate(**options):
+    backend = MemorySQLiteBackend()
+    with backend.connection() as conn:
+        counts = populate(conn, **options)
+        rows = conn.execute(
+            "SELECT room_id, guest_name, start_ts, end_ts FROM reservations ORDER BY id"
+        ).fetchall()
+        rooms = conn.execute("SELECT id, capacity, features FROM rooms ORDER BY id").fetchall()
+    backend.close()
+    return counts, rooms, rows
+
+
+def test_same_seed_gives_same_dataset():
+    first = _generate(rooms=20, days=30, seed=7)
+    assert first == _generate(rooms=20, days=30, seed=7)
+    assert first[2] != _generate(rooms=20, days=30, seed=8)[2]
+
+
+def test_generated_reservations_fit_span_and_occupancy():
+    counts, rooms, rows = _generate(rooms=40, days=120, occupancy=0.5, start_date="2025-01-01")
+
+    assert counts == {"rooms": 40, "reservations": len(rows)}
+    assert len(rooms) == 40
+
+    span_start, span_end = to_minutes("2025-01-01", 0), to_minutes("2025-05-01", 0)
+    assert all(span_start <= start_ts < end_ts <= span_end for _, _, start_ts, end_ts in rows)
+
+    by_room = {}
+    for room_id, _, start_ts, end_ts in rows:
+        by_room.setdefault(room_id, []).append((start_ts, end_ts))
+    for windows in by_room.values():
+        windows.sort()
+        assert all(previous[1] <= current[0] for previous, current in zip(windows, windows[1:]))
+
+    booked = sum(end_ts - start_ts for _, _, start_ts, end_ts in rows)
+    assert 0.4 < booked / (40 * (span_end - span_start)) < 0.6
+
+
+def test_feature_distribution_shapes_the_rooms():
+    _, rooms, _ = _generate(rooms=200, days=10, feature_distribution={"WiFi": 1.0, "Ocean View": 0.9})
+    features = [json.loads(row[2]) for row in rooms]
+    assert all("WiFi" in room for room in features)
+    assert 160 < sum("Ocean View" in room for room in features) < 200
+    assert {feature for room in features for feature in room} == {"WiFi", "Ocean View"}
+
+    assert parse_feature_distribution("WiFi=1, Ocean View=0.9") == {"WiFi": 1.0, "Ocean View": 0.9}
+    assert parse_feature_distribution('{"TV": 0.25}') == {"TV": 0.25}
+    for text in ("WiFi", "WiFi=1.5", "[1]", ""):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_feature_distribution(text)
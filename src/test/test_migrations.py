@@ -0,0 +1,39 @@
+import sqlite3
+
+from database.migrations import MIGRATIONS, migrate, current_version
+
+
+def test_migrate_is_idempotent():
+    conn = sqlite3.connect(":memory:")
+    latest = MIGRATIONS[-1][0]
+    assert migrate(conn) == [version for version, _, _ in MIGRATIONS]
+    assert current_version(conn) == latest
+    assert migrate(conn) == []
+    conn.close()
+
+
+def test_migrate_upgrades_legacy_database():
+    # Databases created by the old one-shot script have the tables but no version table
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE rooms (id INTEGER PRIMARY KEY, capacity INTEGER NOT NULL, features TEXT)")
+    conn.execute("""
+        CREATE TABLE reservations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, room_id INTEGER, guest_name TEXT,
+            date TEXT, start_time TEXT, end_time TEXT
+        )
+    """)
+    conn.execute("INSERT INTO rooms VALUES (1, 2, '[\"TV\"]')")
+    conn.execute("INSERT INTO reservations (room_id, guest_name, date, start_time, end_time) "
+                 "VALUES (1, 'Alice', '2025-05-10', '14:00', '16:00')")
+    conn.commit()
+
+    migrate(conn)
+    assert current_version(conn) == MIGRATIONS[-1][0]
+    assert conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0] == 1
+    conn.close()
+
+
+def test_hot_queries_use_indexes(backend):
+    report = backend.explain_hot_queries()
+    for name, result in report.items():
+        assert result["uses_index"], f"{name} does not use an index: {result['plan']}"
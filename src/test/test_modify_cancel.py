@@ -0,0 +1,61 @@
+from database.database_operations import cancel_reservation, modify_reservation, reserve_room, list_reservations
+
+MAY_11 = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00'}
+
+
+def _free(backend, window):
+    return [room['id'] for room in backend.check_availability(window)]
+
+
+def test_cancel_frees_the_room(engine_backend):
+    henry = next(r for r in engine_backend.list_reservations() if r['guest_name'] == 'Henry')
+    assert 6 not in _free(engine_backend, MAY_11)
+
+    wrong_guest = engine_backend.cancel_reservation({'reservation_id': henry['id'], 'guest_name': 'Frank'})
+    assert wrong_guest['status'] == 'error'
+
+    result = engine_backend.cancel_reservation({'reservation_id': henry['id'], 'guest_name': 'henry'})
+    assert result['status'] == 'success'
+    assert result['details']['check_in'] == '2025-05-11 09:00'
+    assert 6 in _free(engine_backend, MAY_11)
+    assert engine_backend.cancel_reservation({'reservation_id': henry['id']})['message'] == \
+        f"Reservation {henry['id']} does not exist"
+
+
+def test_modify_moves_the_booking_atomically(engine_backend):
+    booked = engine_backend.reserve_room({'room_id': 7, 'guest_name': 'Zoe', **MAY_11})
+    reservation_id = booked['reservation_id']
+    assert 7 not in _free(engine_backend, MAY_11)
+
+    # Room 6 is taken by Henry, so nothing changes
+    taken = engine_backend.modify_reservation({'reservation_id': reservation_id, 'room_id': 6})
+    assert taken['status'] == 'error'
+    assert 7 not in _free(engine_backend, MAY_11)
+
+    moved = engine_backend.modify_reservation({'reservation_id': reservation_id, 'room_id': 8, 'start_time': '11:00'})
+    assert moved['status'] == 'success'
+    assert (moved['details']['room_id'], moved['details']['check_in']) == (8, '2025-05-11 11:00')
+    assert moved['previous']['room_id'] == 7
+    assert 7 in _free(engine_backend, MAY_11)
+    assert 8 not in _free(engine_backend, MAY_11)
+
+    # Overlapping its own old window is not a conflict
+    assert engine_backend.modify_reservation({'reservation_id': reservation_id, 'end_time': '13:00'})['status'] == 'success'
+
+
+def test_new_date_keeps_the_length_of_a_stay(backend):
+    booked = reserve_room({'room_id': 10, 'guest_name': 'Yan', 'check_in': '2025-06-01 15:00', 'check_out': '2025-06-04 11:00'})
+    moved = modify_reservation({'reservation_id': booked['reservation_id'], 'date': '2025-06-10'})
+    assert (moved['details']['check_in'], moved['details']['check_out']) == ('2025-06-10 15:00', '2025-06-13 11:00')
+    assert [r['check_in'] for r in list_reservations({'room_id': 10})] == ['2025-05-15 13:00', '2025-06-10 15:00']
+
+
+def test_archived_and_malformed_requests(backend):
+    frank = next(r for r in list_reservations() if r['guest_name'] == 'Frank')
+    backend.archive_reservations('2025-05-12')
+    assert cancel_reservation({'reservation_id': frank['id']})['message'] == \
+        f"Reservation {frank['id']} has already ended and was archived"
+    assert cancel_reservation({})['message'] == "Missing reservation_id"
+    assert modify_reservation({'reservation_id': 'abc'})['status'] == 'error'
+    pat = next(r for r in list_reservations() if r['guest_name'] == 'Pat')
+    assert modify_reservation({'reservation_id': pat['id'], 'date': 'tomorrow'})['status'] == 'error'
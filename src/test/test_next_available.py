@@ -0,0 +1,52 @@
+import pytest
+
+from database.database_operations import find_next_available
+from database.slot_finder import free_windows
+
+
+def test_free_windows_one_per_gap():
+    busy = [(10, 20), (15, 30), (40, 50)]      # overlapping legacy rows are merged
+    assert free_windows(busy, 0, 100, 5, 5) == [(0, 5, 10), (30, 35, 40), (50, 55, 100)]
+    assert free_windows(busy, 0, 100, 11, 5) == [(50, 61, 100)]
+    assert free_windows(busy, 0, 100, 5, 2) == [(0, 5, 10), (30, 35, 40)]
+    assert free_windows([], 3, 100, 10, 2, step=15) == [(15, 25, 100)]
+    assert free_windows([(0, 200)], 3, 100, 10, 2) == []
+
+
+def test_find_next_available_after_a_full_window(backend):
+    # Room 9 (the only room for 8) is taken 09:00-17:00 on May 15
+    rooms = find_next_available({
+        'duration_minutes': 120,
+        'search_from': '2025-05-15 10:00',
+        'search_until': '2025-05-16',
+        'capacity': 8,
+        'windows_per_room': 2
+    })
+    assert [room['id'] for room in rooms] == [9]
+    assert rooms[0]['windows'] == [
+        {'check_in': '2025-05-15 17:00', 'check_out': '2025-05-15 19:00', 'free_until': '2025-05-17 00:00'},
+    ]
+
+
+def test_rooms_ordered_by_earliest_window(engine_backend):
+    rooms = engine_backend.find_next_available({
+        'duration_minutes': 60,
+        'search_from': '2025-05-12 08:00',
+        'search_until': '2025-05-12 23:00',
+        'features': ['WiFi'],
+        'max_rooms': 3
+    })
+    first_windows = [room['windows'][0]['check_in'] for room in rooms]
+    assert first_windows == sorted(first_windows)
+    assert rooms[0]['windows'][0]['check_in'] == '2025-05-12 08:00'
+    assert engine_backend.reserve_room({'room_id': rooms[0]['id'], 'guest_name': 'Zoe',
+                                        'check_in': rooms[0]['windows'][0]['check_in'],
+                                        'check_out': rooms[0]['windows'][0]['check_out']})['status'] == 'success'
+
+
+def test_find_next_available_validates_duration(backend):
+    with pytest.raises(ValueError):
+        find_next_available({'duration_minutes': 0})
+    with pytest.raises(ValueError):
+        find_next_available({'duration_minutes': 600, 'search_from': '2025-05-15 10:00',
+                             'search_until': '2025-05-15 12:00'})
@@ -0,0 +1,131 @@
+import threading
+
+from database.backends import FileSQLiteBackend, set_backend
+from database.create_database import seed_sample_data
+from database.database_operations import (
+    reserve_room, modify_reservation, cancel_reservation, reserve_recurring, archive_reservations,
+    import_reservations, occupancy_report, rebuild_occupancy, check_occupancy
+)
+
+
+def _summary(backend, room_id):
+    with backend.connection() as conn:
+        return conn.execute(
+            "SELECT date, booked_minutes FROM occupancy_daily WHERE room_id = ? ORDER BY date", (room_id,)
+        ).fetchall()
+
+
+def test_triggers_split_stays_at_midnight(backend):
+    # The sample data is inserted with raw SQL and is counted all the same
+    assert check_occupancy()['consistent']
+    reserve_room({'room_id': 8, 'guest_name': 'Ann', 'check_in': '2025-06-01 22:00', 'check_out': '2025-06-03 11:00'})
+    assert _summary(backend, 8) == [('2025-06-01', 120), ('2025-06-02', 1440), ('2025-06-03', 660)]
+
+    with backend.connection() as conn:
+        conn.execute("UPDATE reservations SET end_ts = end_ts - 660 WHERE room_id = 8")
+        conn.commit()
+    assert _summary(backend, 8) == [('2025-06-01', 120), ('2025-06-02', 1440)]
+    with backend.connection() as conn:
+        conn.execute("DELETE FROM reservations WHERE room_id = 8")
+        conn.commit()
+    assert _summary(backend, 8) == []
+
+
+def test_summary_follows_every_write(backend):
+    reserve_room({'room_id': 4, 'guest_name': 'Ann', 'check_in': '2025-06-01 22:00',
+                  'check_out': '2025-06-03 11:00'})
+    moved = reserve_room({'room_id': 5, 'guest_name': 'Bob', 'date': '2025-06-02',
+                          'start_time': '09:00', 'end_time': '10:00'})
+    modify_reservation({'reservation_id': moved['reservation_id'], 'room_id': 6, 'end_time': '11:30'})
+    cancelled = reserve_room({'room_id': 7, 'guest_name': 'Cy', 'date': '2025-06-02',
+                              'start_time': '12:00', 'end_time': '13:00'})
+    cancel_reservation({'reservation_id': cancelled['reservation_id']})
+    reserve_recurring({'room_id': 9, 'guest_name': 'Acme', 'date': '2025-06-02', 'start_time': '09:00',
+                       'end_time': '10:00', 'frequency': 'daily', 'count': 2})
+    assert check_occupancy()['consistent']
+
+    by_day = occupancy_report({'from': '2025-06-01', 'to': '2025-06-03'})
+    assert by_day['status'] == 'success' and len(by_day['groups']) == 3
+    june_2 = by_day['groups'][1]
+    assert (june_2['date'], june_2['booked_minutes'], june_2['rooms_booked']) == ('2025-06-02', 1440 + 150 + 60, 3)
+    assert june_2['available_minutes'] == 7 * 1440
+    assert by_day['total']['booked_minutes'] == 120 + 1440 + 660 + 150 + 60 + 60
+
+    by_room = {group['room_id']: group for group in
+               occupancy_report({'from': '2025-06-01', 'to': '2025-06-03', 'group_by': 'room'})['groups']}
+    assert (by_room[4]['booked_minutes'], by_room[4]['days_booked']) == (2220, 3)
+    assert by_room[5]['booked_minutes'] == 0 and by_room[6]['booked_minutes'] == 150
+    by_feature = {group['feature']: group for group in
+                  occupancy_report({'from': '2025-06-02', 'to': '2025-06-02', 'group_by': 'feature'})['groups']}
+    assert by_feature['Ocean View']['booked_minutes'] == 1440
+    assert by_feature['Projector']['occupancy'] == round(60 / 1440, 4)
+
+    # Archived bookings still count toward history
+    assert archive_reservations('2025-06-04')['archived'] > 0
+    assert occupancy_report({'from': '2025-06-02', 'to': '2025-06-02'})['total']['booked_minutes'] == 1650
+    assert check_occupancy()['consistent']
+
+    assert occupancy_report({'group_by': 'week'})['status'] == 'error'
+    assert occupancy_report({'from': '2025-06-03', 'to': '2025-06-01'})['status'] == 'error'
+
+
+def test_checker_reports_drift(backend):
+    rebuild_occupancy()
+    with backend.connection() as conn:
+        conn.execute("UPDATE occupancy_daily SET booked_minutes = booked_minutes + 5 "
+                     "WHERE date = '2025-05-10' AND room_id = 4")
+        conn.execute("INSERT INTO occupancy_daily (date, room_id, booked_minutes) VALUES ('2025-05-20', 1, 30)")
+        conn.commit()
+
+    result = check_occupancy()
+    assert not result['consistent']
+    assert (result['mismatched'], result['unexpected'], result['missing']) == (1, 1, 0)
+    assert result['differences'][0] == {'date': '2025-05-10', 'room_id': 4, 'kind': 'mismatched',
+                                        'expected_minutes': 480, 'stored_minutes': 485}
+    assert check_occupancy('2025-05-11', '2025-05-19')['consistent']
+
+    rebuild_occupancy('2025-05-10', '2025-05-20')
+    assert check_occupancy()['consistent']
+
+
+def test_rebuild_while_booking_stays_consistent(tmp_path):
+    # A file database: shared-cache memory databases lock whole tables instead of waiting
+    backend = FileSQLiteBackend(str(tmp_path / 'hotel.db'), auto_migrate=True)
+    with backend.connection() as conn:
+        seed_sample_data(conn)
+        conn.commit()
+    previous = set_backend(backend)
+    errors = []
+
+    def book(worker):
+        try:
+            rows = [{'room_id': 4 + worker, 'guest_name': f'Guest {worker}', 'date': f'2025-07-{day:02d}',
+                     'start_time': '09:00', 'end_time': '10:30'} for day in range(1, 29)]
+            for row in rows[:14]:
+                reserve_room(row)
+            import_reservations(rows[14:])
+        except Exception as e:
+            errors.append(e)
+
+    def rebuild():
+        try:
+            for _ in range(20):
+                rebuild_occupancy()
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=book, args=(worker,)) for worker in range(4)]
+        threads.append(threading.Thread(target=rebuild))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        result = check_occupancy()
+        assert result['consistent'], result['differences']
+        assert occupancy_report({'from': '2025-07-01', 'to': '2025-07-28'})['total']['booked_minutes'] == 4 * 28 * 90
+    finally:
+        set_backend(previous)
+        backend.close()
@@ -0,0 +1,60 @@
+import pytest
+
+WINDOW = {'date': '2025-05-12', 'start_time': '12:00', 'end_time': '13:00'}
+
+
+@pytest.fixture
+def engine_backend(engine_backend):
+    """The shared engine_backend with 49 more WiFi rooms, so results span several pages."""
+    with engine_backend.connection() as conn:
+        conn.executemany(
+            "INSERT INTO rooms (id, capacity, features) VALUES (?, ?, '[\"WiFi\"]')",
+            [(room_id, room_id % 5 + 1) for room_id in range(11, 60)]
+        )
+        conn.commit()
+    engine_backend.invalidate_room_catalog()
+    return engine_backend
+
+
+def _ids(rooms):
+    return [room['id'] for room in rooms]
+
+
+@pytest.mark.parametrize("sort", ["id", "capacity", "-capacity"])
+def test_keyset_pages_cover_the_full_result_in_order(engine_backend, sort):
+    query = {**WINDOW, 'features': ['WiFi'], 'sort': sort}
+    full = engine_backend.check_availability(query)
+    if sort == "capacity":
+        assert full == sorted(full, key=lambda room: (room['capacity'], room['id']))
+    if sort == "-capacity":
+        assert full == sorted(full, key=lambda room: (-room['capacity'], room['id']))
+
+    pages, after = [], None
+    while True:
+        page = engine_backend.check_availability({**query, 'limit': 7, 'after_room_id': after})
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1]['id']
+    assert all(len(page) == 7 for page in pages[:-1])
+    assert [room for page in pages for room in page] == full
+    assert list(engine_backend.iter_available_rooms(query, page_size=4)) == full
+    assert _ids(engine_backend.iter_available_rooms({**query, 'limit': 10}, page_size=4)) == _ids(full)[:10]
+
+
+def test_cursor_survives_the_cursor_room_being_booked(engine_backend):
+    query = {**WINDOW, 'sort': 'capacity', 'limit': 5}
+    first = engine_backend.check_availability(query)
+    cursor = first[-1]['id']
+    assert engine_backend.reserve_room({'room_id': cursor, 'guest_name': 'Zoe', **WINDOW})['status'] == 'success'
+
+    rest = engine_backend.check_availability({**WINDOW, 'sort': 'capacity', 'after_room_id': cursor})
+    everything = engine_backend.check_availability({**WINDOW, 'sort': 'capacity'})
+    assert _ids(first[:-1]) + _ids(rest) == _ids(everything)
+
+
+def test_invalid_page_parameters(engine_backend):
+    with pytest.raises(ValueError):
+        engine_backend.check_availability({**WINDOW, 'sort': 'price'})
+    with pytest.raises(ValueError):
+        engine_backend.check_availability({**WINDOW, 'limit': 0})
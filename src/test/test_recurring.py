@@ -0,0 +1,88 @@
+import pytest
+
+from database.database_operations import reserve_recurring, list_reservations
+from database.recurrence import expand_occurrences
+from database.time_utils import to_minutes, from_minutes
+
+SERIES = {'room_id': 9, 'guest_name': 'Acme Corp', 'date': '2025-06-02', 'start_time': '09:00', 'end_time': '10:00'}
+
+
+def _dates(occurrences):
+    return [from_minutes(start_ts)[0] for start_ts, _ in occurrences]
+
+
+def test_expansion_follows_the_rule():
+    start_ts = to_minutes('2025-06-02', 9 * 60)   # a Monday
+    window = (start_ts, start_ts + 60)
+
+    weekdays = expand_occurrences(*window, {'frequency': 'weekly', 'weekdays': ['mon', 'Friday'], 'count': 4}, 100)
+    assert _dates(weekdays) == ['2025-06-02', '2025-06-06', '2025-06-09', '2025-06-13']
+    fortnightly = expand_occurrences(*window, {'frequency': 'weekly', 'interval': 2, 'until': '2025-06-30'}, 100)
+    assert _dates(fortnightly) == ['2025-06-02', '2025-06-16', '2025-06-30']
+    daily = expand_occurrences(*window, {'frequency': 'daily', 'interval': 3, 'count': 3}, 100)
+    assert _dates(daily) == ['2025-06-02', '2025-06-05', '2025-06-08']
+    assert all(end_ts - start_ts == 60 for start_ts, end_ts in daily)
+
+    for rule, message in [
+        ({'frequency': 'monthly', 'count': 2}, "Invalid frequency"),
+        ({'frequency': 'daily'}, "until date or a count"),
+        ({'frequency': 'daily', 'count': 500}, "more than 100"),
+        ({'frequency': 'weekly', 'weekdays': ['someday'], 'count': 2}, "Invalid weekday"),
+        ({'frequency': 'daily', 'interval': 7, 'weekdays': ['tuesday'], 'count': 2}, "does not fall on any date"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            expand_occurrences(*window, rule, 100)
+    with pytest.raises(ValueError, match="longer than the time between"):
+        expand_occurrences(start_ts, start_ts + 2 * 24 * 60, {'frequency': 'daily', 'count': 3}, 100)
+
+
+def test_every_weekday_is_booked_in_one_call(backend):
+    result = reserve_recurring({**SERIES, 'frequency': 'weekly', 'until': '2025-06-27',
+                                'weekdays': ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']})
+    assert result['status'] == 'success'
+    assert (result['occurrences'], result['booked'], result['conflicts']) == (20, 20, [])
+    booked = [r for r in list_reservations({'room_id': 9}) if r['guest_name'] == 'Acme Corp']
+    assert sorted(r['id'] for r in booked) == sorted(result['reservation_ids'])
+    assert {r['start_time'] for r in booked} == {'09:00'}
+
+
+def test_conflicting_occurrences_are_reported(backend):
+    backend.reserve_room({'room_id': 9, 'guest_name': 'Other', 'date': '2025-06-09',
+                          'start_time': '09:30', 'end_time': '11:00'})
+    rule = {**SERIES, 'frequency': 'weekly', 'count': 3}
+
+    refused = reserve_recurring(rule)
+    assert refused['status'] == 'error' and refused['booked'] == 0
+    assert [(c['occurrence'], c['date']) for c in refused['conflicts']] == [(2, '2025-06-09')]
+    assert not [r for r in list_reservations({'room_id': 9}) if r['guest_name'] == 'Acme Corp']
+
+    partial = reserve_recurring({**rule, 'skip_conflicts': True})
+    assert partial['status'] == 'success' and partial['booked'] == 2
+    assert [r['date'] for r in list_reservations({'room_id': 9}) if r['guest_name'] == 'Acme Corp'] == \
+        ['2025-06-02', '2025-06-16']
+    # The booked dates now conflict with the same series
+    assert len(reserve_recurring({**rule, 'skip_conflicts': True})['conflicts']) == 3
+    assert reserve_recurring({**rule, 'room_id': 99})['message'] == "Room 99 does not exist"
+
+
+def test_agent_format_call_books_the_series(backend, agent_call):
+    # The example call from the agent's prompt, as the model writes it
+    name, args = agent_call("reserve_recurring(room_id=9, guest_name='Acme Corp', date='2025-06-02', "
+                            "start_time='09:00', end_time='10:00', frequency='weekly', "
+                            "weekdays=['monday', 'friday'], until='2025-06-13', skip_conflicts=False)")
+    assert name == 'reserve_recurring'
+    assert args['weekdays'] == ['monday', 'friday'] and args['skip_conflicts'] is False
+    result = reserve_recurring(args)
+    assert result['status'] == 'success' and result['booked'] == 4
+    assert [r['date'] for r in list_reservations({'room_id': 9}) if r['guest_name'] == 'Acme Corp'] == \
+        ['2025-06-02', '2025-06-06', '2025-06-09', '2025-06-13']
+
+    # A bare word is passed through as text and still read strictly
+    _, args = agent_call("reserve_recurring(room_id=9, guest_name='Acme Corp', date='2025-06-02', "
+                         "start_time='09:00', end_time='10:00', frequency='daily', count=2, skip_conflicts=true)")
+    assert args['skip_conflicts'] == 'true'
+    assert reserve_recurring(args)['booked'] == 1
+    assert reserve_recurring({**args, 'skip_conflicts': 'sometimes'})['message'] == \
+        "Invalid skip_conflicts 'sometimes', expected true or false"
+    assert reserve_recurring({**SERIES, 'start_time': '11:00', 'end_time': '12:00', 'frequency': 'weekly',
+                              'count': 2, 'weekdays': 'tuesday, thursday'})['booked'] == 2
@@ -0,0 +1,62 @@
+import random
+from itertools import combinations
+
+from database.database_operations import reserve_group, list_reservations
+from database.room_assignment import best_fit_rooms
+
+MAY_11 = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00'}
+
+
+def _brute_force(rooms, headcount, max_rooms):
+    best = None
+    for size in range(1, min(len(rooms), max_rooms) + 1):
+        for subset in combinations(rooms, size):
+            total = sum(room['capacity'] for room in subset)
+            if total >= headcount and (best is None or (total, size) < best):
+                best = (total, size)
+    return best
+
+
+def test_best_fit_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(200):
+        rooms = [{'id': room_id, 'capacity': rng.randint(1, 8)} for room_id in range(rng.randint(1, 9))]
+        headcount, max_rooms = rng.randint(1, 30), rng.randint(1, 5)
+        chosen = best_fit_rooms(rooms, headcount, max_rooms)
+        expected = _brute_force(rooms, headcount, max_rooms)
+        if expected is None:
+            assert chosen is None
+        else:
+            assert (sum(room['capacity'] for room in chosen), len(chosen)) == expected
+            assert len({room['id'] for room in chosen}) == len(chosen)
+
+
+def test_group_gets_the_tightest_room_set(backend):
+    # Free on May 11 10:00-12:00: rooms 4 (2), 5 (6), 7 (4), 8 (2), 9 (8), 10 (1)
+    result = reserve_group({'guest_name': 'Smith Wedding', 'headcount': 11, **MAY_11})
+    assert result['status'] == 'success'
+    assert result['wasted_capacity'] == 0
+    assert sum(room['capacity'] for room in result['rooms']) == 11
+    booked = [r for r in list_reservations({'date': '2025-05-11'}) if r['guest_name'] == 'Smith Wedding']
+    assert sorted(r['id'] for r in booked) == sorted(result['reservation_ids'])
+
+    # 12 beds are left across rooms that are free, fewer than the 13 needed
+    failed = reserve_group({'guest_name': 'Jones', 'headcount': 13, **MAY_11})
+    assert failed['status'] == 'error'
+    assert len(list_reservations({'date': '2025-05-11'})) == 3 + len(booked)
+
+
+def test_group_is_all_or_nothing(make_backend):
+    backend = make_backend(engine="index", warm_up=True)
+    # Booked behind the index's back, as another process would
+    with backend.connection() as conn:
+        conn.execute(
+            "INSERT INTO reservations (room_id, guest_name, date, start_time, end_time) "
+            "VALUES (9, 'Other', '2025-05-11', '09:00', '13:00')"
+        )
+        conn.commit()
+    before = len(backend.list_reservations())
+    result = backend.reserve_group({'guest_name': 'Conference', 'headcount': 14, 'features': ['WiFi'], **MAY_11})
+    assert result['status'] == 'error'
+    assert 'no rooms were reserved' in result['message']
+    assert len(backend.list_reservations()) == before
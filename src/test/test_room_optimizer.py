@@ -0,0 +1,109 @@
+import json
+import sqlite3
+import pytest
+
+from core.config import settings
+from database.backends import MemorySQLiteBackend, FileSQLiteBackend
+
+DAY = {'date': '2030-03-04'}
+
+
+@pytest.fixture
+def hotel():
+    # Rooms 1-3 are interchangeable doubles; room 4 is a double without WiFi
+    backend = MemorySQLiteBackend(engine="index")
+    with backend.connection() as conn:
+        conn.executemany(
+            "INSERT INTO rooms (id, capacity, features) VALUES (?, ?, ?)",
+            [(1, 2, json.dumps(['WiFi'])), (2, 2, json.dumps(['WiFi'])), (3, 2, json.dumps(['WiFi', 'TV'])),
+             (4, 2, json.dumps(['TV']))]
+        )
+        conn.commit()
+    backend.warm_up()
+    yield backend
+    backend.close()
+
+
+def _book(backend, room_id, start_time, end_time, **extra):
+    result = backend.reserve_room({
+        'room_id': room_id, 'guest_name': 'Guest', 'start_time': start_time, 'end_time': end_time, **DAY, **extra
+    })
+    assert result['status'] == 'success', result
+    return result
+
+
+def test_flexible_booking_takes_the_snuggest_equivalent_room(hotel):
+    _book(hotel, 1, '08:00', '10:00')
+    _book(hotel, 4, '10:00', '12:00')
+
+    # Room 1 leaves no gap before the booking; room 4 lacks WiFi and is never offered
+    booked = _book(hotel, 2, '10:00', '12:00', flexible=True)
+    assert booked['details']['room_id'] == 1
+    by_features = _book(hotel, None, '12:00', '13:00', flexible=True, features=['WiFi'])
+    assert by_features['details']['room_id'] == 1
+
+    flexible = [r for r in hotel.list_reservations(DAY) if r['room_id'] == 1]
+    assert len(flexible) == 3
+    assert hotel.reserve_room({'room_id': 99, 'guest_name': 'Guest', **DAY, 'start_time': '08:00',
+                               'end_time': '09:00', 'flexible': True})['message'] == "Room 99 does not exist"
+
+
+def test_optimizer_closes_stranded_gaps_between_equivalent_rooms(hotel):
+    _book(hotel, 1, '08:00', '10:00')
+    _book(hotel, 2, '08:00', '10:00')
+    # A 30-minute gap in room 2 cannot be sold, while room 1 is free from 10:00
+    moved = _book(hotel, 2, '10:30', '12:00')
+    _book(hotel, 4, '10:00', '10:30')
+    with hotel.connection() as conn:
+        conn.execute("UPDATE reservations SET flexible = 1 WHERE id = ?", (moved['reservation_id'],))
+        conn.commit()
+    window = {'from': '2030-03-04 00:00', 'until': '2030-03-05 00:00'}
+
+    plan = hotel.optimize_room_assignment({**window, 'dry_run': True})
+    assert plan['dry_run'] and plan['moved'] == 1
+    assert plan['moves'][0]['from_room'] == 2 and plan['moves'][0]['to_room'] in (1, 3)
+    assert plan['after']['stranded_minutes'] < plan['before']['stranded_minutes']
+    assert any(r['room_id'] == 2 and r['start_time'] == '10:30' for r in hotel.list_reservations(DAY))
+
+    result = hotel.optimize_room_assignment(window)
+    assert result['moved'] == 1 and result['recovered_stranded_minutes'] == 30
+    assert result['after']['bookable_slots'] >= result['before']['bookable_slots']
+    # The index follows the move: room 2 is free again and the target is not
+    free = {room['id'] for room in hotel.check_availability({**DAY, 'start_time': '10:00', 'end_time': '12:00'})}
+    assert 2 in free and result['moves'][0]['to_room'] not in free
+
+    assert hotel.optimize_room_assignment(window)['moved'] == 0
+
+
+def test_flexible_flag_is_read_strictly(hotel, agent_call):
+    _book(hotel, 1, '08:00', '10:00')
+    # The agent passes booleans through as text; 'False' must not book flexibly
+    name, args = agent_call("reserve_room(room_id=2, guest_name='Ann', date='2030-03-04', "
+                            "start_time='10:00', end_time='12:00', flexible=False)")
+    assert name == 'reserve_room'
+    assert hotel.reserve_room(args)['details']['room_id'] == 2
+    _, args = agent_call("reserve_room(room_id=1, guest_name='Bob', date='2030-03-04', "
+                         "start_time='12:00', end_time='13:00', flexible=true)")
+    assert hotel.reserve_room(args)['details']['room_id'] == 2
+    with hotel.connection() as conn:
+        assert conn.execute("SELECT guest_name, flexible FROM reservations WHERE guest_name != 'Guest' "
+                            "ORDER BY id").fetchall() == [('Ann', 0), ('Bob', 1)]
+
+    refused = hotel.reserve_room({'room_id': 3, 'guest_name': 'Cy', **DAY, 'start_time': '14:00',
+                                  'end_time': '15:00', 'flexible': 'maybe'})
+    assert refused == {'status': 'error', 'message': "Invalid flexible 'maybe', expected true or false"}
+    assert hotel.optimize_room_assignment({**DAY, 'dry_run': 'yes'})['status'] == 'error'
+
+
+def test_locked_database_is_an_error_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'DB_BUSY_TIMEOUT', 0.05)
+    backend = FileSQLiteBackend(str(tmp_path / 'hotel.db'), auto_migrate=True)
+    writer = sqlite3.connect(str(tmp_path / 'hotel.db'), isolation_level=None)
+    try:
+        writer.execute("BEGIN IMMEDIATE")
+        result = backend.optimize_room_assignment({'from': '2030-03-04 00:00', 'until': '2030-03-05 00:00'})
+        assert result == {'status': 'error', 'message': 'Error optimizing room assignment: database is locked'}
+    finally:
+        writer.rollback()
+        writer.close()
+        backend.close()
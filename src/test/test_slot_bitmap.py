@@ -0,0 +1,79 @@
+import random
+import pytest
+
+pytest.importorskip("numpy")
+
+from database.slot_bitmap import SlotBitmapEngine
+from database.time_utils import from_minutes, to_minutes, normalize_window
+
+
+@pytest.fixture(autouse=True)
+def full_history(monkeypatch):
+    # The sample data is in the past; load all of it
+    from core.config import settings
+    monkeypatch.setattr(settings, "SLOT_BITMAP_HISTORY_DAYS", -1)
+
+
+def test_bitmap_engine_matches_sql_for_aligned_windows(make_backend):
+    rng = random.Random(7)
+    sql_backend = make_backend(engine="sql")
+    bitmap_backend = make_backend(engine="bitmap", warm_up=True)
+
+    for _ in range(200):
+        start_ts = to_minutes('2025-05-10', 0) + rng.randrange(0, 6 * 24 * 12) * 5
+        end_ts = start_ts + rng.randrange(1, 48) * 5
+        day, start_time = from_minutes(start_ts)
+        reservation = {
+            'room_id': rng.randint(4, 10),
+            'guest_name': 'Guest',
+            'date': day,
+            'start_time': start_time,
+            'end_time': from_minutes(end_ts)[1]
+        }
+        sql_backend.reserve_room(reservation)
+        bitmap_backend.reserve_room(reservation)
+
+        query = {**reservation, 'capacity': rng.randint(1, 4), 'features': rng.sample(['TV', 'WiFi', 'Kitchen'], rng.randint(0, 1))}
+        assert sql_backend.check_availability(query) == bitmap_backend.check_availability(query)
+
+
+def test_availability_matrix_matches_single_queries(make_backend):
+    backend = make_backend(engine="sql")
+    windows = [
+        {'date': day, 'start_time': start, 'end_time': end}
+        for day in ['2025-05-10', '2025-05-11', '2025-05-12', '2025-05-15']
+        for start, end in [('08:00', '10:00'), ('12:00', '14:00'), ('21:00', '01:00')]
+    ]
+    matrix = backend.availability_matrix({'windows': windows, 'capacity': 2, 'features': ['TV']})
+    for window, entry in zip(windows, matrix):
+        expected = backend.check_availability({**window, 'capacity': 2, 'features': ['TV']})
+        assert entry['available_room_ids'] == [room['id'] for room in expected]
+
+
+def test_unaligned_windows_are_conservative_and_removal_repaints(make_backend):
+    backend = make_backend(engine="sql")
+    with backend.connection() as conn:
+        engine = SlotBitmapEngine.load(conn, backend.room_catalog(), slot_minutes=15)
+    booking = {'id': 1000, 'room_id': 4, 'start_ts': normalize_window('2025-06-01', '10:00', '10:05')[0],
+               'end_ts': normalize_window('2025-06-01', '10:00', '10:05')[1]}
+    other = {'id': 1001, 'room_id': 4, 'start_ts': normalize_window('2025-06-01', '12:00', '13:00')[0],
+             'end_ts': normalize_window('2025-06-01', '12:00', '13:00')[1]}
+    engine.reservation_added(booking)
+    engine.reservation_added(other)
+
+    # 10:10 shares the 10:00-10:15 slot with the booking
+    assert 4 not in engine.free_room_ids(*normalize_window('2025-06-01', '10:10', '10:30'))
+
+    engine.reservation_removed(booking)
+    assert 4 in engine.free_room_ids(*normalize_window('2025-06-01', '10:00', '10:30'))
+    assert 4 not in engine.free_room_ids(*normalize_window('2025-06-01', '12:30', '12:45'))
+
+
+def test_bitmap_engine_forgets_archived_days(make_backend):
+    backend = make_backend(engine="bitmap", warm_up=True)
+    window = {'date': '2025-05-11', 'start_time': '10:00', 'end_time': '12:00'}
+    assert 6 not in [room['id'] for room in backend.check_availability(window)]
+    backend.archive_reservations('2025-05-12')
+    assert 6 in [room['id'] for room in backend.check_availability(window)]
+    # Bookings after the cutoff still block
+    assert 9 not in [room['id'] for room in backend.check_availability({**window, 'date': '2025-05-15'})]
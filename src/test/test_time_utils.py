@@ -0,0 +1,76 @@
+import pytest
+
+from database.time_utils import normalize_window, from_minutes, days_between, parse_time
+from database.database_operations import check_availability, reserve_room, list_reservations
+
+
+def test_normalize_window_accepts_legacy_formats():
+    assert normalize_window('2025-05-10', '09:00', '11:00') == normalize_window('2025-05-10', '9:00', '11:00:00')
+    assert parse_time('2:30 PM') == parse_time('14:30')
+
+    start_ts, end_ts = normalize_window('1970-01-02', '00:30', '01:00')
+    assert (start_ts, end_ts) == (1440 + 30, 1440 + 60)
+    assert from_minutes(end_ts) == ('1970-01-02', '01:00')
+
+
+def test_normalize_window_rejects_bad_input():
+    for window in [('2025-13-01', '09:00', '10:00'), ('2025-05-10', '9am-ish', '10:00'),
+                   ('2025-05-10', '10:00', '10:00')]:
+        with pytest.raises(ValueError):
+            normalize_window(*window)
+
+
+def test_overnight_window_spans_two_days():
+    start_ts, end_ts = normalize_window('2025-05-10', '22:00', '02:00')
+    assert end_ts - start_ts == 4 * 60
+    assert days_between(start_ts, end_ts) == ['2025-05-10', '2025-05-11']
+
+
+def test_overnight_reservation_blocks_next_morning(backend):
+    result = reserve_room({
+        'room_id': 8,
+        'guest_name': 'Quinn',
+        'date': '2025-05-20',
+        'start_time': '22:00',
+        'end_time': '2:00'
+    })
+    assert result['status'] == 'success'
+    assert result['details']['end_time'] == '02:00'
+
+    rooms = check_availability({'date': '2025-05-21', 'start_time': '01:00', 'end_time': '03:00'})
+    assert 8 not in [room['id'] for room in rooms]
+    assert [r['guest_name'] for r in list_reservations({'date': '2025-05-21'})] == ['Quinn']
+
+
+def test_seeded_text_rows_are_encoded(backend):
+    # Room 9 is booked 09:00-17:00 on May 15th by the sample data (inserted as TEXT only)
+    rooms = check_availability({'date': '2025-05-15', 'start_time': '16:59', 'end_time': '18:00'})
+    assert 9 not in [room['id'] for room in rooms]
+
+
+def test_multi_day_stay_is_checked_and_booked_as_one_range(backend):
+    stay = {'check_in': '2025-05-11 15:00', 'check_out': '2025-05-14 11:00'}
+
+    # Room 6 has bookings on the 11th and 12th inside the stay
+    assert 6 not in [room['id'] for room in check_availability({**stay, 'capacity': 3})]
+
+    result = reserve_room({'room_id': 8, 'guest_name': 'Rosa', **stay})
+    assert result['status'] == 'success'
+    assert result['details']['check_in'] == '2025-05-11 15:00'
+    assert result['details']['check_out'] == '2025-05-14 11:00'
+    assert 'from 2025-05-11 15:00 to 2025-05-14 11:00' in result['message']
+
+    # Any window inside the stay now excludes room 8
+    rooms = check_availability({'date': '2025-05-13', 'start_time': '09:00', 'end_time': '10:00'})
+    assert 8 not in [room['id'] for room in rooms]
+    assert reserve_room({'room_id': 8, 'guest_name': 'Sam', 'date': '2025-05-14',
+                         'start_time': '10:00', 'end_time': '12:00'})['status'] == 'error'
+
+
+def test_bare_dates_use_default_check_in_and_out_times(backend):
+    result = reserve_room({'room_id': 10, 'guest_name': 'Tess', 'check_in': '2025-06-01', 'check_out': '2025-06-03'})
+    assert result['details']['check_in'] == '2025-06-01 15:00'
+    assert result['details']['check_out'] == '2025-06-03 11:00'
+
+    result = reserve_room({'room_id': 10, 'guest_name': 'Tess', 'check_in': '2025-06-03', 'check_out': '2025-06-01'})
+    assert result['status'] == 'error'
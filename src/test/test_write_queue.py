@@ -0,0 +1,68 @@
+import threading
+import pytest
+
+from database.write_queue import WriteQueue
+
+
+def test_requests_waiting_behind_a_batch_share_the_next_one():
+    started, release = threading.Event(), threading.Event()
+    batches = []
+
+    def commit(batch):
+        batches.append(list(batch))
+        started.set()
+        release.wait(5)
+        return [request * 10 for request in batch]
+
+    write_queue = WriteQueue(commit, max_batch_size=4, max_wait_ms=0)
+    futures = [write_queue.submit(0)]
+    started.wait(5)
+    # Six requests arrive while the writer is busy with the first one
+    futures += [write_queue.submit(request) for request in range(1, 7)]
+    release.set()
+
+    assert [future.result(5) for future in futures] == [0, 10, 20, 30, 40, 50, 60]
+    assert batches == [[0], [1, 2, 3, 4], [5, 6]]
+    stats = write_queue.stats()
+    assert (stats["batches"], stats["items"], stats["largest_batch"]) == (3, 7, 4)
+    assert stats["latency_ms"]["max"] >= stats["latency_ms"]["p50"]
+    write_queue.close()
+    with pytest.raises(RuntimeError):
+        write_queue.submit(7)
+
+
+def test_a_failing_batch_fails_its_futures_only():
+    def commit(batch):
+        if "bad" in batch:
+            raise RuntimeError("disk full")
+        return batch
+
+    write_queue = WriteQueue(commit, max_batch_size=1)
+    with pytest.raises(RuntimeError):
+        write_queue.submit("bad").result(5)
+    assert write_queue.submit("good").result(5) == "good"
+    assert write_queue.stats()["failed_batches"] == 1
+    write_queue.close()
+
+
+def test_backend_books_a_burst_through_the_queue(make_backend):
+    backend = make_backend(write_queue=True)
+    window = {'date': '2025-06-01', 'start_time': '10:00', 'end_time': '11:00'}
+    results = []
+
+    def book(worker):
+        # Everyone wants room 4; each other room is wanted by one guest only
+        room_id = 4 if worker % 2 else 5 + worker // 2
+        results.append(backend.reserve_room({'room_id': room_id, 'guest_name': f'Guest {worker}', **window}))
+
+    threads = [threading.Thread(target=book, args=(worker,)) for worker in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(result['status'] == 'success' for result in results) == 7
+    assert [r['room_id'] for r in backend.list_reservations({'date': '2025-06-01'})] == [4, 5, 6, 7, 8, 9, 10]
+    assert backend.write_queue_stats()['items'] == 12
+    assert backend.reserve_room({'room_id': 99, 'guest_name': 'Nobody', **window})['message'] == \
+        "Room 99 does not exist"